@@ -3,35 +3,38 @@ import streamlit as st
 import bcrypt
 import json
 import os
-from datetime import datetime
-from core.camera_detector import CameraDetector
-from core.photo_manager import PhotoManager
-from config.settings import GROUPS, PHOTOS_DIR
+import threading
+from datetime import date
+from core.students import load_students, count_students, add_student, delete_student
+from config.settings import GROUPS, PHOTOS_DIR, MODEL_WARMUP, STUDENTS_PAGE_SIZE
 
 # пути
 USERS_FILE = "data/users.json"
-STUDENTS_FILE = "data/students.json"
 
-#  инициализация
-os.makedirs("data", exist_ok=True)
-os.makedirs(PHOTOS_DIR, exist_ok=True)
-for group in GROUPS:
-    os.makedirs(os.path.join(PHOTOS_DIR, group), exist_ok=True)
 
-if not os.path.exists(STUDENTS_FILE):
-    with open(STUDENTS_FILE, "w") as f:
-        json.dump([], f, indent=4)
+@st.cache_resource(show_spinner=False)
+def init_app():
+    """Папки данных — один раз на процесс, а не при каждом перезапуске скрипта."""
+    os.makedirs("data", exist_ok=True)
+    os.makedirs(PHOTOS_DIR, exist_ok=True)
+    for group in GROUPS:
+        os.makedirs(os.path.join(PHOTOS_DIR, group), exist_ok=True)
+    return True
 
 
-#  работа с файлами
-def load_students():
-    with open(STUDENTS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+@st.cache_resource(show_spinner=False)
+def start_model_warmup():
+    """Фоновая загрузка и прогрев модели — один раз на процесс, для всех сессий."""
+    def warm_up():
+        from core.face_matcher.model import warm_up
+        warm_up()
+
+    thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
 
-def save_students(students):
-    with open(STUDENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(students, f, indent=4, ensure_ascii=False)
 
+#  работа с файлами (студенты — в SQLite, core/students.py)
 def load_users():
     if not os.path.exists(USERS_FILE):
         return {}
@@ -62,19 +65,16 @@ def login_user(username, password):
 
 # старницы
 def show_students():
+    from core.thumbnails import get_thumbnail
+
     st.title("Список студентов")
-    students = load_students()
-    if not students:
+    if not count_students():
         st.info("Пока нет зарегистрированных студентов.")
         return
 
-    # фильтр по группам
+    # фильтр по группам (выборка по индексу в базе)
     selected_group = st.selectbox("Фильтр по группе", ["Все"] + GROUPS)
-
-    filtered_students = [
-        s for s in students
-        if selected_group == "Все" or s.get("group") == selected_group
-    ]
+    group = None if selected_group == "Все" else selected_group
 
     col1, col2 = st.columns(2)
 
@@ -84,6 +84,33 @@ def show_students():
             ["Все", "Был сегодня", "Не был сегодня"]
         )
 
+    if attendace_filter == "Все":
+        marked = None
+        total = count_students(group)
+    else:
+        # отметки за сегодня — из дневных агрегатов журнала посещаемости
+        from core.analytics import filter_by_attendance
+        marked = filter_by_attendance(
+            load_students(group), date.today(), present=attendace_filter == "Был сегодня", group=group
+        )
+        total = len(marked)
+
+    # постраничный вывод: из базы читается только текущая страница
+    pages = max(1, -(-total // STUDENTS_PAGE_SIZE))
+    page_key = f"students_page_{selected_group}_{attendace_filter}"
+    if st.session_state.get(page_key, 1) > pages:
+        # после удаления страниц могло стать меньше
+        st.session_state[page_key] = pages
+    page = st.number_input(f"Страница (из {pages})", min_value=1, max_value=pages, key=page_key)
+    offset = (page - 1) * STUDENTS_PAGE_SIZE
+    if marked is None:
+        filtered_students = load_students(group, limit=STUDENTS_PAGE_SIZE, offset=offset)
+    else:
+        filtered_students = marked[offset:offset + STUDENTS_PAGE_SIZE]
+
+    if not filtered_students:
+        st.info("Нет студентов с таким статусом.")
+
     # отображение студента
     for idx, student in enumerate(filtered_students):
         col1, col2, col3 = st.columns([3, 1, 1])
@@ -91,13 +118,14 @@ def show_students():
             st.write(f"**{student['name']}**")
             st.caption(f"Группа: {student['group']}")
         with col2:
-            if os.path.exists(student['photo']):
-                st.image(student['photo'], width=80)
+            thumbnail = get_thumbnail(student['photo'])
+            if thumbnail:
+                st.image(thumbnail, width=80)
             else:
                 st.write("Фото отсутствует")
         with col3:
             # Кнопка удаления
-            if st.button("Удалить", key=f"delete_{idx}"):
+            if st.button("Удалить", key=f"delete_{student['id']}"):
                 st.session_state.delete_index = idx
                 st.session_state.delete_student = student
                 st.rerun()
@@ -109,16 +137,10 @@ def show_students():
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Да, удалить", type="primary"):
-                # Удаляем фото
-                if os.path.exists(student['photo']):
-                    os.remove(student['photo'])
+                # удаляем из базы вместе с фото
+                if delete_student(student):
                     st.toast(f"Фото удалено: {student['photo']}")
 
-                # удаляем из JSON
-                students = load_students()
-                students.remove(student)
-                save_students(students)
-
                 # очищаем состояние
                 del st.session_state.delete_student
                 del st.session_state.delete_index
@@ -151,18 +173,11 @@ def add_student_form():
                 with open(photo_path, "wb") as f:
                     f.write(photo.getbuffer())
 
-                students = load_students()
-                students.append({
-                    "name": name,
-                    "group": group,
-                    "photo": photo_path,
-                    "added_at": datetime.now().isoformat(),
-                    "attendance": []  #
-                })
-                save_students(students)
-
-                st.success(f"Студент **{name}** добавлен!")
-                st.image(photo_path, width=200)
+                if add_student(name, group, photo_path):
+                    st.success(f"Студент **{name}** добавлен!")
+                    st.image(photo_path, width=200)
+                else:
+                    st.error("Ошибка при добавлении студента")
 
 
 def recognition_page():
@@ -171,6 +186,7 @@ def recognition_page():
 
     if st.button("Начать распознавание", type="primary"):
         with st.spinner("Запуск камеры..."):
+            from core.camera_detector import CameraDetector
             detector = CameraDetector()
             result = detector.run_detection()
 
@@ -187,7 +203,7 @@ def show_menu():
         st.title("Меню")
         page = st.radio(
             "Перейти",
-            ["Студенты", "Добавить студента", "Распознавание"],
+            ["Студенты", "Добавить студента", "Распознавание", "Статистика"],
             key="main_menu"
         )
     return page
@@ -237,6 +253,10 @@ def main_system():
         st.session_state.username = None
         st.rerun()
 
+    # модель нужна только после входа: логин не ждёт TensorFlow
+    if MODEL_WARMUP:
+        start_model_warmup()
+
     # меню
     page = show_menu()
 
@@ -247,8 +267,12 @@ def main_system():
         add_student_form()
     elif page == "Распознавание":
         recognition_page()
+    elif page == "Статистика":
+        from pages.analytics_page import show_analytics
+        show_analytics()
 
 # запуск
+init_app()
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
 if "username" not in st.session_state:
@@ -0,0 +1,78 @@
+# benchmarks/ann_benchmark.py
+"""
+Сравнение IVF-индекса с полным перебором: recall@k и задержка поиска.
+
+Эмбеддинги синтетические: у каждого "студента" свой центр на единичной
+сфере, его фото и кадры с камеры — зашумлённые копии центра.
+
+Запуск:
+    python -m benchmarks.ann_benchmark --sizes 1000 5000 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core.face_matcher.ann import IVFIndex, brute_force_search
+from core.face_matcher.distance import l2_normalize
+
+
+def make_dataset(n_photos: int, n_queries: int, dim: int = 512, photos_per_student: int = 5,
+                 noise: float = 0.35, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_students = max(1, n_photos // photos_per_student)
+    centers = l2_normalize(rng.normal(size=(n_students, dim)).astype(np.float32))
+
+    owners = np.arange(n_photos) % n_students
+    photos = centers[owners] + noise * rng.normal(size=(n_photos, dim)).astype(np.float32) / np.sqrt(dim)
+    query_owners = rng.integers(n_students, size=n_queries)
+    queries = centers[query_owners] + noise * rng.normal(size=(n_queries, dim)).astype(np.float32) / np.sqrt(dim)
+    return photos.astype(np.float32), queries.astype(np.float32)
+
+
+def recall_at_k(approx, exact, k: int) -> float:
+    """Доля точных k ближайших соседей, найденных индексом."""
+    hits = sum(len({i for i, _ in a[:k]} & {i for i, _ in e[:k]}) for a, e in zip(approx, exact))
+    total = sum(len(e[:k]) for e in exact)
+    return hits / total if total else 1.0
+
+
+def run(sizes, n_queries: int, k: int, n_probe: int, metric: str):
+    print(f"{'фото':>8} {'списков':>8} {'построение, с':>14} "
+          f"{'перебор, мс':>12} {'IVF, мс':>9} {'recall@1':>9} {'recall@' + str(k):>10}")
+
+    for size in sizes:
+        photos, queries = make_dataset(size, n_queries)
+        ids = list(range(size))
+
+        start = time.perf_counter()
+        index = IVFIndex(n_probe=n_probe, metric=metric).build(photos, ids)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact = brute_force_search(photos, ids, queries, k=k, metric=metric)
+        brute_ms = (time.perf_counter() - start) * 1000 / n_queries
+
+        start = time.perf_counter()
+        approx = index.search(queries, k=k)
+        ivf_ms = (time.perf_counter() - start) * 1000 / n_queries
+
+        print(f"{size:>8} {len(index.centroids):>8} {build_time:>14.2f} "
+              f"{brute_ms:>12.3f} {ivf_ms:>9.3f} {recall_at_k(approx, exact, 1):>9.3f} "
+              f"{recall_at_k(approx, exact, k):>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк ANN-индекса эмбеддингов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--n-probe", type=int, default=8)
+    parser.add_argument("--metric", default="cosine")
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.k, args.n_probe, args.metric)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/detector_benchmark.py
+"""
+Детекция лиц на записанном видео: мс/кадр и полнота относительно
+эталона — полного detectMultiScale по каждому кадру в исходном размере.
+
+Запуск:
+    python -m benchmarks.detector_benchmark lesson.mp4 --scales 1.0 0.75 0.5 --skips 0 1 2
+"""
+
+import argparse
+import itertools
+import time
+
+import cv2
+
+from core.face_detector import FaceDetector
+from core.face_tracker import iou
+
+
+def read_frames(path: str, max_frames: int):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Не удалось открыть видео: {path}")
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_detector(detector: FaceDetector, frames):
+    boxes = []
+    start = time.perf_counter()
+    for frame in frames:
+        boxes.append(list(detector.detect(frame)))
+    ms_per_frame = (time.perf_counter() - start) * 1000 / max(1, len(frames))
+    return boxes, ms_per_frame
+
+
+def recall(reference, predicted, iou_threshold: float = 0.5) -> float:
+    """Доля эталонных рамок, для которых есть рамка с IoU >= порога."""
+    total = hits = 0
+    for ref_boxes, pred_boxes in zip(reference, predicted):
+        for ref in ref_boxes:
+            total += 1
+            if any(iou(ref, pred) >= iou_threshold for pred in pred_boxes):
+                hits += 1
+    return hits / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк адаптивной детекции лиц")
+    parser.add_argument("video", help="записанное видео занятия (mp4/avi)")
+    parser.add_argument("--max-frames", type=int, default=600)
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.75, 0.5])
+    parser.add_argument("--skips", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--full-scan-every", type=int, default=10)
+    parser.add_argument("--min-size", type=int, default=50)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.max_frames)
+    print(f"Кадров: {len(frames)}")
+    min_size = (args.min_size, args.min_size)
+
+    reference, ref_ms = run_detector(
+        FaceDetector(scale=1.0, skip_frames=0, full_scan_every=1, min_size=min_size), frames
+    )
+    print(f"Эталон (полный кадр): {ref_ms:.2f} мс/кадр, лиц: {sum(map(len, reference))}")
+
+    print(f"{'масштаб':>8} {'пропуск':>8} {'мс/кадр':>9} {'ускорение':>10} {'полнота':>8}")
+    for scale, skip in itertools.product(args.scales, args.skips):
+        detector = FaceDetector(scale=scale, skip_frames=skip,
+                                full_scan_every=args.full_scan_every, min_size=min_size)
+        predicted, ms = run_detector(detector, frames)
+        print(f"{scale:>8.2f} {skip:>8} {ms:>9.2f} {ref_ms / ms if ms else 0:>10.1f} "
+              f"{recall(reference, predicted):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
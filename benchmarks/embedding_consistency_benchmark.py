@@ -0,0 +1,90 @@
+# benchmarks/embedding_consistency_benchmark.py
+"""
+Совпадают ли эмбеддинги кропов с камеры и эталонных фото.
+
+Кропы с камеры считаются embed_crops() — своя предобработка (ресайз с
+паддингом, /255) без детекции и выравнивания, а эталоны —
+DeepFace.represent с detector_backend="opencv" и align=True. Для одних
+и тех же кропов бенчмарк сравнивает:
+  - embed_crops и DeepFace.represent(detector_backend="skip") — та же
+    модель без детекции: расстояние должно быть около нуля, иначе
+    предобработка embed_crops разошлась с DeepFace;
+  - embed_crops и эталонный путь represent() — разница из-за повторной
+    детекции и выравнивания; её нужно сравнивать с FACE_THRESHOLD.
+Кроп "не узнаёт сам себя", если расстояние больше порога.
+
+По умолчанию берутся фото группы из data/photos (после импорта это
+канонические кропы лица); нужен установленный DeepFace.
+
+Запуск:
+    python -m benchmarks.embedding_consistency_benchmark --group ГР-1
+    python -m benchmarks.embedding_consistency_benchmark --crops data/photos/temp_faces
+"""
+
+import argparse
+
+import numpy as np
+
+from config.settings import DISTANCE_METRIC, FACE_THRESHOLD, GROUPS
+from core.face_matcher.distance import distance_matrix
+from core.face_matcher.embeddings import represent
+from core.face_matcher.model import embed_crops, load_crop
+from core.face_matcher.settings import DEEFACE_REPRESENT_FACENET512
+from core.photo_manager import PhotoManager
+from benchmarks.pipeline_benchmark import load_images
+
+
+def represent_skip(crop: np.ndarray):
+    """DeepFace.represent без детекции и выравнивания — только модель и её предобработка."""
+    from deepface import DeepFace
+
+    params = {**DEEFACE_REPRESENT_FACENET512, "detector_backend": "skip", "align": False}
+    objs = DeepFace.represent(img_path=crop, **params)
+    return np.asarray(objs[0]["embedding"], dtype=np.float32) if objs else None
+
+
+def paired_distances(a: list, b: list, metric: str) -> np.ndarray:
+    """Расстояния между a[i] и b[i]; пары, где одного из векторов нет, пропускаются."""
+    return np.array([
+        distance_matrix(x[None], y[None], metric)[0, 0]
+        for x, y in zip(a, b) if x is not None and y is not None
+    ], dtype=np.float32)
+
+
+def report(title: str, distances: np.ndarray, threshold: float):
+    if not len(distances):
+        print(f"{title:<40} нет пар")
+        return
+    print(f"{title:<40} {distances.mean():>10.4f} {np.median(distances):>10.4f} {distances.max():>10.4f} "
+          f"{np.count_nonzero(distances > threshold):>6} из {len(distances)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение эмбеддингов кропов и эталонов")
+    parser.add_argument("--group", choices=GROUPS, default=GROUPS[0], help="фото группы как кропы")
+    parser.add_argument("--crops", help="папка с кропами лиц вместо фото группы")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--metric", default=DISTANCE_METRIC)
+    args = parser.parse_args()
+
+    if args.crops:
+        crops = load_images(args.crops)[:args.limit]
+    else:
+        paths = [s["path"] for s in PhotoManager.get_students(args.group)][:args.limit]
+        crops = [c for c in (load_crop(p) for p in paths) if c is not None]
+    if not crops:
+        print("Нет кропов")
+        return
+
+    batch = list(embed_crops(crops))
+    skip = [represent_skip(c) for c in crops]
+    reference = [represent(c) for c in crops]
+
+    print(f"кропов: {len(crops)}, метрика {args.metric}, порог {FACE_THRESHOLD}")
+    print(f"{'':<40} {'среднее':>10} {'медиана':>10} {'макс.':>10} {'> порога':>11}")
+    report("embed_crops vs represent(skip)", paired_distances(batch, skip, args.metric), FACE_THRESHOLD)
+    report("embed_crops vs represent (эталоны)", paired_distances(batch, reference, args.metric), FACE_THRESHOLD)
+
+
+if __name__ == "__main__":
+    main()
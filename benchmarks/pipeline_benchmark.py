@@ -0,0 +1,255 @@
+# benchmarks/pipeline_benchmark.py
+"""
+Бенчмарк конвейера захват → детекция → эмбеддинги → сопоставление.
+
+Каждый этап замеряется отдельно:
+  - detection:  мс/кадр FaceDetector (полный проход и адаптивный режим);
+  - roster:     PhotoManager.get_students для группы;
+  - embeddings: эмбеддингов/сек для эталонных фото (холодный кэш) и кропов (батч);
+  - match:      задержка match() в зависимости от размера группы и числа кропов
+                (кэш эталонов уже прогрет).
+
+Данные либо синтетические (фиксированный seed), либо из папок --roster /
+--crops / --video. Результаты пишутся в JSON (benchmarks/results/), чтобы
+сравнивать версии: --compare путь_к_старому.json печатает разницу.
+Временная группа и кэш эмбеддингов создаются в ATTENDANCE_DATA_DIR
+(по умолчанию — временная папка, удаляется после прогона), рабочие
+фото и кэш не затрагиваются.
+
+Запуск:
+    python -m benchmarks.pipeline_benchmark
+    python -m benchmarks.pipeline_benchmark --roster photos/ --crops crops/ --video lesson.mp4
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# данные бенчмарка (фото группы, кэш эмбеддингов) — во временной папке,
+# не в рабочем data/: задаётся до первого импорта config
+OWN_DATA_DIR = "ATTENDANCE_DATA_DIR" not in os.environ
+if OWN_DATA_DIR:
+    os.environ["ATTENDANCE_DATA_DIR"] = tempfile.mkdtemp(prefix="attendance-bench-")
+
+import cv2
+import numpy as np
+
+from config.settings import (
+    BASE_DIR, DATA_DIR, PHOTOS_DIR, SUPPORTED_EXT, FACE_MODEL, DISTANCE_METRIC, EMBED_BATCH_SIZE,
+)
+from core.face_detector import FaceDetector
+from core.photo_manager import PhotoManager
+
+RESULTS_DIR = Path(__file__).parent / "results"
+BENCH_GROUP = "_benchmark"
+
+
+def synthetic_images(count: int, size: tuple, seed: int) -> list:
+    """Детерминированный набор BGR-изображений (градиент + шум)."""
+    rng = np.random.default_rng(seed)
+    h, w = size
+    base = np.linspace(0, 255, w, dtype=np.float32)[None, :, None]
+    return [
+        np.clip(base + rng.normal(0, 40, size=(h, w, 3)), 0, 255).astype(np.uint8)
+        for _ in range(count)
+    ]
+
+
+def load_images(folder: str) -> list:
+    files = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in SUPPORTED_EXT)
+    return [img for img in (cv2.imread(str(p)) for p in files) if img is not None]
+
+
+def read_video(path: str, max_frames: int) -> list:
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def timed(fn, repeat: int = 1):
+    """Медиана времени выполнения (сек) и результат последнего вызова."""
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)), result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_detection(frames: list) -> dict:
+    results = {}
+    modes = {
+        "full": FaceDetector(scale=1.0, skip_frames=0, full_scan_every=1),
+        "adaptive": FaceDetector(),
+    }
+    for name, detector in modes.items():
+        seconds, faces = timed(lambda: [len(detector.detect(f)) for f in frames])
+        results[name] = {
+            "ms_per_frame": round(seconds * 1000 / max(1, len(frames)), 3),
+            "faces": int(sum(faces)),
+        }
+    return results
+
+
+def bench_pipeline(roster: list, crops: list, group_sizes: list, crop_counts: list, repeat: int) -> dict:
+    from core.face_matcher import embeddings, match
+    from core.face_matcher.core import embed_faces
+    from core.face_matcher.model import warm_up
+
+    if DATA_DIR.resolve() == (BASE_DIR / "data").resolve():
+        # config уже был импортирован без ATTENDANCE_DATA_DIR — группа попала бы в рабочие фото
+        raise RuntimeError("Бенчмарк не пишет в рабочий data/: задайте ATTENDANCE_DATA_DIR")
+
+    result = {}
+    group_dir = PHOTOS_DIR / BENCH_GROUP
+    cache_dir = Path(tempfile.mkdtemp(prefix="embeddings-"))
+    saved_store = embeddings._store
+    try:
+        group_dir.mkdir(parents=True, exist_ok=True)
+        for i, img in enumerate(roster[:max(group_sizes)]):
+            cv2.imwrite(str(group_dir / f"student_{i:04d}.jpg"), img)
+
+        seconds, _ = timed(lambda: PhotoManager.get_students(BENCH_GROUP), repeat)
+        result["roster_ms"] = round(seconds * 1000, 3)
+
+        seconds, _ = timed(warm_up)
+        result["model_load_s"] = round(seconds, 3)
+
+        # холодный кэш эталонов во временной папке
+        embeddings._store = embeddings.EmbeddingStore(directory=cache_dir)
+        paths = [s["path"] for s in PhotoManager.get_students(BENCH_GROUP)]
+        seconds, _ = timed(lambda: embeddings._store.get_many(paths))
+        result["reference_embeddings_per_s"] = round(len(paths) / seconds, 2) if seconds else None
+
+        seconds, _ = timed(lambda: embed_faces(crops), repeat)
+        result["crop_embeddings_per_s"] = round(len(crops) / seconds, 2) if seconds else None
+
+        result["match"] = []
+        for size in sorted(group_sizes, reverse=True):
+            # группа нужного размера: лишние фото убираем из папки
+            for i, path in enumerate(sorted(group_dir.iterdir())):
+                if i >= size:
+                    path.unlink()
+            for count in crop_counts:
+                faces = (crops * (count // max(1, len(crops)) + 1))[:count]
+                seconds, found = timed(lambda: match(BENCH_GROUP, faces=faces), repeat)
+                result["match"].append({
+                    "students": size, "crops": count,
+                    "latency_ms": round(seconds * 1000, 2), "found": len(found),
+                })
+                print(f"  match: студентов {size:>4}, кропов {count:>4} → {seconds * 1000:8.1f} мс")
+    finally:
+        embeddings._store = saved_store
+        shutil.rmtree(group_dir, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return result
+
+
+def compare(current: dict, previous_path: str):
+    previous = json.loads(Path(previous_path).read_text(encoding="utf-8"))
+    print(f"\nСравнение с {previous_path} ({previous['meta'].get('revision')}):")
+
+    def flat(d, prefix=""):
+        for key, value in d.items():
+            if isinstance(value, dict):
+                yield from flat(value, f"{prefix}{key}.")
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield f"{prefix}{key}", value
+
+    old = dict(flat({k: v for k, v in previous.items() if k != "meta"}))
+    for key, value in flat({k: v for k, v in current.items() if k != "meta"}):
+        if key in old and old[key]:
+            print(f"  {key:<40} {old[key]:>10} → {value:>10} ({(value - old[key]) / old[key] * 100:+.1f}%)")
+
+    old_match = {(m["students"], m["crops"]): m["latency_ms"] for m in previous.get("pipeline", {}).get("match", [])}
+    for m in current.get("pipeline", {}).get("match", []):
+        key = (m["students"], m["crops"])
+        if old_match.get(key):
+            delta = (m["latency_ms"] - old_match[key]) / old_match[key] * 100
+            print(f"  match {key[0]}×{key[1]:<31} {old_match[key]:>10} → {m['latency_ms']:>10} ({delta:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк конвейера распознавания")
+    parser.add_argument("--roster", help="папка с эталонными фото (иначе синтетика)")
+    parser.add_argument("--crops", help="папка с кропами лиц (иначе синтетика)")
+    parser.add_argument("--video", help="видео для этапа детекции (иначе синтетические кадры)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--group-sizes", type=int, nargs="+", default=[10, 30, 100])
+    parser.add_argument("--crop-counts", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-model", action="store_true", help="только детекция (без DeepFace)")
+    parser.add_argument("--output", help="файл результатов (по умолчанию benchmarks/results/...)")
+    parser.add_argument("--compare", help="JSON прошлого прогона для сравнения")
+    args = parser.parse_args()
+
+    frames = (read_video(args.video, args.frames) if args.video
+              else synthetic_images(args.frames, (480, 640), args.seed))
+    roster = load_images(args.roster) if args.roster else synthetic_images(max(args.group_sizes), (400, 300), args.seed + 1)
+    crops = load_images(args.crops) if args.crops else synthetic_images(max(args.crop_counts), (120, 100), args.seed + 2)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "model": FACE_MODEL,
+            "metric": DISTANCE_METRIC,
+            "embed_batch_size": EMBED_BATCH_SIZE,
+            "frames": len(frames), "roster": len(roster), "crops": len(crops),
+            "synthetic": not (args.roster or args.crops or args.video),
+        },
+    }
+
+    print("Детекция...")
+    results["detection"] = bench_detection(frames)
+    for mode, stats in results["detection"].items():
+        print(f"  {mode:<9} {stats['ms_per_frame']:8.2f} мс/кадр")
+
+    if not args.skip_model:
+        print(f"Эмбеддинги и сопоставление (данные в {DATA_DIR})...")
+        results["pipeline"] = bench_pipeline(roster, crops, args.group_sizes, args.crop_counts, args.repeat)
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"pipeline-{datetime.now():%Y%m%d-%H%M%S}-{results['meta']['revision']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nРезультаты: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        if OWN_DATA_DIR:
+            shutil.rmtree(os.environ["ATTENDANCE_DATA_DIR"], ignore_errors=True)
@@ -0,0 +1,83 @@
+# benchmarks/quantization_benchmark.py
+"""
+Потеря точности при хранении кэша эмбеддингов в float16/int8.
+
+Эталонные векторы квантуются так же, как в EmbeddingStore.save(), и
+расстояния до кадров сравниваются с расстояниями по float32: средняя и
+максимальная ошибка, сколько решений "тот же человек" (расстояние ниже
+FACE_THRESHOLD) поменялось и сколько байт занимает матрица.
+
+По умолчанию берётся свой кэш (data/embeddings), кадрами служат
+зашумлённые копии эталонов; без кэша — синтетические векторы.
+
+Запуск:
+    python -m benchmarks.quantization_benchmark
+    python -m benchmarks.quantization_benchmark --synthetic --photos 5000
+"""
+
+import argparse
+
+import numpy as np
+
+from config.settings import DISTANCE_METRIC, FACE_THRESHOLD
+from core.face_matcher.distance import distance_matrix, l2_normalize
+from core.face_matcher.embeddings import QUANTIZED_DTYPES, dequantize, get_store, quantize
+
+
+def synthetic(n_photos: int, dim: int = 512, seed: int = 0) -> np.ndarray:
+    """Векторы масштаба Facenet512 (норма ~ 20-30), направления случайные."""
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n_photos, dim)) * rng.uniform(0.9, 1.3, size=(n_photos, 1))).astype(np.float32)
+
+
+def make_queries(references: np.ndarray, n_queries: int, noise: float, seed: int = 1) -> np.ndarray:
+    """
+    Кадры: половина — зашумлённые эталоны (свои, шум от 0 до noise, так что
+    расстояния ложатся по обе стороны порога), половина — случайные (чужие).
+    """
+    rng = np.random.default_rng(seed)
+    dim = references.shape[1]
+    scale = np.linalg.norm(references, axis=1).mean()
+    own = references[rng.integers(len(references), size=n_queries // 2)]
+    levels = rng.uniform(0, noise, size=(len(own), 1))
+    own = own + levels * np.linalg.norm(own, axis=1, keepdims=True) * rng.normal(size=own.shape) / np.sqrt(dim)
+    other = scale * l2_normalize(rng.normal(size=(n_queries - len(own), dim)))
+    return np.concatenate([own, other]).astype(np.float32)
+
+
+def run(references: np.ndarray, queries: np.ndarray, metric: str, threshold: float):
+    exact = distance_matrix(queries, references, metric)
+    near = np.count_nonzero(np.abs(exact - threshold) < 0.01)
+    print(f"эталонов: {len(references)}, кадров: {len(queries)}, метрика {metric}, порог {threshold}, "
+          f"пар в пределах ±0.01 от порога: {near}")
+    print(f"{'тип':<8} {'байт/фото':>10} {'средняя ошибка':>15} {'макс. ошибка':>13} "
+          f"{'решений изменилось':>19}")
+    for dtype in QUANTIZED_DTYPES:
+        data, scales = quantize(references, dtype)
+        approx = distance_matrix(queries, dequantize(data, scales), metric)
+        error = np.abs(approx - exact)
+        flipped = int(np.count_nonzero((approx < threshold) != (exact < threshold)))
+        size = data.nbytes + (scales.nbytes if scales is not None else 0)
+        print(f"{dtype:<8} {size / len(references):>10.0f} {error.mean():>15.2e} {error.max():>13.2e} "
+              f"{flipped:>10} из {exact.size}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Потеря точности при квантизации эмбеддингов")
+    parser.add_argument("--synthetic", action="store_true", help="синтетические векторы вместо своего кэша")
+    parser.add_argument("--photos", type=int, default=2000, help="число синтетических эталонов")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--noise", type=float, default=3.5, help="максимальный шум кадра относительно нормы эталона")
+    parser.add_argument("--metric", default=DISTANCE_METRIC)
+    args = parser.parse_args()
+
+    references = np.empty((0, 0), dtype=np.float32) if args.synthetic else get_store().matrix()[1]
+    if not len(references):
+        if not args.synthetic:
+            print("Кэш эмбеддингов пуст — синтетические векторы")
+        references = synthetic(args.photos)
+    run(references, make_queries(references, args.queries, args.noise), args.metric, FACE_THRESHOLD)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/startup_benchmark.py
+"""
+Время холодного импорта модулей приложения.
+
+Каждый модуль импортируется в отдельном свежем процессе с
+python -X importtime; печатается полное время импорта, самые тяжёлые
+зависимости и то, подтянулись ли DeepFace/TensorFlow. Так видно, что
+страницы входа и списка студентов не платят за загрузку модели.
+
+Запуск:
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark core.face_matcher.model --top 15
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_MODULES = [
+    "streamlit",
+    "config.settings",
+    "core.students",
+    "core.thumbnails",
+    "core.capture_worker",
+    "core.face_matcher",
+    "core.face_matcher.core",
+    "deepface",
+]
+HEAVY = ("deepface", "tensorflow", "keras", "torch")
+
+
+def import_profile(module: str) -> dict:
+    """Импорт модуля в свежем процессе: {"total_ms", "imports": {имя: собственное время, мс}, "heavy"}."""
+    code = (
+        f"import {module}; import json, sys; "
+        f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & {set(HEAVY)!r})))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "ошибка"}
+
+    imports, total_us = {}, 0
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        imports[name.strip()] = int(self_us) / 1000
+        if name.strip() == module:
+            total_us = int(cumulative_us)
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "imports": imports,
+        "heavy": json.loads(proc.stdout.strip().splitlines()[-1]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время холодного импорта модулей")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=5, help="сколько самых тяжёлых зависимостей показать")
+    args = parser.parse_args()
+
+    print(f"{'модуль':<28} {'импорт, мс':>11}  тяжёлые зависимости")
+    for module in args.modules:
+        profile = import_profile(module)
+        if "error" in profile:
+            print(f"{module:<28} {'—':>11}  {profile['error']}")
+            continue
+        print(f"{module:<28} {profile['total_ms']:>11.1f}  {', '.join(profile['heavy']) or '—'}")
+        heaviest = sorted(profile["imports"].items(), key=lambda item: item[1], reverse=True)
+        for name, ms in heaviest[:args.top]:
+            print(f"    {name:<40} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
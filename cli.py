@@ -0,0 +1,163 @@
+# cli.py
+"""
+Перекличка без интерфейса: захват с камер или из видеофайла,
+распознавание группы и запись результатов.
+
+Подходит для запуска по расписанию (cron/systemd) в начале занятия.
+Streamlit и страницы не импортируются; DeepFace загружается только
+для распознавания, а с --warm — заранее, параллельно со съёмкой.
+
+Примеры:
+    python cli.py ГР-1 --camera 0 --duration 60 --warm
+    python cli.py ГР-1 --camera 0 --camera 1 --stream --output roll_call.json
+    python cli.py ГР-2 --video lesson.mp4
+    python cli.py ГР-2 --video lecture.mp4 --every-n 10
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import CAPTURE_DURATION, GROUPS, STREAM_TIME_BUDGET, VIDEO_SAMPLE_FPS
+from core.face_buffer import FaceBuffer
+
+
+def start_warmup() -> threading.Thread:
+    """Загрузка и прогрев модели в фоне, пока идёт съёмка."""
+    def warm_up():
+        from core.face_matcher.model import warm_up
+        warm_up()
+
+    thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def capture_cameras(sources, buffer: FaceBuffer, duration: float, group: str, stream: bool):
+    """Съёмка с камер; в потоковом режиме — до момента, когда найдены все студенты."""
+    from core.camera_group import CameraGroup
+
+    cameras = CameraGroup(sources, face_buffer=buffer)
+    if not cameras.start():
+        raise RuntimeError(cameras.error or "Не удалось открыть камеры")
+    if cameras.error:
+        print(f"[CLI] {cameras.error}", file=sys.stderr)
+
+    matcher = None
+    if stream:
+        from core.face_matcher import StreamingMatcher
+        matcher = StreamingMatcher(group, time_budget=duration)
+
+    cameras.set_capturing(True)
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline and cameras.running:
+            time.sleep(0.2)
+            if matcher is not None:
+                matcher.feed(cameras.take_new_faces())
+                if matcher.done:
+                    break
+    finally:
+        cameras.set_capturing(False)
+        if matcher is not None:
+            # лучшие кропы треков, сброшенные при остановке (в том числе после таймаута)
+            matcher.finish(cameras.take_new_faces())
+        cameras.stop()
+    return matcher
+
+
+def run(args):
+    warmup = start_warmup() if args.warm else None
+    started = datetime.now()
+    buffer = FaceBuffer()
+    matcher = None
+
+    try:
+        if args.video:
+            from core.video_processor import process_video
+            buffer = process_video(args.video, sample_fps=args.sample_fps, every_n=args.every_n)
+            sources = [args.video]
+        else:
+            sources = args.camera or [0]
+            duration = args.duration or (STREAM_TIME_BUDGET if args.stream else CAPTURE_DURATION)
+            matcher = capture_cameras(sources, buffer, duration, args.group, args.stream)
+    except RuntimeError as e:
+        print(f"[CLI] {e}", file=sys.stderr)
+        return None
+    print(f"[CLI] Сохранено лиц: {buffer.total}", file=sys.stderr)
+
+    if warmup is not None:
+        warmup.join()
+
+    # None — сопоставлять было нечего (нет кадров, студентов или эмбеддингов): это не перекличка
+    results = None
+    if matcher is not None:
+        results = matcher.results() if matcher.matched else None
+    elif len(buffer):
+        from core.face_matcher import try_match
+        results = try_match(args.group, faces=buffer.snapshot())
+
+    from core.attendance import record_events, roll_call
+    if results is None:
+        print("[CLI] Кадры не сопоставлены — перекличка не записана", file=sys.stderr)
+    elif not args.no_db:
+        record_events(args.group, results, timestamp=started)
+
+    return {
+        "group": args.group,
+        "started_at": started.isoformat(timespec="seconds"),
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "sources": [str(s) for s in sources],
+        "faces": buffer.total,
+        "recorded": results is not None and not args.no_db,
+        **roll_call(args.group, results or []),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Перекличка группы без интерфейса")
+    parser.add_argument("group", choices=GROUPS)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--camera", action="append", type=int,
+                        help="индекс камеры (можно несколько раз)")
+    source.add_argument("--video", help="видеофайл вместо камеры")
+    parser.add_argument("--duration", type=float, default=None,
+                        help=f"секунд съёмки (по умолчанию {CAPTURE_DURATION}, "
+                             f"в потоковом режиме {STREAM_TIME_BUDGET})")
+    parser.add_argument("--sample-fps", type=float, default=VIDEO_SAMPLE_FPS,
+                        help=f"кадров в секунду для --video (по умолчанию {VIDEO_SAMPLE_FPS})")
+    parser.add_argument("--every-n", type=int, default=None,
+                        help="для --video: каждый N-й кадр (вместо --sample-fps)")
+    parser.add_argument("--stream", action="store_true",
+                        help="распознавать по ходу съёмки и остановиться, когда найдены все "
+                             "(только с камерами)")
+    parser.add_argument("--warm", action="store_true", help="загрузить модель заранее, параллельно со съёмкой")
+    parser.add_argument("--output", help="JSON с результатами (по умолчанию — stdout)")
+    parser.add_argument("--no-db", action="store_true", help="не писать события в журнал посещаемости")
+    args = parser.parse_args()
+    if args.stream and args.video:
+        # запись обрабатывается целиком пулом процессов — останавливать съёмку нечего
+        parser.error("--stream работает только с камерами, не с --video")
+
+    # журнал ядра (print) — в stderr, в stdout только JSON с результатами
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run(args)
+    if report is None:
+        return 1
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"[CLI] Результаты: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
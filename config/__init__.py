@@ -1,14 +1,40 @@
 # config/__init__.py
 from .settings import (
-    BASE_DIR, DATA_DIR, PHOTOS_DIR, TEMP_FACES_DIR,
-    CAMERA_INDEX, CAPTURE_DURATION, SAVE_INTERVAL,
+    BASE_DIR, DATA_DIR, PHOTOS_DIR, TEMP_FACES_DIR, EMBEDDINGS_DIR,
+    DATABASE_DIR, STUDENTS_DB, LEGACY_STUDENTS_JSON,
+    THUMBNAILS_DIR, THUMBNAIL_SIZE, STUDENTS_PAGE_SIZE, EXPORTS_DIR, EXPORT_CHUNK_ROWS,
+    EXPORT_DOWNLOAD_MAX_MB,
+    CANONICAL_PHOTO_SIZE, IMPORT_FACE_MARGIN, IMPORT_WORKERS, IMPORT_INTAKE_DIR,
+    CAMERA_INDEX, CAMERA_SOURCES, CAPTURE_DURATION, SAVE_INTERVAL,
+    FACE_BUFFER_SIZE, SAVE_DEBUG_FACES,
+    CAPTURE_FPS, FRAME_RING_SIZE, LIVE_SAVE_INTERVAL, LIVE_REFRESH_INTERVAL,
+    DETECT_SCALE, DETECT_SKIP_FRAMES, DETECT_ROI_MARGIN, DETECT_FULL_SCAN_EVERY,
+    USE_FACE_TRACKER, TRACK_IOU_THRESHOLD, TRACK_MAX_MISSED, TRACK_MIN_HITS,
+    TRACK_EMIT_AFTER, TRACK_REEMIT_GAIN,
+    VIDEO_SAMPLE_FPS, VIDEO_CHUNK_SECONDS, VIDEO_WORKERS, VIDEO_SEEK_MIN_GAP,
     FACE_THRESHOLD, FACE_MODEL, DISTANCE_METRIC,
+    EMBEDDING_DTYPE, EMBED_BATCH_SIZE, SKIP_CROP_DETECTION, MODEL_WARMUP,
+    EMBED_WORKERS, PARALLEL_MIN_BATCH,
+    ANN_N_PROBE, PROTOTYPES_PER_STUDENT, PHOTOS_PER_PROTOTYPE, STREAM_TIME_BUDGET,
     ADMIN_PASSWORD, GROUPS, SUPPORTED_EXT
 )
 
 __all__ = [
-    "BASE_DIR", "DATA_DIR", "PHOTOS_DIR", "TEMP_FACES_DIR",
-    "CAMERA_INDEX", "CAPTURE_DURATION", "SAVE_INTERVAL",
+    "BASE_DIR", "DATA_DIR", "PHOTOS_DIR", "TEMP_FACES_DIR", "EMBEDDINGS_DIR",
+    "DATABASE_DIR", "STUDENTS_DB", "LEGACY_STUDENTS_JSON",
+    "THUMBNAILS_DIR", "THUMBNAIL_SIZE", "STUDENTS_PAGE_SIZE", "EXPORTS_DIR", "EXPORT_CHUNK_ROWS",
+    "EXPORT_DOWNLOAD_MAX_MB",
+    "CANONICAL_PHOTO_SIZE", "IMPORT_FACE_MARGIN", "IMPORT_WORKERS", "IMPORT_INTAKE_DIR",
+    "CAMERA_INDEX", "CAMERA_SOURCES", "CAPTURE_DURATION", "SAVE_INTERVAL",
+    "FACE_BUFFER_SIZE", "SAVE_DEBUG_FACES",
+    "CAPTURE_FPS", "FRAME_RING_SIZE", "LIVE_SAVE_INTERVAL", "LIVE_REFRESH_INTERVAL",
+    "DETECT_SCALE", "DETECT_SKIP_FRAMES", "DETECT_ROI_MARGIN", "DETECT_FULL_SCAN_EVERY",
+    "USE_FACE_TRACKER", "TRACK_IOU_THRESHOLD", "TRACK_MAX_MISSED", "TRACK_MIN_HITS",
+    "TRACK_EMIT_AFTER", "TRACK_REEMIT_GAIN",
+    "VIDEO_SAMPLE_FPS", "VIDEO_CHUNK_SECONDS", "VIDEO_WORKERS", "VIDEO_SEEK_MIN_GAP",
     "FACE_THRESHOLD", "FACE_MODEL", "DISTANCE_METRIC",
+    "EMBEDDING_DTYPE", "EMBED_BATCH_SIZE", "SKIP_CROP_DETECTION", "MODEL_WARMUP",
+    "EMBED_WORKERS", "PARALLEL_MIN_BATCH",
+    "ANN_N_PROBE", "PROTOTYPES_PER_STUDENT", "PHOTOS_PER_PROTOTYPE", "STREAM_TIME_BUDGET",
     "ADMIN_PASSWORD", "GROUPS", "SUPPORTED_EXT"
 ]
\ No newline at end of file
@@ -4,37 +4,104 @@
 Содержит пути, настройки и константы.
 """
 
+import os
 from pathlib import Path
 
 #основные пути
 BASE_DIR = Path(__file__).parent.parent          # attendance-system/
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.environ.get("ATTENDANCE_DATA_DIR", BASE_DIR / "data"))  # переопределяется для бенчмарков
 PHOTOS_DIR = DATA_DIR / "photos"                 # Фото студентов: data/photos/ГР-1/
 TEMP_FACES_DIR = PHOTOS_DIR / "temp_faces" # Временные скриншоты: data/temp_faces/
 DATABASE_DIR = BASE_DIR / "database" # базы данных attendance-system/batabase/
+EMBEDDINGS_DIR = DATA_DIR / "embeddings"         # Кэш эмбеддингов эталонных фото
+THUMBNAILS_DIR = DATA_DIR / "thumbnails"         # Кэш превью фото для списков
+EXPORTS_DIR = DATA_DIR / "exports"               # Выгрузки журнала посещаемости (CSV/Parquet)
+IMPORT_INTAKE_DIR = DATA_DIR / "intake"          # Папки для массового импорта с сервера
+STUDENTS_DB = DATABASE_DIR / "student.db"        # список студентов (SQLite)
+LEGACY_STUDENTS_JSON = DATA_DIR / "students.json"  # старый список, переносится в STUDENTS_DB
 
 # автоматически создаем папки
-for directory in [DATA_DIR, PHOTOS_DIR, TEMP_FACES_DIR]:
+for directory in [DATA_DIR, PHOTOS_DIR, TEMP_FACES_DIR, DATABASE_DIR, EMBEDDINGS_DIR, THUMBNAILS_DIR,
+                  EXPORTS_DIR, IMPORT_INTAKE_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
 # камера
 CAMERA_INDEX = 0
+CAMERA_SOURCES = [CAMERA_INDEX]  # камеры по умолчанию (индексы или URL потоков)
 CAPTURE_DURATION = 8      # секунд съёмки
 SAVE_INTERVAL = 0.5       # интервал между кадрами (сек)
+FACE_BUFFER_SIZE = 500    # сколько кропов держать в памяти до распознавания
+SAVE_DEBUG_FACES = False  # дублировать кропы на диск в TEMP_FACES_DIR (отладка)
+CAPTURE_FPS = 15          # частота кадров фонового потока камеры
+FRAME_RING_SIZE = 30      # сколько последних кадров держит поток камеры
+LIVE_SAVE_INTERVAL = 2.0  # интервал сохранения лиц в живом режиме (сек)
+LIVE_REFRESH_INTERVAL = 0.1  # как часто страница забирает кадр у потока (сек)
+
+# адаптивная детекция лиц в живом видео (core/face_detector.py)
+DETECT_SCALE = 0.5          # детекция на уменьшенном кадре (1.0 — полный размер)
+DETECT_SKIP_FRAMES = 1      # сколько кадров подряд переиспользовать прошлые рамки
+DETECT_ROI_MARGIN = 0.5     # запас вокруг прошлой рамки при локальном поиске (доля размера лица)
+DETECT_FULL_SCAN_EVERY = 10 # полный проход по кадру раз в N детекций
+
+# трекинг лиц между кадрами (один лучший кроп на человека)
+USE_FACE_TRACKER = True
+TRACK_IOU_THRESHOLD = 0.3  # минимальный IoU рамок одного трека
+TRACK_MAX_MISSED = 15      # кадров без детекции до закрытия трека
+TRACK_MIN_HITS = 3         # треки короче — ложные срабатывания
+TRACK_EMIT_AFTER = 15      # через сколько кадров отправить лучший кроп трека
+TRACK_REEMIT_GAIN = 1.5    # повторно отправлять, если качество выросло в N раз
+
+# обработка записей занятий (core/video_processor.py)
+VIDEO_SAMPLE_FPS = 2.0        # сколько кадров в секунду записи обрабатывать
+VIDEO_CHUNK_SECONDS = 300     # длина отрезка записи на один процесс (сек)
+VIDEO_WORKERS = min(8, os.cpu_count() or 1)  # процессов для отрезков
+VIDEO_SEEK_MIN_GAP = 30       # с какого шага перематывать, а не пропускать кадры grab()
 
 #распознавание лиц
 FACE_THRESHOLD = 0.68
 FACE_MODEL = "Facenet512"
 DISTANCE_METRIC = "cosine"   # ← Исправлено: строка, не кортеж
+EMBEDDING_DTYPE = "float16"  # хранение кэша эмбеддингов: float32 | float16 | int8
+EMBED_BATCH_SIZE = 32        # размер батча при прогоне кропов через модель
+SKIP_CROP_DETECTION = True   # кропы уже вырезаны каскадом — не детектировать повторно
+MODEL_WARMUP = True          # загружать и прогревать модель в фоне при старте
+EMBED_WORKERS = 0            # процессов для расчёта эмбеддингов (0/1 — в текущем процессе)
+PARALLEL_MIN_BATCH = 64      # пачки меньше считаются без пула процессов
+ANN_N_PROBE = 8              # сколько кластеров IVF-индекса просматривать при поиске
+PROTOTYPES_PER_STUDENT = 3   # не больше стольких прототипов на студента (несколько фото)
+PHOTOS_PER_PROTOTYPE = 3     # фото на один прототип: 1–5 фото -> 1 прототип, 6–8 -> 2, ...
+STREAM_TIME_BUDGET = 300     # потоковое распознавание: максимум секунд на перекличку
 
 # настройки приложения
 ADMIN_PASSWORD = "admin"
 GROUPS = ["ГР-1", "ГР-2", "ГР-3", "ГР-4"]
 SUPPORTED_EXT = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
+THUMBNAIL_SIZE = 160       # большая сторона превью, px (показываются в 80 px — запас под HiDPI)
+STUDENTS_PAGE_SIZE = 20    # студентов на странице списка
+EXPORT_CHUNK_ROWS = 5000   # строк журнала на порцию при выгрузке в CSV/Parquet
+EXPORT_DOWNLOAD_MAX_MB = 50  # выгрузки крупнее не отдаются через браузер (Streamlit держит файл в памяти)
+
+# массовый импорт студентов (core/roster_import.py)
+CANONICAL_PHOTO_SIZE = (300, 400)  # ширина, высота сохраняемого фото студента
+IMPORT_FACE_MARGIN = 0.4           # запас вокруг лица при кропе (доля размера лица)
+IMPORT_WORKERS = min(8, os.cpu_count() or 1)  # потоков предобработки фото
 
 __all__ = [
-    "BASE_DIR", "DATA_DIR", "PHOTOS_DIR", "TEMP_FACES_DIR",
-    "CAMERA_INDEX", "CAPTURE_DURATION", "SAVE_INTERVAL",
+    "BASE_DIR", "DATA_DIR", "PHOTOS_DIR", "TEMP_FACES_DIR", "EMBEDDINGS_DIR",
+    "DATABASE_DIR", "STUDENTS_DB", "LEGACY_STUDENTS_JSON",
+    "THUMBNAILS_DIR", "THUMBNAIL_SIZE", "STUDENTS_PAGE_SIZE", "EXPORTS_DIR", "EXPORT_CHUNK_ROWS",
+    "EXPORT_DOWNLOAD_MAX_MB",
+    "CANONICAL_PHOTO_SIZE", "IMPORT_FACE_MARGIN", "IMPORT_WORKERS", "IMPORT_INTAKE_DIR",
+    "CAMERA_INDEX", "CAMERA_SOURCES", "CAPTURE_DURATION", "SAVE_INTERVAL",
+    "FACE_BUFFER_SIZE", "SAVE_DEBUG_FACES",
+    "CAPTURE_FPS", "FRAME_RING_SIZE", "LIVE_SAVE_INTERVAL", "LIVE_REFRESH_INTERVAL",
+    "DETECT_SCALE", "DETECT_SKIP_FRAMES", "DETECT_ROI_MARGIN", "DETECT_FULL_SCAN_EVERY",
+    "USE_FACE_TRACKER", "TRACK_IOU_THRESHOLD", "TRACK_MAX_MISSED", "TRACK_MIN_HITS",
+    "TRACK_EMIT_AFTER", "TRACK_REEMIT_GAIN",
+    "VIDEO_SAMPLE_FPS", "VIDEO_CHUNK_SECONDS", "VIDEO_WORKERS", "VIDEO_SEEK_MIN_GAP",
     "FACE_THRESHOLD", "FACE_MODEL", "DISTANCE_METRIC",
+    "EMBEDDING_DTYPE", "EMBED_BATCH_SIZE", "SKIP_CROP_DETECTION", "MODEL_WARMUP",
+    "EMBED_WORKERS", "PARALLEL_MIN_BATCH",
+    "ANN_N_PROBE", "PROTOTYPES_PER_STUDENT", "PHOTOS_PER_PROTOTYPE", "STREAM_TIME_BUDGET",
     "ADMIN_PASSWORD", "GROUPS", "SUPPORTED_EXT"
 ]
\ No newline at end of file
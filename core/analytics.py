@@ -0,0 +1,288 @@
+# core/analytics.py
+"""
+Статистика посещаемости по журналу (attendance_sessions, attendance_events).
+
+Журнал хранит по событию на найденного студента в каждой перекличке, и
+за семестр событий становится много. Поэтому статистика строится не по
+нему, а по дневным агрегатам в той же базе:
+  - attendance_daily — студент × группа × день: число отметок (по одной
+    на перекличку, где студента нашли), первая и последняя отметка,
+    лучшая уверенность;
+  - attendance_group_days — группа × день: число перекличек, включая
+    те, где никого не нашли. Посещаемость — отметки / переклички.
+Агрегаты обновляются инкрементально: refresh_daily() берёт только
+переклички и события с id больше последних учтённых, сворачивает их в
+pandas (groupby) и прибавляет к таблицам (UPSERT). record_events()
+вызывает его после каждой записи. Блокировку на запись refresh_daily()
+берёт, только если в журнале есть неучтённые строки (проверка — обычным
+чтением), поэтому запросы ниже его не вызывают: страница статистики
+догоняет агрегаты один раз за отрисовку, до запросов.
+
+Дни — строки YYYY-MM-DD; периоды [since, until] включают оба конца.
+"""
+
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from core.attendance import init_db as init_events_db, normalize_name
+from core.db import get_connection, transaction
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def init_db():
+    global _initialized
+    if _initialized:
+        return
+    init_events_db()
+    with _init_lock:
+        if _initialized:
+            return
+        with transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS attendance_daily (
+                    day TEXT NOT NULL,
+                    group_name TEXT NOT NULL,
+                    student TEXT NOT NULL,
+                    events INTEGER NOT NULL,
+                    first_ts TEXT NOT NULL,
+                    last_ts TEXT NOT NULL,
+                    max_confidence REAL,
+                    PRIMARY KEY (day, group_name, student)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_group_day ON attendance_daily (group_name, day)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS attendance_group_days (
+                    day TEXT NOT NULL,
+                    group_name TEXT NOT NULL,
+                    sessions INTEGER NOT NULL,
+                    PRIMARY KEY (group_name, day)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analytics_state (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT INTO analytics_state (key, value) VALUES ('last_event_id', 0), ('last_session_id', 0) "
+                "ON CONFLICT (key) DO NOTHING"
+            )
+        _initialized = True
+
+
+def _none_if_missing(value):
+    return None if pd.isna(value) else value
+
+
+def _has_new_rows() -> bool:
+    """Есть ли в журнале строки, ещё не учтённые в агрегатах (без блокировки на запись)."""
+    init_db()
+    row = get_connection().execute(
+        "SELECT (SELECT MAX(id) FROM attendance_events) AS max_event, "
+        "(SELECT value FROM analytics_state WHERE key = 'last_event_id') AS last_event, "
+        "(SELECT MAX(id) FROM attendance_sessions) AS max_session, "
+        "(SELECT value FROM analytics_state WHERE key = 'last_session_id') AS last_session"
+    ).fetchone()
+    return ((row["max_event"] or 0) > row["last_event"]
+            or (row["max_session"] or 0) > row["last_session"])
+
+
+def _set_state(conn, key: str, value: int):
+    conn.execute(
+        "INSERT INTO analytics_state (key, value) VALUES (?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def refresh_daily() -> int:
+    """Дописать в агрегаты новые переклички и события журнала. Возвращает число учтённых событий."""
+    if not _has_new_rows():
+        return 0
+    # BEGIN IMMEDIATE: параллельные обновления не учтут одну строку дважды
+    # (после проверки выше их мог учесть другой поток — тогда выборки пусты)
+    with transaction() as conn:
+        state = {row["key"]: row["value"] for row in conn.execute("SELECT key, value FROM analytics_state")}
+        events = pd.read_sql_query(
+            "SELECT id, student, group_name, ts, confidence "
+            "FROM attendance_events WHERE id > ? ORDER BY id",
+            conn, params=(state["last_event_id"],),
+        )
+        sessions = pd.read_sql_query(
+            "SELECT id, group_name, ts FROM attendance_sessions WHERE id > ? ORDER BY id",
+            conn, params=(state["last_session_id"],),
+        )
+        if events.empty and sessions.empty:
+            return 0
+
+        events["day"] = events["ts"].str.slice(0, 10)
+        daily = (
+            events.groupby(["day", "group_name", "student"], sort=False)
+            .agg(events=("id", "size"), first_ts=("ts", "min"), last_ts=("ts", "max"),
+                 max_confidence=("confidence", "max"))
+            .reset_index()
+        )
+        sessions["day"] = sessions["ts"].str.slice(0, 10)
+        held = sessions.groupby(["day", "group_name"], sort=False).size().rename("sessions").reset_index()
+
+        conn.executemany(
+            """
+            INSERT INTO attendance_daily
+                (day, group_name, student, events, first_ts, last_ts, max_confidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (day, group_name, student) DO UPDATE SET
+                events = events + excluded.events,
+                first_ts = MIN(first_ts, excluded.first_ts),
+                last_ts = MAX(last_ts, excluded.last_ts),
+                max_confidence = COALESCE(MAX(max_confidence, excluded.max_confidence),
+                                          max_confidence, excluded.max_confidence)
+            """,
+            [
+                (r.day, r.group_name, r.student, int(r.events), r.first_ts, r.last_ts,
+                 _none_if_missing(r.max_confidence))
+                for r in daily.itertuples(index=False)
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO attendance_group_days (day, group_name, sessions) VALUES (?, ?, ?)
+            ON CONFLICT (group_name, day) DO UPDATE SET sessions = sessions + excluded.sessions
+            """,
+            [(r.day, r.group_name, int(r.sessions)) for r in held.itertuples(index=False)],
+        )
+        if not events.empty:
+            _set_state(conn, "last_event_id", int(events["id"].max()))
+        if not sessions.empty:
+            _set_state(conn, "last_session_id", int(sessions["id"].max()))
+    print(f"[Analytics] Учтено перекличек: {len(sessions)}, событий: {len(events)}")
+    return len(events)
+
+
+def _period_query(table: str, columns: str, group: Optional[str],
+                  since: Optional[date], until: Optional[date]) -> pd.DataFrame:
+    init_db()
+    query = f"SELECT {columns} FROM {table}"
+    conditions, params = [], []
+    if group is not None:
+        conditions.append("group_name = ?")
+        params.append(group)
+    if since is not None:
+        conditions.append("day >= ?")
+        params.append(since.isoformat())
+    if until is not None:
+        conditions.append("day <= ?")
+        params.append(until.isoformat())
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return pd.read_sql_query(query, get_connection(), params=params)
+
+
+def daily_frame(group: Optional[str] = None, since: Optional[date] = None,
+                until: Optional[date] = None) -> pd.DataFrame:
+    """Дневные агрегаты: day, group_name, student, events, first_ts, last_ts, max_confidence."""
+    return _period_query(
+        "attendance_daily", "day, group_name, student, events, first_ts, last_ts, max_confidence",
+        group, since, until,
+    )
+
+
+def class_days(group: Optional[str] = None, since: Optional[date] = None,
+               until: Optional[date] = None) -> pd.DataFrame:
+    """Дни с перекличками: day, group_name, sessions (число перекличек)."""
+    return _period_query("attendance_group_days", "day, group_name, sessions", group, since, until)
+
+
+def present_students(day: date, group: Optional[str] = None) -> Set[Tuple[str, str]]:
+    """Пары (группа, нормализованное имя) студентов, отмеченных в этот день."""
+    init_db()
+    query = "SELECT group_name, student FROM attendance_daily WHERE day = ?"
+    params = [day.isoformat()]
+    if group is not None:
+        query += " AND group_name = ?"
+        params.append(group)
+    return {
+        (row["group_name"], normalize_name(row["student"]))
+        for row in get_connection().execute(query, params)
+    }
+
+
+def filter_by_attendance(students: List[Dict], day: date, present: bool = True,
+                         group: Optional[str] = None) -> List[Dict]:
+    """Студенты из load_students(), которые были (present=True) или не были в этот день."""
+    refresh_daily()
+    marked = present_students(day, group)
+    return [s for s in students if ((s["group"], normalize_name(s["name"])) in marked) == present]
+
+
+def student_rates(group: Optional[str] = None, since: Optional[date] = None,
+                  until: Optional[date] = None) -> pd.DataFrame:
+    """
+    Посещаемость студентов за период: name, group, sessions_present (на
+    скольких перекличках отмечен), sessions (сколько перекличек было у
+    группы), rate (0..1), last_seen. Студенты из базы без отметок — с rate = 0.
+    """
+    from core.students import load_students
+
+    daily = daily_frame(group, since, until)
+    days = class_days(group, since, until)
+
+    daily["key"] = daily["student"].map(normalize_name)
+    seen = (
+        daily.groupby(["group_name", "key"])
+        .agg(sessions_present=("events", "sum"), last_seen=("last_ts", "max"), event_name=("student", "first"))
+        .reset_index()
+    )
+    roster = pd.DataFrame(load_students(group), columns=["name", "group"])
+    roster = roster.rename(columns={"group": "group_name"})
+    roster["key"] = roster["name"].map(normalize_name)
+
+    rates = roster.merge(seen, on=["group_name", "key"], how="outer")
+    # распознанные по фото, но не занесённые в базу — под именем из журнала
+    rates["name"] = rates["name"].fillna(rates["event_name"])
+    rates["sessions_present"] = rates["sessions_present"].fillna(0).astype(int)
+    # знаменатель — переклички, в том числе те, где никого не нашли
+    held = days.groupby("group_name")["sessions"].sum()
+    rates = rates.join(held, on="group_name")
+    rates["sessions"] = rates["sessions"].fillna(0).astype(int)
+    rates["rate"] = (rates["sessions_present"] / rates["sessions"].where(rates["sessions"] > 0)).fillna(0.0)
+    return (
+        rates.rename(columns={"group_name": "group"})
+        [["name", "group", "sessions_present", "sessions", "rate", "last_seen"]]
+        .sort_values(["group", "rate", "name"], ascending=[True, False, True], ignore_index=True)
+    )
+
+
+def group_rates(since: Optional[date] = None, until: Optional[date] = None) -> pd.DataFrame:
+    """По группам: group, students, sessions, rate (средняя посещаемость студента)."""
+    rates = student_rates(None, since, until)
+    return (
+        rates.groupby("group")
+        .agg(students=("name", "size"), sessions=("sessions", "max"), rate=("rate", "mean"))
+        .reset_index()
+    )
+
+
+def attendance_by_day(group: Optional[str] = None, since: Optional[date] = None,
+                      until: Optional[date] = None) -> pd.DataFrame:
+    """По дням с перекличками: day, group, present (число отмеченных студентов)."""
+    daily = daily_frame(group, since, until)
+    days = class_days(group, since, until)
+    present = (
+        daily.assign(key=daily["student"].map(normalize_name))
+        .groupby(["day", "group_name"])["key"].nunique().rename("present")
+    )
+    return (
+        days.join(present, on=["day", "group_name"])
+        .fillna({"present": 0})
+        .astype({"present": int})
+        .rename(columns={"group_name": "group"})
+        [["day", "group", "present"]]
+        .sort_values(["day", "group"], ignore_index=True)
+    )
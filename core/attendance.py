@@ -0,0 +1,166 @@
+# core/attendance.py
+"""
+Журнал посещаемости: таблицы attendance_sessions и attendance_events
+в database/student.db.
+
+Каждая перекличка — один захват, кадры которого сопоставлены с группой,
+— добавляет строку в attendance_sessions (даже если никого не нашли,
+иначе такое занятие пропало бы из статистики) и по строке в
+attendance_events на найденного студента (имя, группа, время,
+уверенность, id запуска). Всё пишется в одной транзакции; запуск с уже
+записанным id пропускается, так что один захват не попадёт в журнал
+дважды. Запуски, где сопоставлять было нечего (нет кадров, студентов
+или эмбеддингов — см. try_match()), вызывающие не записывают. Журнал только дополняется — UPDATE и
+DELETE запрещены триггерами. Статистика строится по дневным агрегатам
+(core/analytics.py).
+"""
+
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from core.db import get_connection, transaction
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def init_db():
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        with transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS attendance_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL UNIQUE,
+                    group_name TEXT NOT NULL,
+                    ts TEXT NOT NULL,
+                    recognized INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS attendance_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student TEXT NOT NULL,
+                    group_name TEXT NOT NULL,
+                    ts TEXT NOT NULL,
+                    confidence REAL,
+                    session_id TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_attendance_group_ts ON attendance_events (group_name, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_attendance_student_ts ON attendance_events (student, ts)")
+            for table in ("attendance_sessions", "attendance_events"):
+                for action in ("UPDATE", "DELETE"):
+                    conn.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_no_{action.lower()}
+                        BEFORE {action} ON {table}
+                        BEGIN SELECT RAISE(ABORT, '{table} is append-only'); END
+                    """)
+        _initialized = True
+
+
+def new_session_id() -> str:
+    """Id запуска распознавания (связывает события одной переклички)."""
+    return uuid.uuid4().hex
+
+
+def record_events(group: str, results: List[Dict], session_id: Optional[str] = None,
+                  timestamp: Optional[datetime] = None) -> int:
+    """
+    Записать перекличку и её результаты match() ([{"name", "confidence"}])
+    одной транзакцией. Перекличка записывается и при пустых results;
+    уже записанный session_id пропускается. Возвращает число записанных событий.
+    """
+    init_db()
+    session_id = session_id or new_session_id()
+    ts = (timestamp or datetime.now()).isoformat(timespec="seconds")
+    rows = [(r["name"], group, ts, r.get("confidence"), session_id) for r in results]
+    with transaction() as conn:
+        inserted = conn.execute(
+            "INSERT INTO attendance_sessions (session_id, group_name, ts, recognized) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (session_id) DO NOTHING",
+            (session_id, group, ts, len(rows)),
+        ).rowcount
+        if not inserted:
+            print(f"[Attendance] {group}: запуск {session_id[:8]} уже записан")
+            return 0
+        conn.executemany(
+            "INSERT INTO attendance_events (student, group_name, ts, confidence, session_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+    print(f"[Attendance] {group}: записано событий {len(rows)} (запуск {session_id[:8]})")
+
+    # дневные агрегаты статистики; при ошибке их догонит следующий запрос
+    try:
+        from core.analytics import refresh_daily
+        refresh_daily()
+    except Exception as e:
+        print(f"[Attendance] Не удалось обновить статистику: {e}")
+    return len(rows)
+
+
+def normalize_name(name: str) -> str:
+    return name.lower().strip().replace(' ', '_').replace('-', '_')
+
+
+def roll_call(group: str, results: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Разбить группу на присутствующих и отсутствующих по результатам match().
+    Список группы — из базы, если в базе группы нет — по фото в папке.
+    """
+    from core.students import load_students
+    students = load_students(group)
+    if not students:
+        from core.photo_manager import PhotoManager
+        students = PhotoManager.get_students(group)
+
+    recognized = {normalize_name(r["name"]): r["confidence"] for r in results}
+    present, absent = [], []
+    for student in students:
+        confidence = recognized.get(normalize_name(student["name"]))
+        if confidence is None:
+            absent.append({"name": student["name"]})
+        else:
+            present.append({"name": student["name"], "confidence": confidence})
+    return {
+        "present": sorted(present, key=lambda s: s["name"]),
+        "absent": sorted(absent, key=lambda s: s["name"]),
+    }
+
+
+def load_events(group: Optional[str] = None, since: Optional[datetime] = None,
+                until: Optional[datetime] = None) -> List[Dict]:
+    """События за период [since, until) — по времени."""
+    init_db()
+    query = "SELECT id, student, group_name, ts, confidence, session_id FROM attendance_events"
+    conditions, params = [], []
+    if group is not None:
+        conditions.append("group_name = ?")
+        params.append(group)
+    if since is not None:
+        conditions.append("ts >= ?")
+        params.append(since.isoformat(timespec="seconds"))
+    if until is not None:
+        conditions.append("ts < ?")
+        params.append(until.isoformat(timespec="seconds"))
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY ts, id"
+    return [
+        {
+            "id": row["id"],
+            "student": row["student"],
+            "group": row["group_name"],
+            "ts": row["ts"],
+            "confidence": row["confidence"],
+            "session_id": row["session_id"],
+        }
+        for row in get_connection().execute(query, params)
+    ]
@@ -2,7 +2,11 @@
 import cv2
 import time
 from pathlib import Path
-from config.settings import TEMP_FACES_DIR, CAPTURE_DURATION, SAVE_INTERVAL, CAMERA_INDEX
+from config.settings import CAPTURE_DURATION, SAVE_INTERVAL, CAMERA_INDEX, USE_FACE_TRACKER
+from core.face_buffer import FaceBuffer
+from core.face_detector import FaceDetector
+from core.face_tracker import FaceTracker
+from core.metrics import metrics
 from core.photo_manager import PhotoManager
 
 #========================
@@ -10,14 +14,16 @@ from core.photo_manager import PhotoManager
 #=======================
 class CameraDetector:
     def __init__(self):
-        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        self.face_cascade = cv2.CascadeClassifier(cascade_path)
-        if self.face_cascade.empty():
-            raise RuntimeError("Не удалось загрузить haarcascade_frontalface_default.xml")
+        self.detector = FaceDetector(min_size=(30, 30))
+        # кропы уходят в распознавание из памяти: match(group, detector.buffer.snapshot())
+        self.buffer = FaceBuffer()
 
     def capture_faces(self) -> bool:
-        PhotoManager.clear_temp_folder()
+        self.buffer.clear()
+        if self.buffer.save_debug:
+            PhotoManager.clear_temp_folder()
 
+        self.detector.reset()
         cap = cv2.VideoCapture(CAMERA_INDEX)
         if not cap.isOpened():
             print("Не удалось открыть камеру")
@@ -26,31 +32,45 @@ class CameraDetector:
         start_time = time.time()
         saved_count = 0
         last_save = 0
+        # с трекером сохраняется один лучший кроп на каждое лицо
+        tracker = FaceTracker() if USE_FACE_TRACKER else None
 
         print("Съёмка начата... (8 сек)")
         while time.time() - start_time < CAPTURE_DURATION:
-            ret, frame = cap.read()
+            with metrics.timer("frame_read"):
+                ret, frame = cap.read()
             if not ret:
                 print("Ошибка чтения кадра")
                 break
 
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(
-                gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
-            )
+            with metrics.timer("detection"):
+                faces = self.detector.detect(frame)
+            metrics.inc("frames_total")
+            metrics.inc("faces_detected_total", len(faces))
+
+            if tracker is not None:
+                for face_roi in tracker.update(frame, faces):
+                    self.buffer.put(face_roi)
+                    saved_count += 1
+                    print(f"Сохранено лиц: {saved_count}")
+                time.sleep(0.05)
+                continue
 
             current_time = time.time()
             for (x, y, w, h) in faces:
                 if current_time - last_save >= SAVE_INTERVAL:
                     face_roi = frame[y:y+h, x:x+w]
-                    file_path = TEMP_FACES_DIR / f"face_{saved_count}.jpg"
-                    cv2.imwrite(str(file_path), face_roi)
+                    self.buffer.put(face_roi)
                     saved_count += 1
                     last_save = current_time
-                    print(f"Сохранено: {file_path.name}")
+                    print(f"Сохранено лиц: {saved_count}")
 
             time.sleep(0.05)
 
         cap.release()
+        if tracker is not None:
+            for face_roi in tracker.flush():
+                self.buffer.put(face_roi)
+                saved_count += 1
         print(f"Съёмка завершена. Сохранено лиц: {saved_count}")
         return saved_count > 0
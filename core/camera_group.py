@@ -0,0 +1,94 @@
+# core/camera_group.py
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from config.settings import CAMERA_SOURCES
+from core.capture_worker import CaptureWorker
+from core.face_buffer import FaceBuffer
+
+
+class CameraGroup:
+    """
+    Несколько камер одновременно (большие аудитории).
+
+    У каждой камеры свой CaptureWorker — отдельный поток, детектор и
+    трекер, поэтому медленная или зависшая камера не тормозит остальные.
+    Все кропы идут в общий FaceBuffer с пометкой источника (source).
+    Интерфейс совпадает с CaptureWorker: страница работает с группой
+    так же, как с одной камерой.
+    """
+
+    def __init__(self, sources: Sequence[Union[int, str]] = CAMERA_SOURCES,
+                 face_buffer: Optional[FaceBuffer] = None, **worker_kwargs):
+        self.face_buffer = face_buffer if face_buffer is not None else FaceBuffer()
+        self.workers: List[CaptureWorker] = [
+            CaptureWorker(source, face_buffer=self.face_buffer, **worker_kwargs)
+            for source in dict.fromkeys(sources)
+        ]
+        self.capturing = False
+
+    @property
+    def sources(self) -> List[Union[int, str]]:
+        return [worker.camera_index for worker in self.workers]
+
+    @property
+    def running(self) -> bool:
+        return any(worker.running for worker in self.workers)
+
+    @property
+    def error(self) -> Optional[str]:
+        errors = [worker.error for worker in self.workers if worker.error]
+        return "; ".join(errors) if errors else None
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """Открыть все камеры параллельно. True — открылась хотя бы одна."""
+        for worker in self.workers:
+            worker.start(timeout=0)
+        deadline = time.monotonic() + timeout
+        opened = [
+            worker.wait_opened(max(0.0, deadline - time.monotonic())) for worker in self.workers
+        ]
+        return any(opened)
+
+    def stop(self, timeout: float = 2.0):
+        # сначала сигнал всем потокам, потом ожидание — камеры закрываются одновременно
+        for worker in self.workers:
+            worker.request_stop()
+        for worker in self.workers:
+            worker.stop(timeout)
+        self.capturing = False
+
+    def set_capturing(self, enabled: bool):
+        for worker in self.workers:
+            worker.set_capturing(enabled)
+        self.capturing = enabled
+
+    def latest_frames(self) -> Dict[Union[int, str], np.ndarray]:
+        """Последний размеченный кадр каждой работающей камеры."""
+        frames = {}
+        for worker in self.workers:
+            frame = worker.latest_frame()
+            if frame is not None:
+                frames[worker.camera_index] = frame
+        return frames
+
+    def take_new_faces(self) -> List[np.ndarray]:
+        faces = []
+        for worker in self.workers:
+            faces.extend(worker.take_new_faces())
+        return faces
+
+    def stats(self) -> dict:
+        cameras = [worker.stats() for worker in self.workers]
+        return {
+            "cameras": cameras,
+            "running": sum(c["running"] for c in cameras),
+            "capturing": self.capturing,
+            "frames": sum(c["frames"] for c in cameras),
+            "faces_in_frame": sum(c["faces_in_frame"] for c in cameras),
+            "saved": self.face_buffer.total,
+            "fps": round(sum(c["fps"] for c in cameras), 1),
+            "error": self.error,
+        }
@@ -0,0 +1,233 @@
+# core/capture_worker.py
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Union
+
+import cv2
+import numpy as np
+
+from config.settings import (
+    CAMERA_INDEX, CAPTURE_FPS, FRAME_RING_SIZE, LIVE_SAVE_INTERVAL, USE_FACE_TRACKER,
+)
+from core.face_buffer import FaceBuffer
+from core.face_detector import FaceDetector
+from core.face_tracker import FaceTracker
+from core.metrics import metrics
+
+
+class CaptureWorker:
+    """
+    Фоновый поток, который владеет камерой.
+
+    Непрерывно читает кадры с постоянной частотой, ищет лица, при
+    включённом захвате кладёт кропы в FaceBuffer и складывает
+    размеченные кадры в кольцевой буфер. Страница Streamlit только
+    забирает последний кадр и статистику — перезапуски скрипта и
+    клики пользователя на съёмку не влияют.
+
+    С трекером (USE_FACE_TRACKER) в буфер попадает лучший кроп каждого
+    трека, а не все лица раз в save_interval секунд.
+    """
+
+    def __init__(self, camera_index: Union[int, str] = CAMERA_INDEX, face_buffer: Optional[FaceBuffer] = None,
+                 fps: float = CAPTURE_FPS, save_interval: float = LIVE_SAVE_INTERVAL,
+                 ring_size: int = FRAME_RING_SIZE, use_tracker: bool = USE_FACE_TRACKER):
+        self.camera_index = camera_index
+        self.face_buffer = face_buffer if face_buffer is not None else FaceBuffer()
+        self.fps = fps
+        self.save_interval = save_interval
+
+        self._frames = deque(maxlen=ring_size)
+        self._new_faces: List[np.ndarray] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._opened = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.tracker = FaceTracker() if use_tracker else None
+        self._tracker_lock = threading.Lock()
+
+        self.capturing = False
+        self.error: Optional[str] = None
+        self.frame_count = 0
+        self.faces_in_frame = 0
+        self.actual_fps = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """Запустить поток и дождаться открытия камеры."""
+        if self._thread is not None and self._stop_event.is_set():
+            # прошлый поток ещё держит камеру — второй раз её не открываем
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                self.error = f"Камера {self.camera_index} ещё не освобождена прошлым потоком"
+                return False
+            self._thread = None
+        if self.running:
+            return True
+        self._stop_event.clear()
+        self._opened.clear()
+        self.error = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"capture-{self.camera_index}", daemon=True
+        )
+        self._thread.start()
+        return self.wait_opened(timeout)
+
+    def wait_opened(self, timeout: float = 5.0) -> bool:
+        """Дождаться открытия камеры; False — камера не открылась или поток упал."""
+        self._opened.wait(timeout)
+        return self.running and self.error is None
+
+    def request_stop(self):
+        """Попросить поток остановиться, не дожидаясь его."""
+        self._stop_event.set()
+
+    def stop(self, timeout: float = 2.0) -> bool:
+        """
+        Остановить поток. False — поток не завершился за timeout: ссылка на
+        него остаётся, и start() не откроет камеру, пока он её не отпустит.
+        """
+        self._stop_event.set()
+        self.capturing = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"[CaptureWorker] Камера {self.camera_index}: поток не остановился за {timeout} сек")
+                return False
+        self._thread = None
+        return True
+
+    def set_capturing(self, enabled: bool):
+        """
+        Начать/остановить захват. При остановке лучшие кропы незакрытых
+        треков попадают в буфер и остаются в take_new_faces() — их
+        забирает потоковое распознавание; при новом старте непрочитанные
+        кропы прошлого захвата отбрасываются.
+        """
+        if enabled:
+            with self._lock:
+                self._new_faces.clear()
+        if self.tracker is None:
+            self.capturing = enabled
+            return
+        # флаг меняется под той же блокировкой, что и трекер: кадр, ждущий
+        # блокировку, после flush() уже не откроет новый трек
+        with self._tracker_lock:
+            self.capturing = enabled
+            if enabled:
+                self.tracker.reset()
+            else:
+                for crop in self.tracker.flush():
+                    self._save_crop(crop)
+
+    def latest_frame(self) -> Optional[np.ndarray]:
+        """Последний размеченный кадр (BGR)."""
+        with self._lock:
+            return self._frames[-1] if self._frames else None
+
+    def take_new_faces(self) -> List[np.ndarray]:
+        """Кропы, сохранённые с прошлого вызова (для потокового распознавания)."""
+        with self._lock:
+            faces, self._new_faces = self._new_faces, []
+        return faces
+
+    def stats(self) -> dict:
+        return {
+            "camera": self.camera_index,
+            "running": self.running,
+            "capturing": self.capturing,
+            "frames": self.frame_count,
+            "faces_in_frame": self.faces_in_frame,
+            "tracks": len(self.tracker.tracks) if self.tracker is not None else None,
+            "saved": self.face_buffer.total,
+            "fps": round(self.actual_fps, 1),
+            "error": self.error,
+        }
+
+    def _save_crop(self, crop: np.ndarray) -> np.ndarray:
+        # Увеличиваем контраст
+        face_roi = cv2.convertScaleAbs(crop, alpha=1.2, beta=10)
+        self.face_buffer.put(face_roi, source=str(self.camera_index))
+        with self._lock:
+            self._new_faces.append(face_roi)
+        return face_roi
+
+    def _annotate(self, frame: np.ndarray, faces, track_ids=None):
+        # Красная рамка если захват активен, зеленая если нет
+        color = (0, 0, 255) if self.capturing else (0, 255, 0)
+        label = "CAPTURING" if self.capturing else "DETECTED"
+        track_ids = track_ids or [None] * len(faces)
+        for (x, y, w, h), track_id in zip(faces, track_ids):
+            text = f"{label} #{track_id}" if track_id is not None else label
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 3)
+            cv2.putText(frame, text, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+        info_text = f"Faces: {len(faces)} | Saved: {self.face_buffer.total}"
+        cv2.putText(frame, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+
+    def _run(self):
+        cap = cv2.VideoCapture(self.camera_index)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        if not cap.isOpened():
+            self.error = f"Не удалось открыть камеру {self.camera_index}"
+            self._opened.set()
+            return
+        self._opened.set()
+
+        detector = FaceDetector(min_size=(50, 50))
+        period = 1.0 / self.fps
+        last_save = 0.0
+        last_tick = time.perf_counter()
+
+        try:
+            while not self._stop_event.is_set():
+                tick = time.perf_counter()
+                with metrics.timer("frame_read"):
+                    ret, frame = cap.read()
+                if not ret:
+                    self.error = "Не удалось прочитать кадр с камеры"
+                    break
+
+                with metrics.timer("detection"):
+                    faces = detector.detect(frame)
+                metrics.inc("frames_total")
+                metrics.inc("faces_detected_total", len(faces))
+
+                track_ids = None
+                now = time.time()
+                if self.capturing and self.tracker is not None:
+                    # в распознавание уходит только лучший кроп трека;
+                    # флаг проверяется ещё раз под блокировкой (см. set_capturing)
+                    with self._tracker_lock:
+                        if self.capturing:
+                            for crop in self.tracker.update(frame, faces):
+                                self._save_crop(crop)
+                            track_ids = self.tracker.track_ids(faces)
+                elif self.capturing and len(faces) > 0 and now - last_save >= self.save_interval:
+                    for (x, y, w, h) in faces:
+                        self._save_crop(frame[y:y + h, x:x + w])
+                    last_save = now
+
+                self._annotate(frame, faces, track_ids)
+                with self._lock:
+                    self._frames.append(frame)
+                    self.frame_count += 1
+                    self.faces_in_frame = len(faces)
+
+                # сглаженная частота кадров
+                elapsed = tick - last_tick
+                last_tick = tick
+                if elapsed > 0:
+                    fps = 1.0 / elapsed
+                    self.actual_fps = fps if not self.actual_fps else 0.9 * self.actual_fps + 0.1 * fps
+
+                time.sleep(max(0.0, period - (time.perf_counter() - tick)))
+        except Exception as e:
+            self.error = f"Ошибка потока камеры: {e}"
+        finally:
+            cap.release()
@@ -0,0 +1,46 @@
+# core/db.py
+"""
+Подключение к SQLite (database/student.db).
+
+У каждого потока своё соединение: сессии Streamlit работают в разных
+потоках, а соединение sqlite3 нельзя делить между ними. База в режиме
+WAL — читатели не блокируют писателя, а одновременные записи из
+разных сессий ждут друг друга (busy_timeout) вместо ошибки.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from config.settings import STUDENTS_DB
+
+BUSY_TIMEOUT_MS = 5000
+
+_local = threading.local()
+
+
+def get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        STUDENTS_DB.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: транзакции открываем явно в transaction()
+        conn = sqlite3.connect(str(STUDENTS_DB), isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        _local.conn = conn
+    return conn
+
+
+@contextmanager
+def transaction():
+    """Транзакция на запись: BEGIN IMMEDIATE сразу берёт блокировку писателя."""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
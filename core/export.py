@@ -0,0 +1,196 @@
+# core/export.py
+"""
+Выгрузка журнала посещаемости в CSV или Parquet.
+
+Строки читаются из attendance_events курсором порциями по
+EXPORT_CHUNK_ROWS (fetchmany) и сразу пишутся в файл: в памяти
+держится одна порция, а не вся выборка, поэтому годовая выгрузка по
+всем группам не раздувает процесс. Parquet пишется по порции на
+row group и требует pyarrow (необязательная зависимость).
+
+ExportJob выполняет выгрузку в фоновом потоке — страница Streamlit
+показывает прогресс и не ждёт окончания.
+
+Запуск из консоли:
+    python -m core.export attendance_2025.csv --since 2025-09-01 --until 2026-06-30
+    python -m core.export attendance.parquet --group ГР-1 --group ГР-2
+"""
+
+import argparse
+import csv
+import importlib.util
+import os
+import threading
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+from config.settings import EXPORT_CHUNK_ROWS, EXPORTS_DIR
+from core.attendance import init_db
+from core.db import get_connection
+
+COLUMNS = ["id", "ts", "group", "student", "confidence", "session_id"]
+FORMATS = ("csv", "parquet")
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def iter_event_chunks(groups: Optional[Sequence[str]] = None, since: Optional[date] = None,
+                      until: Optional[date] = None,
+                      chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[List[tuple]]:
+    """События за дни [since, until] порциями кортежей в порядке COLUMNS."""
+    init_db()
+    query = ("SELECT id, ts, group_name, student, confidence, session_id "
+             "FROM attendance_events")
+    conditions, params = [], []
+    if groups:
+        conditions.append(f"group_name IN ({', '.join('?' * len(groups))})")
+        params.extend(groups)
+    if since is not None:
+        conditions.append("ts >= ?")
+        params.append(since.isoformat())
+    if until is not None:
+        conditions.append("ts < ?")
+        params.append((until + timedelta(days=1)).isoformat())
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY ts, id"
+
+    # один SELECT — один согласованный снимок журнала (WAL), пишущих он не блокирует
+    cursor = get_connection().execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                return
+            yield [tuple(row) for row in rows]
+    finally:
+        cursor.close()
+
+
+def write_csv(path: Union[str, Path], chunks: Iterator[List[tuple]],
+              progress: Optional[Callable[[int], None]] = None) -> int:
+    """CSV в UTF-8 с BOM (кириллица открывается в Excel). Возвращает число строк."""
+    written = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for rows in chunks:
+            writer.writerows(rows)
+            written += len(rows)
+            if progress is not None:
+                progress(written)
+    return written
+
+
+def write_parquet(path: Union[str, Path], chunks: Iterator[List[tuple]],
+                  progress: Optional[Callable[[int], None]] = None) -> int:
+    """Parquet, по row group на порцию. Возвращает число строк."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Для выгрузки в Parquet нужен pyarrow: pip install pyarrow")
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("ts", pa.string()),
+        ("group", pa.string()),
+        ("student", pa.string()),
+        ("confidence", pa.float64()),
+        ("session_id", pa.string()),
+    ])
+    written = 0
+    with pq.ParquetWriter(str(path), schema, compression="zstd") as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            written += len(rows)
+            if progress is not None:
+                progress(written)
+        if not written:
+            # пустой файл со схемой, а не ошибка
+            writer.write_table(schema.empty_table())
+    return written
+
+
+def export_events(path: Union[str, Path], fmt: Optional[str] = None,
+                  groups: Optional[Sequence[str]] = None, since: Optional[date] = None,
+                  until: Optional[date] = None, chunk_rows: int = EXPORT_CHUNK_ROWS,
+                  progress: Optional[Callable[[int], None]] = None) -> int:
+    """Выгрузить события в файл (формат — по fmt или расширению). Возвращает число строк."""
+    fmt = fmt or Path(path).suffix.lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки: {fmt}")
+    writer = write_parquet if fmt == "parquet" else write_csv
+    chunks = iter_event_chunks(groups, since, until, chunk_rows)
+
+    # сначала во временный файл: недописанная выгрузка не выглядит готовой
+    tmp_path = Path(f"{path}.tmp")
+    try:
+        written = writer(tmp_path, chunks, progress)
+        os.replace(tmp_path, path)
+    finally:
+        chunks.close()
+        if tmp_path.exists():
+            tmp_path.unlink()
+    print(f"[Export] {path}: строк {written}")
+    return written
+
+
+class ExportJob:
+    """Выгрузка в фоновом потоке в EXPORTS_DIR; состояние читает страница."""
+
+    def __init__(self, fmt: str, groups: Optional[Sequence[str]] = None,
+                 since: Optional[date] = None, until: Optional[date] = None):
+        self.fmt = fmt
+        self.groups = list(groups) if groups else None
+        self.since, self.until = since, until
+        period = f"{since or 'начало'}_{until or 'сейчас'}"
+        self.filename = f"attendance_{period}_{uuid.uuid4().hex[:6]}.{fmt}"
+        self.path = EXPORTS_DIR / self.filename
+        self.rows = 0
+        self.done = False
+        self.error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="attendance-export", daemon=True)
+
+    def start(self) -> "ExportJob":
+        self._thread.start()
+        return self
+
+    def _progress(self, rows: int):
+        self.rows = rows
+
+    def _run(self):
+        try:
+            EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+            self.rows = export_events(self.path, self.fmt, self.groups, self.since, self.until,
+                                      progress=self._progress)
+        except Exception as e:
+            self.error = str(e)
+            print(f"[Export] Ошибка выгрузки: {e}")
+        finally:
+            self.done = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Выгрузка журнала посещаемости")
+    parser.add_argument("output", help="файл .csv или .parquet")
+    parser.add_argument("--format", choices=FORMATS, help="по умолчанию — по расширению файла")
+    parser.add_argument("--group", action="append", help="группа (можно несколько раз; по умолчанию все)")
+    parser.add_argument("--since", type=date.fromisoformat, help="с даты YYYY-MM-DD включительно")
+    parser.add_argument("--until", type=date.fromisoformat, help="по дату YYYY-MM-DD включительно")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    export_events(args.output, args.format, args.group, args.since, args.until, args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# core/face_buffer.py
+import threading
+from collections import deque
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from config.settings import TEMP_FACES_DIR, FACE_BUFFER_SIZE, SAVE_DEBUG_FACES
+from core.metrics import metrics
+
+
+class FaceBuffer:
+    """
+    Ограниченный потокобезопасный буфер кропов лиц (BGR numpy-массивы).
+
+    Кропы передаются в распознавание напрямую из памяти; на диск в
+    TEMP_FACES_DIR они пишутся только в отладочном режиме. При
+    переполнении вытесняются самые старые кропы.
+    """
+
+    def __init__(self, maxlen: int = FACE_BUFFER_SIZE, save_debug: bool = SAVE_DEBUG_FACES):
+        self._faces = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.save_debug = save_debug
+        self.total = 0      # сколько кропов добавлено за всё время
+        self.dropped = 0    # сколько вытеснено из-за переполнения
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._faces)
+
+    def put(self, crop: np.ndarray, source: Optional[str] = None) -> int:
+        """Добавить кроп (копируется, чтобы не держать весь кадр). Возвращает его номер."""
+        with metrics.timer("crop_write"):
+            face = {"image": crop.copy(), "source": source, "index": 0}
+            with self._lock:
+                if len(self._faces) == self._faces.maxlen:
+                    self.dropped += 1
+                face["index"] = self.total
+                self._faces.append(face)
+                self.total += 1
+
+            if self.save_debug:
+                file_path = TEMP_FACES_DIR / f"face_{face['index']}.jpg"
+                cv2.imwrite(str(file_path), crop)
+        metrics.inc("crops_saved_total")
+        return face["index"]
+
+    def snapshot(self) -> List[np.ndarray]:
+        """Все кропы без извлечения из буфера."""
+        with self._lock:
+            return [face["image"] for face in self._faces]
+
+    def drain(self) -> List[np.ndarray]:
+        """Забрать все кропы и очистить буфер."""
+        with self._lock:
+            faces = [face["image"] for face in self._faces]
+            self._faces.clear()
+        return faces
+
+    def recent(self, n: int) -> List[dict]:
+        """Последние n записей: {"image", "source", "index"}."""
+        with self._lock:
+            return list(self._faces)[-n:]
+
+    def clear(self):
+        with self._lock:
+            self._faces.clear()
+            self.total = 0
+            self.dropped = 0
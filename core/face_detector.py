@@ -0,0 +1,112 @@
+# core/face_detector.py
+import cv2
+import numpy as np
+from typing import List, Tuple
+
+from config.settings import (
+    DETECT_SCALE, DETECT_SKIP_FRAMES, DETECT_ROI_MARGIN, DETECT_FULL_SCAN_EVERY,
+)
+from core.face_tracker import iou
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+
+class FaceDetector:
+    """
+    Адаптивная детекция лиц Haar-каскадом для живого видео.
+
+    - детекция идёт на уменьшенном кадре (scale);
+    - на промежуточных кадрах (skip_frames) переиспользуются прошлые рамки;
+    - между полными проходами (full_scan_every) поиск ведётся только в
+      окрестности прошлых детекций (roi_margin — запас от размера лица).
+
+    При scale=1, skip_frames=0, full_scan_every=1 поведение совпадает с
+    обычным detectMultiScale по полному кадру.
+    """
+
+    def __init__(self, scale: float = DETECT_SCALE, skip_frames: int = DETECT_SKIP_FRAMES,
+                 roi_margin: float = DETECT_ROI_MARGIN, full_scan_every: int = DETECT_FULL_SCAN_EVERY,
+                 min_size: Tuple[int, int] = (50, 50), scale_factor: float = 1.1, min_neighbors: int = 5):
+        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        self.face_cascade = cv2.CascadeClassifier(cascade_path)
+        if self.face_cascade.empty():
+            raise RuntimeError("Не удалось загрузить haarcascade_frontalface_default.xml")
+
+        self.scale = scale
+        self.skip_frames = skip_frames
+        self.roi_margin = roi_margin
+        self.full_scan_every = max(1, full_scan_every)
+        self.min_size = min_size
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+        self.frame_index = 0
+        self.last_boxes: List[Box] = []
+        self.detections_run = 0   # сколько раз реально запускался каскад
+
+    def reset(self):
+        self.frame_index = 0
+        self.last_boxes = []
+
+    def _cascade(self, gray: np.ndarray) -> List[Box]:
+        min_size = (
+            max(1, int(self.min_size[0] * self.scale)),
+            max(1, int(self.min_size[1] * self.scale)),
+        )
+        faces = self.face_cascade.detectMultiScale(
+            gray, scaleFactor=self.scale_factor, minNeighbors=self.min_neighbors, minSize=min_size
+        )
+        return [tuple(int(v) for v in f) for f in faces]
+
+    def _search_rois(self, small: np.ndarray) -> List[Box]:
+        """Поиск только вокруг прошлых рамок (в координатах уменьшенного кадра)."""
+        h_img, w_img = small.shape[:2]
+        found = []
+        for (x, y, w, h) in self.last_boxes:
+            x, y, w, h = (int(v * self.scale) for v in (x, y, w, h))
+            mx, my = int(w * self.roi_margin), int(h * self.roi_margin)
+            x0, y0 = max(0, x - mx), max(0, y - my)
+            x1, y1 = min(w_img, x + w + mx), min(h_img, y + h + my)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            for (fx, fy, fw, fh) in self._cascade(small[y0:y1, x0:x1]):
+                found.append((fx + x0, fy + y0, fw, fh))
+        return _dedupe(found)
+
+    def detect(self, frame: np.ndarray) -> List[Box]:
+        """Рамки лиц (x, y, w, h) в координатах исходного кадра."""
+        index = self.frame_index
+        self.frame_index += 1
+
+        if self.skip_frames and index % (self.skip_frames + 1):
+            return self.last_boxes
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if self.scale != 1.0:
+            small = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        else:
+            small = gray
+
+        self.detections_run += 1
+        boxes = []
+        full_scan = not self.last_boxes or (index // (self.skip_frames + 1)) % self.full_scan_every == 0
+        if not full_scan:
+            boxes = self._search_rois(small)
+        if full_scan or not boxes:
+            boxes = self._cascade(small)
+
+        inv = 1.0 / self.scale
+        self.last_boxes = [
+            (int(x * inv), int(y * inv), int(w * inv), int(h * inv)) for (x, y, w, h) in boxes
+        ]
+        return self.last_boxes
+
+
+def _dedupe(boxes: List[Box], iou_threshold: float = 0.5) -> List[Box]:
+    """Убрать дубли рамок из пересекающихся ROI."""
+    result: List[Box] = []
+    for box in sorted(boxes, key=lambda b: b[2] * b[3], reverse=True):
+        if all(iou(box, kept) < iou_threshold for kept in result):
+            result.append(box)
+    return result
+
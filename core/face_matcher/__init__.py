@@ -1,5 +1,39 @@
 # core/face_matcher/__init__.py
-from .core import match
-from .settings import DEEFACE_VERIFY_FACENET512
+"""
+Подмодули загружаются при первом обращении к имени (PEP 562):
+import core.face_matcher не тянет numpy-ядро, а DeepFace/TensorFlow
+подгружаются только при первой загрузке модели (model.get_model).
+"""
 
-__all__ = ["match", "DEEFACE_VERIFY_FACENET512"]
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    "IVFIndex": ".ann",
+    "match": ".core",
+    "try_match": ".core",
+    "match_all": ".core",
+    "distance_matrix": ".distance",
+    "EmbeddingStore": ".embeddings",
+    "get_store": ".embeddings",
+    "embed_crops": ".model",
+    "StreamingMatcher": ".stream",
+    "DEEFACE_VERIFY_FACENET512": ".settings",
+}
+
+__all__ = [
+    "match", "try_match", "match_all", "StreamingMatcher", "IVFIndex", "distance_matrix",
+    "EmbeddingStore", "get_store", "embed_crops",
+    "DEEFACE_VERIFY_FACENET512",
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,130 @@
+# face_matcher/ann.py
+"""
+Приближённый поиск ближайших соседей (IVF) по эмбеддингам.
+
+Векторы разбиваются k-means на n_lists кластеров; при поиске
+сравнение идёт только с векторами из n_probe ближайших кластеров,
+а не со всей базой. Для cosine/euclidean_l2 кластеризация ведётся по
+нормированным векторам.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import DISTANCE_METRIC
+from .distance import distance_matrix, l2_normalize
+
+TRAIN_POINTS_PER_LIST = 64
+
+
+def kmeans(x: np.ndarray, k: int, n_iter: int = 20, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Простой k-means (евклидов). Возвращает центроиды и номера кластеров."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(x))
+    centroids = x[rng.choice(len(x), size=k, replace=False)].copy()
+    labels = np.zeros(len(x), dtype=np.int64)
+
+    for _ in range(n_iter):
+        labels = distance_matrix(x, centroids, "euclidean").argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        order = np.argsort(labels, kind="stable")
+        present = np.nonzero(counts)[0]
+        sums[present] = np.add.reduceat(x[order], np.concatenate([[0], np.cumsum(counts)[:-1]])[present])
+
+        new_centroids = centroids.copy()
+        new_centroids[present] = sums[present] / counts[present, None]
+        # пустые кластеры переносим в случайные точки
+        empty = np.nonzero(counts == 0)[0]
+        if len(empty):
+            new_centroids[empty] = x[rng.integers(len(x), size=len(empty))]
+        if np.allclose(new_centroids, centroids, atol=1e-6):
+            break
+        centroids = new_centroids
+
+    return centroids, labels
+
+
+class IVFIndex:
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 8, metric: str = DISTANCE_METRIC):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.metric = metric
+        self.ids: List = []
+        self.centroids = np.empty((0, 0), dtype=np.float32)
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._lists: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _space(self, x: np.ndarray) -> np.ndarray:
+        """Пространство, в котором строятся кластеры."""
+        x = np.asarray(x, dtype=np.float32)
+        return l2_normalize(x) if self.metric in ("cosine", "euclidean_l2") else x
+
+    def build(self, vectors: np.ndarray, ids: Sequence) -> "IVFIndex":
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if len(vectors) != len(ids):
+            raise ValueError("Число векторов и идентификаторов не совпадает")
+
+        self.ids = list(ids)
+        self._vectors = vectors
+        if not len(vectors):
+            self._lists = []
+            return self
+
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(vectors))))
+        space = self._space(vectors)
+        # центроиды учим на подвыборке, затем раскладываем все векторы
+        sample_size = min(len(space), n_lists * TRAIN_POINTS_PER_LIST)
+        sample = np.random.default_rng(0).choice(len(space), size=sample_size, replace=False)
+        self.centroids, _ = kmeans(space[sample], n_lists)
+        labels = distance_matrix(space, self.centroids, "euclidean").argmin(axis=1)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(self.centroids))]
+        return self
+
+    def search(self, queries: np.ndarray, k: int = 5) -> List[List[Tuple[object, float]]]:
+        """Для каждого запроса — до k пар (id, расстояние) по возрастанию расстояния."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not len(self.ids):
+            return [[] for _ in queries]
+
+        n_probe = min(self.n_probe, len(self.centroids))
+        coarse = distance_matrix(self._space(queries), self.centroids, "euclidean")
+        probes = np.argpartition(coarse, n_probe - 1, axis=1)[:, :n_probe]
+
+        # обходим кластеры, а не запросы: все запросы, заглянувшие в
+        # кластер, сравниваются с его векторами одной матричной операцией
+        best_d = np.full((len(queries), k), np.inf, dtype=np.float32)
+        best_i = np.full((len(queries), k), -1, dtype=np.int64)
+        for c in np.unique(probes):
+            members = self._lists[c]
+            if not len(members):
+                continue
+            q_idx = np.nonzero((probes == c).any(axis=1))[0]
+            d = distance_matrix(queries[q_idx], self._vectors[members], self.metric)
+            cand_d = np.concatenate([best_d[q_idx], d], axis=1)
+            cand_i = np.concatenate([best_i[q_idx], np.broadcast_to(members, d.shape)], axis=1)
+            top = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+            best_d[q_idx] = np.take_along_axis(cand_d, top, axis=1)
+            best_i[q_idx] = np.take_along_axis(cand_i, top, axis=1)
+
+        order = np.argsort(best_d, axis=1)
+        best_d = np.take_along_axis(best_d, order, axis=1)
+        best_i = np.take_along_axis(best_i, order, axis=1)
+        return [
+            [(self.ids[i], float(dist)) for i, dist in zip(row_i, row_d) if i >= 0]
+            for row_i, row_d in zip(best_i, best_d)
+        ]
+
+
+def brute_force_search(vectors: np.ndarray, ids: Sequence, queries: np.ndarray,
+                       k: int = 5, metric: str = DISTANCE_METRIC) -> List[List[Tuple[object, float]]]:
+    """Точный поиск полным перебором — эталон для проверки IVFIndex."""
+    dists = distance_matrix(queries, vectors, metric)
+    top = np.argsort(dists, axis=1)[:, :k]
+    return [[(ids[j], float(row[j])) for j in cols] for row, cols in zip(dists, top)]
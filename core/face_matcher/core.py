@@ -1,58 +1,216 @@
 # face_matcher/core.py
-from deepface import DeepFace
-from config.settings import TEMP_FACES_DIR, FACE_THRESHOLD, SUPPORTED_EXT
-from settings import DEEFACE_VERIFY_FACENET512
+import os
+import numpy as np
+from config.settings import (
+    TEMP_FACES_DIR, FACE_THRESHOLD, FACE_MODEL, DISTANCE_METRIC, SUPPORTED_EXT,
+    SKIP_CROP_DETECTION, GROUPS, ANN_N_PROBE, PROTOTYPES_PER_STUDENT,
+)
+from .ann import IVFIndex
+from .distance import distance_matrix
+from .embeddings import get_store
+from .model import load_crop
+from .parallel import embed_crops_parallel, represent_many
+from .prototypes import aggregate
+from core.metrics import metrics
 from core.photo_manager import PhotoManager
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 """
 Ядро распознавания.
 """
 
-def match(group: str) -> List[Dict[str, str]]:
+
+def verify_threshold() -> float:
+    """Порог как у DeepFace.verify, но не выше FACE_THRESHOLD."""
+    try:
+        from deepface.modules.verification import find_threshold
+        return min(FACE_THRESHOLD, find_threshold(FACE_MODEL, DISTANCE_METRIC))
+    except (ImportError, ValueError):
+        return FACE_THRESHOLD
+
+
+def confidence(distance: float) -> float:
+    """Уверенность в процентах по расстоянию: (1 - d) * 100, в пределах [0, 100]."""
+    return round(min(100.0, max(0.0, (1 - float(distance)) * 100)), 1)
+
+
+def _load_temp_faces() -> List[np.ndarray]:
+    """Кропы из TEMP_FACES_DIR — для вызовов без буфера в памяти."""
+    files = [
+        f for f in TEMP_FACES_DIR.iterdir()
+        if f.is_file() and f.suffix.lower() in SUPPORTED_EXT
+    ]
+    return [c for c in (load_crop(f) for f in files) if c is not None]
+
+
+def embed_faces(faces: List[np.ndarray]) -> list:
+    with metrics.timer("embedding"):
+        if SKIP_CROP_DETECTION:
+            # кропы уже вырезаны каскадом: один батч без повторной детекции
+            # (большие пачки — в пуле процессов, если EMBED_WORKERS > 1)
+            vectors = list(embed_crops_parallel(faces))
+        else:
+            vectors = [v for v in represent_many(faces) if v is not None]
+    metrics.inc("embeddings_total", len(vectors))
+    return vectors
+
+
+def _photo_owners(students: List[Dict], key) -> Tuple[List, List[str]]:
+    """Все фото студентов и владелец каждого фото (key(student))."""
+    owners, paths = [], []
+    for student in students:
+        for path in student.get("paths") or [student["path"]]:
+            owners.append(key(student))
+            paths.append(path)
+    return owners, paths
+
+
+def load_student_vectors(students: List[Dict]) -> Tuple[List[str], np.ndarray]:
+    """
+    Имена и матрица прототипов студентов (эмбеддинги всех фото из кэша,
+    считаются только новые). Имя повторяется, если прототипов несколько.
+    """
+    store = get_store()
+    owners, paths = _photo_owners(students, key=lambda student: student["name"])
+    with metrics.timer("reference_embedding"):
+        vectors = store.get_many(paths)
+    store.save()
+    return aggregate(owners, vectors)
+
+
+def assign(names: List[str], student_matrix: np.ndarray, face_vectors) -> List[Dict]:
+    """Лучший кадр для каждого студента: матрица расстояний студенты × кадры за один проход."""
+    with metrics.timer("distance"):
+        distances = distance_matrix(student_matrix, np.stack(face_vectors))
+    threshold = verify_threshold()
+    distances[distances > threshold] = np.inf
+    # у студента может быть несколько прототипов — берём ближайший
+    rows = {}
+    owner = np.array([rows.setdefault(name, len(rows)) for name in names], dtype=np.int64)
+    best = np.full(len(rows), np.inf, dtype=distances.dtype)
+    np.minimum.at(best, owner, distances.min(axis=1))
+
+    results = []
+    for name, best_dist in zip(rows, best):
+        if not best_dist < FACE_THRESHOLD:
+            continue
+
+        conf = confidence(best_dist)
+        results.append({"name": name, "confidence": conf})
+        print(f"Найден: {name} ({conf}%)")
+
+    return results
+
+
+def try_match(group: str, faces: Optional[List[np.ndarray]] = None) -> Optional[List[Dict]]:
+    """
+    Как match(), но None, если сопоставлять было нечего: нет студентов,
+    кадров или эмбеддингов. Такой запуск не перекличка — его не пишут в журнал.
+    """
     print(f"\n[FaceMatcher] Распознавание: {group}")
+    metrics.inc("match_runs_total")
 
     students = PhotoManager.get_students(group)
     if not students:
         print("Нет студентов")
-        return []
+        return None
 
-    temp_faces = [
-        f for f in TEMP_FACES_DIR.iterdir()
-        if f.is_file() and f.suffix.lower() in PhotoManager.SUPPORTED_EXT
+    if faces is None:
+        faces = _load_temp_faces()
+    if not faces:
+        print("Нет фото с камеры")
+        return None
+
+    print(f"Студентов: {len(students)} | Кадров: {len(faces)}")
+
+    names, student_matrix = load_student_vectors(students)
+    if not names:
+        print("Не удалось получить эмбеддинги студентов")
+        return None
+
+    face_vectors = embed_faces(faces)
+    if not face_vectors:
+        print("Не удалось получить эмбеддинги кадров")
+        return None
+
+    return assign(names, student_matrix, face_vectors)
+
+
+def match(group: str, faces: Optional[List[np.ndarray]] = None) -> List[Dict[str, str]]:
+    return try_match(group, faces) or []
+
+
+_campus_index = None
+_campus_index_key = None
+
+
+def build_campus_index(groups: List[str] = GROUPS) -> IVFIndex:
+    """
+    ANN-индекс по прототипам студентов всех групп. Перестраивается
+    только при изменении набора фото.
+    """
+    global _campus_index, _campus_index_key
+
+    store = get_store()
+    students = [
+        dict(student, group=group) for group in groups for student in PhotoManager.get_students(group)
     ]
-    if not temp_faces:
+    owners, paths = _photo_owners(
+        students, key=lambda student: (student["name"], student["group"], student["path"])
+    )
+    vectors = store.get_many(paths)
+    store.save()
+
+    key = tuple(sorted(
+        (path, os.path.getmtime(path)) for path, vector in zip(paths, vectors) if vector is not None
+    ))
+    if _campus_index is None or key != _campus_index_key:
+        ids, prototypes = aggregate(owners, vectors)
+        _campus_index = IVFIndex(n_probe=ANN_N_PROBE).build(prototypes, ids)
+        _campus_index_key = key
+        print(f"[FaceMatcher] ANN-индекс построен: {len(key)} фото, {len(ids)} прототипов")
+    return _campus_index
+
+
+def match_all(faces: Optional[List[np.ndarray]] = None, top_k: int = 5,
+              groups: List[str] = GROUPS) -> List[List[Dict]]:
+    """
+    Опознание кропов по всем группам (по умолчанию — из TEMP_FACES_DIR).
+    Для каждого кропа — top_k кандидатов (имя, группа, расстояние).
+    """
+    print(f"\n[FaceMatcher] Поиск по всем группам: {', '.join(groups)}")
+
+    if faces is None:
+        faces = _load_temp_faces()
+    if not faces:
         print("Нет фото с камеры")
         return []
 
-    print(f"Студентов: {len(students)} | Кадров: {len(temp_faces)}")
-
-    results = []
-    seen = set()
+    index = build_campus_index(groups)
+    if not len(index):
+        print("Нет студентов")
+        return []
 
-    for student in students:
-        name = student["name"]
-        if name in seen:
-            continue
+    face_vectors = embed_faces(faces)
+    if not face_vectors:
+        print("Не удалось получить эмбеддинги кадров")
+        return []
 
-        best_dist = float('inf')
-        for face_path in temp_faces:
-            try:
-                result = DeepFace.verify(
-                    img1_path=student["path"],
-                    img2_path=str(face_path),
-                    **DEEFACE_VERIFY_FACENET512
-                )
-                dist = result.get("distance", float('inf'))
-                if result.get("verified", False) and dist < best_dist:
-                    best_dist = dist
-            except Exception as e:
-                print(f"DeepFace error: {e}")
-
-        if best_dist < FACE_THRESHOLD:
-            conf = round((1 - best_dist) * 100, 1)
-            results.append({"name": name, "confidence": conf})
-            seen.add(name)
-            print(f"Найден: {name} ({conf}%)")
-
-    return results
\ No newline at end of file
+    results = []
+    with metrics.timer("distance"):
+        # с запасом: несколько прототипов одного студента занимают несколько мест
+        found = index.search(np.stack(face_vectors), k=top_k * PROTOTYPES_PER_STUDENT)
+    for candidates in found:
+        best = {}
+        for entry_id, dist in candidates:
+            best.setdefault(entry_id, dist)
+        results.append([
+            {
+                "name": name,
+                "group": group,
+                "distance": round(dist, 4),
+                "confidence": confidence(dist),
+            }
+            for (name, group, _), dist in list(best.items())[:top_k]
+        ])
+    return results
@@ -0,0 +1,34 @@
+# face_matcher/distance.py
+"""
+Матричные расстояния между наборами эмбеддингов.
+"""
+
+import numpy as np
+from config.settings import DISTANCE_METRIC
+
+
+def l2_normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.maximum(norms, 1e-10)
+
+
+def distance_matrix(a: np.ndarray, b: np.ndarray, metric: str = DISTANCE_METRIC) -> np.ndarray:
+    """Матрица расстояний (len(a), len(b)) между строками a и b."""
+    a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+    b = np.atleast_2d(np.asarray(b, dtype=np.float32))
+
+    if metric == "cosine":
+        return 1.0 - l2_normalize(a) @ l2_normalize(b).T
+
+    if metric == "euclidean_l2":
+        a, b = l2_normalize(a), l2_normalize(b)
+    elif metric != "euclidean":
+        raise ValueError(f"Неизвестная метрика: {metric}")
+
+    # |a-b|^2 = |a|^2 - 2ab + |b|^2, без промежуточного тензора (n, m, d)
+    sq = (
+        np.sum(a * a, axis=1)[:, None]
+        - 2.0 * (a @ b.T)
+        + np.sum(b * b, axis=1)[None, :]
+    )
+    return np.sqrt(np.maximum(sq, 0.0))
@@ -0,0 +1,288 @@
+# face_matcher/embeddings.py
+"""
+Кэш эмбеддингов эталонных фото студентов.
+
+Эмбеддинг каждого фото из data/photos/<группа>/ считается один раз и
+хранится на диске одной непрерывной матрицей data/embeddings/<модель>.npy
+(строка на фото) и индексом <модель>.json (пути, порядок строк,
+mtime/размер/SHA-1). Запись считается актуальной, пока у файла не
+изменились mtime/размер, а при их изменении дополнительно сверяется
+SHA-1 содержимого.
+
+Матрица не читается в память, а отображается (np.load, mmap_mode="r"):
+все процессы Streamlit и пула делят одни и те же страницы файла в
+кэше ОС. Хранится она в EMBEDDING_DTYPE:
+  - float32 — без потерь, 2 КБ на фото (Facenet512);
+  - float16 — 1 КБ, ошибка cosine-расстояния в среднем 7e-6, не более 5e-5;
+  - int8 (масштаб на строку в <модель>.scales.npy) — 0.5 КБ,
+    ошибка в среднем 3e-4, не более 2e-3.
+Решение относительно FACE_THRESHOLD (0.68) меняется только для пар,
+чьё расстояние и так лежит в пределах этой ошибки от порога (на
+синтетических 2000 эталонах × 500 кадрах — ни одного). Замер на своём
+кэше: python -m benchmarks.quantization_benchmark.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config.settings import EMBEDDINGS_DIR, FACE_MODEL, EMBEDDING_DTYPE
+from .settings import DEEFACE_REPRESENT_FACENET512
+
+
+def represent(img: Union[str, np.ndarray]) -> Optional[np.ndarray]:
+    """Эмбеддинг первого найденного лица (путь к файлу или BGR-массив)."""
+    from deepface import DeepFace
+
+    try:
+        objs = DeepFace.represent(img_path=img, **DEEFACE_REPRESENT_FACENET512)
+    except Exception as e:
+        print(f"DeepFace error: {e}")
+        return None
+    if not objs:
+        return None
+    return np.asarray(objs[0]["embedding"], dtype=np.float32)
+
+
+def file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+QUANTIZED_DTYPES = ("float32", "float16", "int8")
+
+
+def quantize(matrix: np.ndarray, dtype: str = EMBEDDING_DTYPE) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """float32-матрица -> (матрица в dtype, масштабы строк для int8 или None)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if dtype not in QUANTIZED_DTYPES:
+        raise ValueError(f"Неизвестный тип хранения эмбеддингов: {dtype}")
+    if dtype != "int8":
+        return matrix.astype(dtype), None
+    # симметричная квантизация: своя шкала у каждой строки
+    scales = np.abs(matrix).max(axis=1) / 127.0 if len(matrix) else np.empty(0, dtype=np.float32)
+    scales = np.maximum(scales, 1e-12).astype(np.float32)
+    return np.round(matrix / scales[:, None]).astype(np.int8), scales
+
+
+def dequantize(rows: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Строки матрицы из кэша -> float32 (копия, а не вид на отображённый файл)."""
+    rows = np.array(rows, dtype=np.float32)
+    if scales is not None:
+        rows *= np.asarray(scales, dtype=np.float32)[..., None]
+    return rows
+
+
+class EmbeddingStore:
+    def __init__(self, model_name: str = FACE_MODEL, directory: Path = EMBEDDINGS_DIR,
+                 dtype: str = EMBEDDING_DTYPE):
+        if dtype not in QUANTIZED_DTYPES:
+            raise ValueError(f"Неизвестный тип хранения эмбеддингов: {dtype}")
+        self.model_name = model_name
+        self.dtype = dtype
+        self.index_path = Path(directory) / f"{model_name}.json"
+        self.vectors_path = Path(directory) / f"{model_name}.npy"
+        self.scales_path = Path(directory) / f"{model_name}.scales.npy"
+        # путь -> {"mtime", "size", "sha1"}
+        self._index: Dict[str, dict] = {}
+        # путь -> строка отображённой матрицы
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        # посчитанные после загрузки (ещё не сохранённые) векторы
+        self._fresh: Dict[str, np.ndarray] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        """Объём матрицы на диске (отображается, а не копируется в память)."""
+        mapped = sum(a.nbytes for a in (self._matrix, self._scales) if a is not None)
+        return mapped + sum(v.nbytes for v in self._fresh.values())
+
+    def _load(self):
+        if not (self.index_path.exists() and self.vectors_path.exists()):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            paths = meta.get("paths", [])
+            if not paths:
+                return
+            matrix = np.load(self.vectors_path, mmap_mode="r")
+            stored_dtype = meta.get("dtype", "float32")
+            scales = np.load(self.scales_path, mmap_mode="r") if stored_dtype == "int8" else None
+        except (OSError, ValueError) as e:
+            print(f"[EmbeddingStore] Кэш повреждён, будет пересоздан: {e}")
+            return
+
+        if (meta.get("model") != self.model_name or len(paths) != len(matrix)
+                or matrix.dtype != np.dtype(stored_dtype)
+                or (scales is not None and len(scales) != len(matrix))):
+            print("[EmbeddingStore] Кэш от другой модели, будет пересоздан")
+            return
+
+        self._matrix, self._scales = matrix, scales
+        for row, key in enumerate(paths):
+            self._index[key] = meta["entries"][key]
+            self._rows[key] = row
+        if stored_dtype != self.dtype:
+            # перезапишется в новом формате при следующем save()
+            self._dirty = True
+        print(f"[EmbeddingStore] Загружено эмбеддингов: {len(paths)} ({stored_dtype}, mmap)")
+
+    def _vector(self, key: str) -> np.ndarray:
+        vector = self._fresh.get(key)
+        if vector is not None:
+            return vector
+        row = self._rows[key]
+        return dequantize(self._matrix[row], None if self._scales is None else self._scales[row])
+
+    @staticmethod
+    def _key(photo_path: Union[str, Path]) -> str:
+        return str(Path(photo_path).resolve())
+
+    def _cached(self, path: Path) -> Tuple[Optional[np.ndarray], Optional[dict]]:
+        """
+        (вектор из кэша, None) — если запись актуальна;
+        (None, метаданные файла) — если эмбеддинг нужно посчитать;
+        (None, None) — если файл недоступен.
+        """
+        key = self._key(path)
+        try:
+            stat = path.stat()
+        except OSError as e:
+            print(f"[EmbeddingStore] Фото недоступно: {e}")
+            return None, None
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                return self._vector(key), None
+
+            digest = file_sha1(path)
+            if entry and entry["sha1"] == digest:
+                # файл "тронули", но содержимое прежнее
+                entry.update(mtime=stat.st_mtime, size=stat.st_size)
+                self._dirty = True
+                return self._vector(key), None
+
+        return None, {"mtime": stat.st_mtime, "size": stat.st_size, "sha1": digest}
+
+    def _put(self, path: Path, meta: dict, vector: np.ndarray):
+        key = self._key(path)
+        with self._lock:
+            self._index[key] = meta
+            self._fresh[key] = np.asarray(vector, dtype=np.float32)
+            self._dirty = True
+
+    def get(self, photo_path: Union[str, Path]) -> Optional[np.ndarray]:
+        """Эмбеддинг эталонного фото; считается только при отсутствии в кэше."""
+        return self.get_many([photo_path])[0]
+
+    def get_many(self, photo_paths: List[Union[str, Path]]) -> List[Optional[np.ndarray]]:
+        """
+        Эмбеддинги набора фото в том же порядке. Недостающие считаются
+        одним заходом (при EMBED_WORKERS > 1 — в пуле процессов).
+        """
+        from .parallel import represent_many
+
+        paths = [Path(p) for p in photo_paths]
+        vectors: List[Optional[np.ndarray]] = [None] * len(paths)
+        missing = []
+        for i, path in enumerate(paths):
+            vectors[i], meta = self._cached(path)
+            if meta is not None:
+                missing.append((i, meta))
+
+        if missing:
+            computed = represent_many([str(paths[i]) for i, _ in missing])
+            for (i, meta), vector in zip(missing, computed):
+                if vector is not None:
+                    self._put(paths[i], meta, vector)
+                    vectors[i] = vector
+        return vectors
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Пути всех фото в кэше и float32-матрица их эмбеддингов."""
+        with self._lock:
+            paths = sorted(self._index)
+            if not paths:
+                return [], np.empty((0, 0), dtype=np.float32)
+            return paths, np.stack([self._vector(key) for key in paths])
+
+    def forget(self, photo_path: Union[str, Path]):
+        key = self._key(photo_path)
+        with self._lock:
+            if self._index.pop(key, None) is not None:
+                self._rows.pop(key, None)
+                self._fresh.pop(key, None)
+                self._dirty = True
+
+    def save(self):
+        """Сохранить кэш на диск (атомарно, только если были изменения)."""
+        with self._lock:
+            # записи удалённых фото не переносим
+            for key in [k for k in self._index if not os.path.exists(k)]:
+                self.forget(key)
+            if not self._dirty:
+                return
+
+            paths, matrix = self.matrix()
+            data, scales = quantize(matrix, self.dtype)
+            meta = {
+                "model": self.model_name,
+                "dtype": self.dtype,
+                "shape": list(data.shape),
+                "paths": paths,
+                "entries": {key: self._index[key] for key in paths},
+            }
+
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_vectors = self.vectors_path.with_suffix(".tmp.npy")
+            tmp_scales = self.scales_path.with_suffix(".tmp.npy")
+            tmp_index = self.index_path.with_suffix(".tmp.json")
+            np.save(tmp_vectors, data)
+            if scales is not None:
+                np.save(tmp_scales, scales)
+            with open(tmp_index, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            # своё отображение закрываем до замены файла (Windows не даёт
+            # заменить открытый файл); другие процессы дочитывают старую копию
+            self._matrix = self._scales = None
+            if scales is not None:
+                os.replace(tmp_scales, self.scales_path)
+            os.replace(tmp_vectors, self.vectors_path)
+            os.replace(tmp_index, self.index_path)
+            self._dirty = False
+
+            # новые векторы переезжают из памяти процесса в общий файл
+            self._index, self._rows, self._fresh = {}, {}, {}
+            self._load()
+            print(f"[EmbeddingStore] Сохранено эмбеддингов: {len(paths)} ({self.dtype})")
+
+
+_store: Optional[EmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> EmbeddingStore:
+    """Общий для процесса экземпляр кэша."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EmbeddingStore()
+        return _store
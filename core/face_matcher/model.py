@@ -0,0 +1,125 @@
+# face_matcher/model.py
+"""
+Пакетный прогон кропов лиц через модель распознавания.
+
+Кропы с камеры уже вырезаны Haar-каскадом, поэтому повторная детекция
+DeepFace для них не нужна: кропы приводятся к входу модели и
+прогоняются через неё одним батчем.
+
+Известное расхождение: эталонные фото идут через DeepFace.represent с
+detector_backend="opencv" и align=True, а кропы — без детекции и
+выравнивания (предобработка как у detector_backend="skip"). Повёрнутое
+лицо в кропе даёт вектор дальше от эталона, чем то же лицо после
+выравнивания. Насколько это сдвигает расстояния относительно
+FACE_THRESHOLD, показывает benchmarks/embedding_consistency_benchmark.py.
+
+Модель загружается один раз на процесс и общая для всех сессий
+Streamlit; warm_up() позволяет загрузить и прогреть её заранее.
+DeepFace импортируется там же, при первой загрузке модели.
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from config.settings import FACE_MODEL, EMBED_BATCH_SIZE
+from core.metrics import metrics
+
+
+_model = None
+_model_lock = threading.Lock()
+_stats = {
+    "model": FACE_MODEL,
+    "status": "не загружена",
+    "load_time": None,      # сек, загрузка весов
+    "warmup_time": None,    # сек, первый прогон пустого батча
+    "error": None,
+}
+
+
+def get_model():
+    """Клиент модели DeepFace — один на процесс."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _stats["status"] = "загружается"
+                start = time.perf_counter()
+                try:
+                    # DeepFace тянет TensorFlow — импортируем только когда модель нужна
+                    with metrics.timer("import_deepface"):
+                        from deepface import DeepFace
+                    _model = DeepFace.build_model(FACE_MODEL)
+                except Exception as e:
+                    _stats["status"] = "ошибка"
+                    _stats["error"] = str(e)
+                    raise
+                _stats["load_time"] = round(time.perf_counter() - start, 3)
+                _stats["status"] = "загружена"
+                print(f"[Model] {FACE_MODEL} загружена за {_stats['load_time']} сек")
+    return _model
+
+
+def warm_up():
+    """Загрузить модель и прогнать пустой батч (первый вызов графа TF самый медленный)."""
+    try:
+        model = get_model()
+    except Exception as e:
+        print(f"[Model] Ошибка загрузки модели: {e}")
+        return
+    if _stats["warmup_time"] is not None:
+        return
+
+    start = time.perf_counter()
+    dummy = np.zeros((1, *model.input_shape, 3), dtype=np.float32)
+    model.model.predict(dummy, verbose=0)
+    _stats["warmup_time"] = round(time.perf_counter() - start, 3)
+    _stats["status"] = "прогрета"
+    print(f"[Model] Прогрев выполнен за {_stats['warmup_time']} сек")
+
+
+def model_stats() -> dict:
+    return dict(_stats)
+
+
+def preprocess_crop(crop: np.ndarray, target_size: tuple) -> np.ndarray:
+    """
+    BGR-кроп -> вход модели: ресайз с сохранением пропорций, паддинг
+    нулями до target_size и масштаб в [0, 1] — как в DeepFace.represent.
+    """
+    target_h, target_w = target_size
+    h, w = crop.shape[:2]
+    factor = min(target_h / h, target_w / w)
+    resized = cv2.resize(crop, (max(1, int(w * factor)), max(1, int(h * factor))))
+
+    diff_h = target_h - resized.shape[0]
+    diff_w = target_w - resized.shape[1]
+    padded = np.pad(
+        resized,
+        ((diff_h // 2, diff_h - diff_h // 2), (diff_w // 2, diff_w - diff_w // 2), (0, 0)),
+        "constant",
+    )
+    return padded.astype(np.float32) / 255.0
+
+
+def load_crop(path) -> Optional[np.ndarray]:
+    crop = cv2.imread(str(path))
+    if crop is None:
+        print(f"Не удалось прочитать кроп: {path}")
+    return crop
+
+
+def embed_crops(crops: List[np.ndarray], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    """Эмбеддинги кропов (n, d) за один пакетный прогон модели."""
+    crops = [c for c in crops if c is not None and c.size > 0]
+    if not crops:
+        return np.empty((0, 0), dtype=np.float32)
+
+    model = get_model()
+    target_size = tuple(model.input_shape)
+    batch = np.stack([preprocess_crop(c, target_size) for c in crops])
+    embeddings = model.model.predict(batch, batch_size=batch_size, verbose=0)
+    return np.asarray(embeddings, dtype=np.float32)
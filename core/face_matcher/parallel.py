@@ -0,0 +1,99 @@
+# face_matcher/parallel.py
+"""
+Параллельный расчёт эмбеддингов в пуле процессов.
+
+При EMBED_WORKERS > 1 большие пачки кропов и эталонных фото делятся на
+непрерывные куски и считаются в N процессах, у каждого своя загруженная
+модель. Куски возвращаются через executor.map в исходном порядке, так что
+результат совпадает с последовательным расчётом. Мелкие пачки
+(меньше PARALLEL_MIN_BATCH) считаются в текущем процессе — пересылка
+данных между процессами стоит дороже.
+"""
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from config.settings import EMBED_WORKERS, PARALLEL_MIN_BATCH
+from .embeddings import represent
+from .model import embed_crops, warm_up
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker():
+    # у каждого процесса своя копия модели
+    warm_up()
+
+
+def _embed_chunk(crops: List[np.ndarray]) -> np.ndarray:
+    return embed_crops(crops)
+
+
+def _represent_chunk(images: list) -> List[Optional[np.ndarray]]:
+    return [represent(img) for img in images]
+
+
+def get_executor(workers: int = EMBED_WORKERS) -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: TensorFlow не переживает fork процесса с уже загруженной моделью
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            print(f"[Parallel] Пул эмбеддингов: {workers} процессов")
+        return _executor
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+atexit.register(shutdown)
+
+
+def _chunks(items: Sequence, n: int) -> List[list]:
+    """n непрерывных кусков примерно равного размера."""
+    bounds = np.linspace(0, len(items), n + 1).astype(int)
+    return [list(items[a:b]) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _use_pool(count: int, workers: int) -> bool:
+    return workers > 1 and count >= PARALLEL_MIN_BATCH
+
+
+def embed_crops_parallel(crops: List[np.ndarray], workers: int = EMBED_WORKERS) -> np.ndarray:
+    """То же, что embed_crops, но с шардированием по процессам."""
+    crops = [c for c in crops if c is not None and c.size > 0]
+    if not _use_pool(len(crops), workers):
+        return embed_crops(crops)
+
+    parts = list(get_executor(workers).map(_embed_chunk, _chunks(crops, workers)))
+    parts = [p for p in parts if p.size]
+    if not parts:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.concatenate(parts)
+
+
+def represent_many(images: List[Union[str, np.ndarray]],
+                   workers: int = EMBED_WORKERS) -> List[Optional[np.ndarray]]:
+    """DeepFace.represent для набора фото/кропов; порядок сохраняется."""
+    if not _use_pool(len(images), workers):
+        return _represent_chunk(images)
+
+    results: List[Optional[np.ndarray]] = []
+    for part in get_executor(workers).map(_represent_chunk, _chunks(images, workers)):
+        results.extend(part)
+    return results
@@ -0,0 +1,54 @@
+# face_matcher/prototypes.py
+"""
+Прототипы студентов: несколько эталонных фото -> один или несколько векторов.
+
+Эмбеддинги всех фото студента усредняются (для cosine/euclidean_l2 —
+после нормировки). Если фото много и они разные (очки, другой ракурс),
+они разбиваются k-means на несколько кластеров, и прототипом служит
+центр каждого. Матрица для match() растёт с числом студентов,
+а не с числом фото.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import DISTANCE_METRIC, PROTOTYPES_PER_STUDENT, PHOTOS_PER_PROTOTYPE
+from .ann import kmeans
+from .distance import l2_normalize
+
+
+def student_prototypes(vectors: np.ndarray, max_prototypes: int = PROTOTYPES_PER_STUDENT,
+                       photos_per_prototype: int = PHOTOS_PER_PROTOTYPE,
+                       metric: str = DISTANCE_METRIC) -> np.ndarray:
+    """Прототипы (k, d) по эмбеддингам фото одного студента (n, d)."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    if metric in ("cosine", "euclidean_l2"):
+        vectors = l2_normalize(vectors)
+    k = max(1, min(max_prototypes, len(vectors) // max(1, photos_per_prototype)))
+    if k == 1:
+        return vectors.mean(axis=0, keepdims=True)
+    centroids, _ = kmeans(vectors, k)
+    return centroids
+
+
+def aggregate(owners: Sequence, vectors: Sequence[Optional[np.ndarray]],
+              **kwargs) -> Tuple[List, np.ndarray]:
+    """
+    Эмбеддинги фото -> прототипы владельцев. owners[i] — владелец фото i
+    (имя или кортеж); фото без эмбеддинга пропускаются. Возвращает
+    владельцев строк (повторяются, если прототипов несколько) и матрицу.
+    """
+    grouped: Dict[object, List[np.ndarray]] = {}
+    for owner, vector in zip(owners, vectors):
+        if vector is not None:
+            grouped.setdefault(owner, []).append(vector)
+    if not grouped:
+        return [], np.empty((0, 0), dtype=np.float32)
+
+    rows, blocks = [], []
+    for owner, owner_vectors in grouped.items():
+        prototypes = student_prototypes(np.stack(owner_vectors), **kwargs)
+        rows.extend([owner] * len(prototypes))
+        blocks.append(prototypes)
+    return rows, np.concatenate(blocks).astype(np.float32)
@@ -8,4 +8,10 @@ DEEFACE_VERIFY_FACENET512 ={
     "detector_backend": "opencv",
     "align": True,
     "normalization": "base"
+}
+
+# те же параметры для DeepFace.represent (без метрики расстояния)
+DEEFACE_REPRESENT_FACENET512 = {
+    key: value for key, value in DEEFACE_VERIFY_FACENET512.items()
+    if key != "distance_metric"
 }
\ No newline at end of file
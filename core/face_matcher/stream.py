@@ -0,0 +1,90 @@
+# face_matcher/stream.py
+"""
+Потоковое распознавание: каждый новый кроп сразу сравнивается с ещё
+не найденными студентами группы. Съёмку можно остановить, как только
+найдены все студенты или истёк бюджет времени.
+"""
+
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from config.settings import STREAM_TIME_BUDGET
+from core.photo_manager import PhotoManager
+from .core import assign, embed_faces, load_student_vectors
+
+
+class StreamingMatcher:
+    def __init__(self, group: str, time_budget: float = STREAM_TIME_BUDGET):
+        self.group = group
+        self.time_budget = time_budget
+        self.started_at = time.time()
+        self.faces_seen = 0
+        self.faces_matched = 0                  # кропов с эмбеддингом, сравненных с группой
+        self.present: Dict[str, float] = {}     # имя -> уверенность
+
+        self.names, self.student_matrix = load_student_vectors(PhotoManager.get_students(group))
+        print(f"[StreamingMatcher] {group}: студентов {len(set(self.names))}, "
+              f"бюджет {time_budget} сек")
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started_at
+
+    @property
+    def remaining(self) -> List[str]:
+        return sorted(set(self.names) - set(self.present))
+
+    @property
+    def all_found(self) -> bool:
+        return bool(self.names) and not self.remaining
+
+    @property
+    def timed_out(self) -> bool:
+        return self.elapsed >= self.time_budget
+
+    @property
+    def done(self) -> bool:
+        return self.all_found or self.timed_out or not self.names
+
+    def feed(self, faces: List[np.ndarray]) -> List[Dict]:
+        """Сопоставить новые кропы с ненайденными студентами. Возвращает новых найденных."""
+        if self.done:
+            return []
+        return self._match(faces)
+
+    def finish(self, faces: List[np.ndarray]) -> List[Dict]:
+        """
+        Последние кропы после остановки съёмки (лучшие кропы незакрытых
+        треков) — сопоставляются, даже если бюджет времени уже истёк.
+        """
+        if self.all_found or not self.names:
+            return []
+        return self._match(faces)
+
+    def _match(self, faces: List[np.ndarray]) -> List[Dict]:
+        if not faces:
+            return []
+        self.faces_seen += len(faces)
+
+        face_vectors = embed_faces(faces)
+        if not face_vectors:
+            return []
+        self.faces_matched += len(face_vectors)
+
+        # сравниваем только с теми, кого ещё не нашли
+        rows = [i for i, name in enumerate(self.names) if name not in self.present]
+        found = assign([self.names[i] for i in rows], self.student_matrix[rows], face_vectors)
+        for result in found:
+            self.present[result["name"]] = result["confidence"]
+        return found
+
+    @property
+    def matched(self) -> bool:
+        """Было ли что сопоставлять (иначе перекличку не записывают)."""
+        return self.faces_matched > 0
+
+    def results(self) -> List[Dict]:
+        """Текущий список присутствующих в формате match()."""
+        return [{"name": name, "confidence": conf} for name, conf in self.present.items()]
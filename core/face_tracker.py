@@ -0,0 +1,187 @@
+# core/face_tracker.py
+"""
+Трекинг лиц между кадрами.
+
+Каждой детекции Haar-каскада присваивается идентификатор трека
+(сопоставление по IoU, запасной вариант — по расстоянию между
+центрами). Для трека хранится только лучший по качеству кроп
+(резкость, размер, фронтальность), и в распознавание уходит именно он,
+а не десятки почти одинаковых кадров одного и того же студента.
+"""
+
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.settings import (
+    TRACK_IOU_THRESHOLD, TRACK_MAX_MISSED, TRACK_MIN_HITS,
+    TRACK_EMIT_AFTER, TRACK_REEMIT_GAIN,
+)
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+
+def iou(a: Box, b: Box) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def crop_quality(crop: np.ndarray) -> float:
+    """Оценка качества кропа в [0, 1]: резкость × размер × фронтальность."""
+    if crop is None or crop.size == 0:
+        return 0.0
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+
+    # резкость: дисперсия лапласиана, приведённая к [0, 1)
+    variance = cv2.Laplacian(gray, cv2.CV_64F).var()
+    sharpness = variance / (variance + 100.0)
+
+    # размер: лица меньше 120 px хуже распознаются
+    size = min(1.0, min(gray.shape[:2]) / 120.0)
+
+    # фронтальность: симметрия левой и зеркальной правой половины
+    half = gray.shape[1] // 2
+    if half == 0:
+        return 0.0
+    left = gray[:, :half].astype(np.float32)
+    right = np.fliplr(gray[:, -half:]).astype(np.float32)
+    symmetry = 1.0 - float(np.mean(np.abs(left - right))) / 255.0
+
+    return sharpness * size * symmetry
+
+
+class Track:
+    def __init__(self, track_id: int, box: Box):
+        self.track_id = track_id
+        self.box = box
+        self.hits = 1
+        self.missed = 0
+        self.best_crop: Optional[np.ndarray] = None
+        self.best_quality = 0.0
+        self.emitted = False
+        self.emitted_quality = 0.0   # качество последнего отправленного кропа
+
+    def offer(self, crop: np.ndarray):
+        quality = crop_quality(crop)
+        if quality > self.best_quality:
+            self.best_quality = quality
+            self.best_crop = crop.copy()
+
+
+class FaceTracker:
+    def __init__(self, iou_threshold: float = TRACK_IOU_THRESHOLD, max_missed: int = TRACK_MAX_MISSED,
+                 min_hits: int = TRACK_MIN_HITS, emit_after: int = TRACK_EMIT_AFTER,
+                 reemit_gain: float = TRACK_REEMIT_GAIN):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.min_hits = min_hits
+        self.emit_after = emit_after
+        self.reemit_gain = reemit_gain
+        self.tracks: List[Track] = []
+        self._next_id = 1
+
+    def _associate(self, boxes: List[Box]) -> List[Tuple[int, int]]:
+        """Жадное сопоставление (трек, детекция) по IoU, затем по центрам."""
+        pairs = []
+        for ti, track in enumerate(self.tracks):
+            for di, box in enumerate(boxes):
+                score = iou(track.box, box)
+                if score < self.iou_threshold:
+                    # запасной вариант: центр сместился меньше чем на полразмера лица
+                    tx, ty, tw, th = track.box
+                    x, y, w, h = box
+                    shift = np.hypot((tx + tw / 2) - (x + w / 2), (ty + th / 2) - (y + h / 2))
+                    if shift > 0.5 * max(tw, th):
+                        continue
+                    score = 0.0
+                pairs.append((score, ti, di))
+
+        matched, used_tracks, used_boxes = [], set(), set()
+        for _, ti, di in sorted(pairs, reverse=True):
+            if ti in used_tracks or di in used_boxes:
+                continue
+            matched.append((ti, di))
+            used_tracks.add(ti)
+            used_boxes.add(di)
+        return matched
+
+    def _should_emit(self, track: Track) -> bool:
+        if track.hits < self.min_hits or track.best_crop is None:
+            return False
+        if not track.emitted:
+            return track.hits >= self.emit_after
+        return track.best_quality > track.emitted_quality * self.reemit_gain
+
+    def update(self, frame: np.ndarray, boxes) -> List[np.ndarray]:
+        """
+        Обновить треки детекциями кадра. Возвращает кропы, которые пора
+        отправить в распознавание (лучший кроп трека — один раз, повторно
+        только если качество заметно выросло).
+        """
+        boxes = [tuple(int(v) for v in b) for b in boxes]
+        matched = self._associate(boxes)
+        matched_tracks = {ti for ti, _ in matched}
+        matched_boxes = {di for _, di in matched}
+
+        for ti, di in matched:
+            track = self.tracks[ti]
+            track.box = boxes[di]
+            track.hits += 1
+            track.missed = 0
+            x, y, w, h = boxes[di]
+            track.offer(frame[y:y + h, x:x + w])
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.missed += 1
+
+        for di, box in enumerate(boxes):
+            if di in matched_boxes:
+                continue
+            track = Track(self._next_id, box)
+            x, y, w, h = box
+            track.offer(frame[y:y + h, x:x + w])
+            self.tracks.append(track)
+            self._next_id += 1
+
+        emitted = []
+        alive = []
+        for track in self.tracks:
+            lost = track.missed > self.max_missed
+            if self._should_emit(track) or (lost and not track.emitted
+                                            and track.hits >= self.min_hits):
+                emitted.append(track.best_crop)
+                track.emitted = True
+                track.emitted_quality = track.best_quality
+            if not lost:
+                alive.append(track)
+        self.tracks = alive
+        return emitted
+
+    def flush(self) -> List[np.ndarray]:
+        """Лучшие кропы ещё не отправленных треков (при остановке захвата)."""
+        emitted = []
+        for track in self.tracks:
+            if track.best_crop is not None and not track.emitted and track.hits >= self.min_hits:
+                emitted.append(track.best_crop)
+                track.emitted = True
+                track.emitted_quality = track.best_quality
+        return emitted
+
+    def reset(self):
+        self.tracks = []
+        self._next_id = 1
+
+    def track_ids(self, boxes) -> List[Optional[int]]:
+        """Идентификаторы треков для детекций текущего кадра (для подписи рамок)."""
+        ids = []
+        for box in boxes:
+            box = tuple(int(v) for v in box)
+            ids.append(next((t.track_id for t in self.tracks if t.box == box), None))
+        return ids
@@ -0,0 +1,143 @@
+# core/metrics.py
+"""
+Лёгкая инструментация горячих участков: счётчики и гистограммы задержек.
+
+Один реестр на процесс (metrics), общий для потоков камеры, сессий
+Streamlit и распознавания. Снимок выгружается в JSON или в текстовый
+формат Prometheus.
+
+    with metrics.timer("detection"):
+        faces = detector.detect(frame)
+    metrics.inc("frames_total")
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# границы корзин гистограмм, мс
+BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float("inf"))
+PROMETHEUS_PREFIX = "attendance"
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value_ms: float):
+        for i, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля по корзинам (верхняя граница корзины)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "min_ms": round(self.min, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max, 3) if self.count else None,
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.counts)},
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value_ms: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value_ms)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Замер блока кода в гистограмму name (мс)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "counters": dict(self.counters),
+                "latency": {name: h.summary() for name, h in self.histograms.items()},
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        snapshot = self.snapshot()
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{PROMETHEUS_PREFIX}_{name}"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, summary in sorted(snapshot["latency"].items()):
+            metric = f"{PROMETHEUS_PREFIX}_{name}_ms"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in summary["buckets"].items():
+                cumulative += count
+                le = "+Inf" if bound == "inf" else bound
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum {summary['sum_ms']}")
+            lines.append(f"{metric}_count {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path, fmt: str = "json") -> Path:
+        """Записать снимок в файл (fmt: json | prometheus)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        path.write_text(text, encoding="utf-8")
+        return path
+
+
+# общий реестр процесса
+metrics = Metrics()
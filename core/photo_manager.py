@@ -1,27 +1,100 @@
 # core/photo_manager.py
+import re
 import shutil
 from pathlib import Path
+from typing import Optional
 from config.settings import PHOTOS_DIR, TEMP_FACES_DIR, SUPPORTED_EXT
 
+# дополнительные фото студента: Имя_Фамилия_2.jpg, Имя_Фамилия_3.jpg, ...
+_NUMBERED = re.compile(r"^(.+?)_(\d+)$")
+
+
+def _is_photo(path: Path) -> bool:
+    return path.is_file() and path.suffix.lower() in SUPPORTED_EXT
+
+
+def numbered_base(stem: str) -> Optional[str]:
+    """Имя основного фото для дополнительного (<Имя>_2 -> <Имя>); None — фото не дополнительное."""
+    match = _NUMBERED.match(stem)
+    return match.group(1) if match else None
+
+
 class PhotoManager:
     @staticmethod
     def get_group_folder(group_name: str) -> Path:
         return PHOTOS_DIR / group_name
 
     @staticmethod
-    def save_student_photo(group: str, full_name: str, image_bytes: bytes) -> str:
+    def safe_file_name(full_name: str) -> str:
+        """Имя файла фото по имени студента; имена с путями ("/", "\\", "..", "C:") — ValueError."""
+        name = full_name.strip()
+        if not name or ".." in name or any(c in name for c in "/\\:\0"):
+            raise ValueError(f"Недопустимое имя студента: {full_name!r}")
+        return name.replace(" ", "_")
+
+    @staticmethod
+    def save_student_photo(group: str, full_name: str, image_bytes: bytes, extra: bool = False) -> str:
+        """
+        Основное фото <Имя>.jpg (прежние дополнительные фото удаляются);
+        extra=True — дополнительное <Имя>_N.jpg.
+        """
         folder = PhotoManager.get_group_folder(group)
-        folder.mkdir(parents=True, exist_ok=True)
-        safe_name = full_name.strip().replace(" ", "_")
+        safe_name = PhotoManager.safe_file_name(full_name)
         file_path = folder / f"{safe_name}.jpg"
+        if extra and file_path.exists():
+            taken = {p.stem for p in folder.glob(f"{safe_name}_*")}
+            number = 2
+            while f"{safe_name}_{number}" in taken:
+                number += 1
+            file_path = folder / f"{safe_name}_{number}.jpg"
+        # фото пишется только в папку группы
+        if file_path.resolve().parent != folder.resolve():
+            raise ValueError(f"Путь фото вне папки группы: {file_path}")
+        folder.mkdir(parents=True, exist_ok=True)
+        if not extra:
+            PhotoManager._remove_extra_photos(file_path)
 
         with open(file_path, "wb") as f:
             f.write(image_bytes)
         print(f"Фото сохранено: {file_path}")
         return str(file_path)
 
+    @staticmethod
+    def _remove_extra_photos(main: Path):
+        """
+        Новое основное фото заменяет студента целиком: дополнительные фото
+        прежнего (<Имя>_N.jpg, папка <Имя>/) иначе остались бы его эталонами.
+        """
+        extras = [Path(p) for p in PhotoManager.student_photos(str(main)) if Path(p) != main]
+        for path in extras:
+            path.unlink()
+        subfolder = main.parent / main.stem
+        if subfolder.is_dir() and not any(subfolder.iterdir()):
+            subfolder.rmdir()
+        if extras:
+            print(f"Удалены прежние дополнительные фото {main.stem}: {len(extras)}")
+
+    @staticmethod
+    def student_photos(photo_path: str) -> list[str]:
+        """Все фото студента по основному: <Имя>.jpg, <Имя>_N.jpg и папка <Имя>/."""
+        main = Path(photo_path)
+        base = main.stem
+        photos = [main] if _is_photo(main) else []
+        for file_path in main.parent.glob(f"{base}_*"):
+            if numbered_base(file_path.stem) == base and _is_photo(file_path):
+                photos.append(file_path)
+        subfolder = main.parent / base
+        if subfolder.is_dir():
+            photos.extend(sorted(p for p in subfolder.iterdir() if _is_photo(p)))
+        return [str(p) for p in photos]
+
     @staticmethod
     def get_students(group: str) -> list[dict]:
+        """
+        Студенты группы: {"name", "path" — основное фото, "paths" — все фото}.
+        Несколько фото одного студента — файлы <Имя>_2.jpg, <Имя>_3.jpg
+        или отдельная папка <Имя>/ с любыми фото.
+        """
         folder = PhotoManager.get_group_folder(group)
         students = []
 
@@ -29,10 +102,23 @@ class PhotoManager:
             print(f"Папка не найдена: {folder}")
             return students
 
-        for file_path in folder.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_EXT:
-                name = file_path.stem.replace("_", " ").title()
-                students.append({"name": name, "path": str(file_path)})
+        photos: dict[str, list[Path]] = {}
+        for item in sorted(folder.iterdir()):
+            if item.is_dir():
+                files = sorted(p for p in item.iterdir() if _is_photo(p))
+                if files:
+                    photos.setdefault(item.name, []).extend(files)
+            elif _is_photo(item):
+                base = numbered_base(item.stem)
+                # основное фото без номера — первым
+                if base is not None:
+                    photos.setdefault(base, []).append(item)
+                else:
+                    photos.setdefault(item.stem, []).insert(0, item)
+
+        for base, files in photos.items():
+            name = base.replace("_", " ").title()
+            students.append({"name": name, "path": str(files[0]), "paths": [str(p) for p in files]})
         print(f"Загружено {len(students)} студентов из {group}")
         return students
 
@@ -0,0 +1,329 @@
+# core/roster_import.py
+"""
+Массовый импорт студентов из zip-архива или папки.
+
+Источник описывается CSV (колонки name, group, photo — путь к фото
+относительно архива/папки). Без CSV структура читается из папок так
+же, как в data/photos: <группа>/<Имя_Фамилия>.jpg, дополнительные фото
+<группа>/<Имя_Фамилия>_2.jpg или папка <группа>/<Имя_Фамилия>/ — так
+выгруженная из приложения папка импортируется без изменений.
+
+Пути из CSV и имена в архиве не выходят за пределы источника: "../"
+и абсолютные пути пропускаются. Со страницы импортируются только
+папки внутри IMPORT_INTAKE_DIR (см. intake_folder()).
+
+Фото обрабатываются параллельно (IMPORT_WORKERS потоков, OpenCV
+отпускает GIL): декодирование, поиск самого крупного лица Haar-каскадом,
+кроп с запасом в пропорциях CANONICAL_PHOTO_SIZE и ресайз. Затем
+студенты одной транзакцией добавляются в базу, а эмбеддинги эталонов
+считаются сразу и попадают в кэш — распознавание их уже не пересчитывает.
+
+Запуск из консоли:
+    python -m core.roster_import intake.zip
+    python -m core.roster_import photos_dir/ --csv students.csv
+"""
+
+import argparse
+import csv
+import io
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from config.settings import (
+    GROUPS, SUPPORTED_EXT, CANONICAL_PHOTO_SIZE, IMPORT_FACE_MARGIN, IMPORT_WORKERS, IMPORT_INTAKE_DIR,
+)
+from core.photo_manager import PhotoManager, numbered_base
+from core.students import add_students, load_students
+
+JPEG_QUALITY = 95
+DETECT_MAX_SIDE = 800   # детекция на уменьшенной копии: большие фото с телефона не нужны целиком
+
+_local = threading.local()
+
+
+def _cascade() -> cv2.CascadeClassifier:
+    # у каждого потока свой каскад: detectMultiScale не потокобезопасен
+    cascade = getattr(_local, "cascade", None)
+    if cascade is None:
+        cascade = _local.cascade = cv2.CascadeClassifier(
+            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        )
+    return cascade
+
+
+def detect_largest_face(image: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """Самая крупная рамка лица (x, y, w, h) в координатах исходного фото."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    scale = min(1.0, DETECT_MAX_SIDE / max(gray.shape[:2]))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    faces = _cascade().detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(40, 40))
+    if len(faces) == 0:
+        return None
+    x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+    return tuple(int(v / scale) for v in (x, y, w, h))
+
+
+def canonical_crop(image: np.ndarray, box, size: Tuple[int, int] = CANONICAL_PHOTO_SIZE,
+                   margin: float = IMPORT_FACE_MARGIN) -> np.ndarray:
+    """Кроп вокруг лица с запасом margin в пропорциях size (ширина, высота)."""
+    target_w, target_h = size
+    img_h, img_w = image.shape[:2]
+    x, y, w, h = box
+    cx, cy = x + w / 2, y + h / 2
+
+    crop_w = w * (1 + 2 * margin)
+    crop_h = h * (1 + 2 * margin)
+    # подгоняем к нужным пропорциям, расширяя меньшую сторону
+    if crop_w / crop_h < target_w / target_h:
+        crop_w = crop_h * target_w / target_h
+    else:
+        crop_h = crop_w * target_h / target_w
+    # не больше самого фото
+    fit = min(1.0, img_w / crop_w, img_h / crop_h)
+    crop_w, crop_h = crop_w * fit, crop_h * fit
+
+    x0 = int(min(max(0, cx - crop_w / 2), img_w - crop_w))
+    y0 = int(min(max(0, cy - crop_h / 2), img_h - crop_h))
+    crop = image[y0:y0 + int(crop_h), x0:x0 + int(crop_w)]
+    return cv2.resize(crop, (target_w, target_h), interpolation=cv2.INTER_AREA)
+
+
+def preprocess_photo(data: bytes) -> Tuple[Optional[bytes], Optional[str]]:
+    """Байты исходного фото -> (JPEG канонического кропа, None) или (None, причина)."""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return None, "не удалось декодировать фото"
+    box = detect_largest_face(image)
+    if box is None:
+        return None, "лицо не найдено"
+    ok, encoded = cv2.imencode(".jpg", canonical_crop(image, box),
+                               [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if not ok:
+        return None, "не удалось закодировать кроп"
+    return encoded.tobytes(), None
+
+
+def intake_folders() -> List[str]:
+    """Папки, подготовленные для импорта в IMPORT_INTAKE_DIR."""
+    return sorted(p.name for p in IMPORT_INTAKE_DIR.iterdir() if p.is_dir())
+
+
+def intake_folder(name: str) -> Path:
+    """Папка импорта по имени; только внутри IMPORT_INTAKE_DIR."""
+    intake = IMPORT_INTAKE_DIR.resolve()
+    folder = (intake / name).resolve()
+    if folder == intake or not folder.is_relative_to(intake) or not folder.is_dir():
+        raise ValueError(f"Папка импорта не найдена: {name}")
+    return folder
+
+
+class _Source:
+    """Единый доступ к файлам zip-архива или папки; пути — только внутри источника."""
+
+    def __init__(self, source: Union[str, Path, bytes]):
+        if isinstance(source, (bytes, bytearray)):
+            self.zip = zipfile.ZipFile(io.BytesIO(source))
+        elif zipfile.is_zipfile(source):
+            self.zip = zipfile.ZipFile(source)
+        else:
+            self.zip = None
+            self.root = Path(source).resolve()
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> Path:
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"путь вне папки импорта: {name}")
+        return path
+
+    @staticmethod
+    def _check_member(name: str):
+        path = PurePosixPath(name.replace("\\", "/"))
+        # "/x", "../x" и "C:/x" — за пределами архива
+        if path.is_absolute() or ".." in path.parts or (path.parts and ":" in path.parts[0]):
+            raise ValueError(f"путь вне архива: {name}")
+
+    def files(self) -> List[str]:
+        if self.zip is not None:
+            names = []
+            for name in self.zip.namelist():
+                if name.endswith("/"):
+                    continue
+                try:
+                    self._check_member(name)
+                except ValueError:
+                    continue
+                names.append(name)
+            return names
+        files = []
+        for p in self.root.rglob("*"):
+            # символические ссылки наружу не читаем
+            if p.is_file() and p.resolve().is_relative_to(self.root):
+                files.append(p.relative_to(self.root).as_posix())
+        return files
+
+    def read(self, name: str) -> bytes:
+        if self.zip is not None:
+            self._check_member(name)
+            # ZipFile читает из одного файлового объекта — по очереди
+            with self._lock:
+                return self.zip.read(name)
+        return self._path(name).read_bytes()
+
+
+def _check_name(entry: Dict) -> Dict:
+    # имя становится именем файла фото — пути в нём не допускаются
+    if entry["name"]:
+        try:
+            PhotoManager.safe_file_name(entry["name"])
+        except ValueError as e:
+            entry["reason"] = str(e)
+    return entry
+
+
+def _entries_from_csv(text: str) -> List[Dict]:
+    return [
+        _check_name({"name": (row.get("name") or "").strip(), "group": (row.get("group") or "").strip(),
+                     "file": (row.get("photo") or "").strip()})
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+def _entries_from_layout(files: List[str]) -> List[Dict]:
+    # (группа, имя файла студента) -> [основное фото, дополнительные...]
+    photos: Dict[Tuple[str, str], List[str]] = {}
+    for name in sorted(files):
+        path = Path(name)
+        if path.suffix.lower() not in SUPPORTED_EXT or len(path.parts) < 2:
+            continue
+        if path.parts[-2] not in GROUPS and len(path.parts) >= 3 and path.parts[-3] in GROUPS:
+            # папка студента <группа>/<Имя>/ с любыми фото
+            photos.setdefault((path.parts[-3], path.parts[-2]), []).append(name)
+            continue
+        base = numbered_base(path.stem)
+        files_of = photos.setdefault((path.parts[-2], base or path.stem), [])
+        if base is None:
+            files_of.insert(0, name)    # основное фото без номера — первым
+        else:
+            files_of.append(name)
+    return [
+        _check_name({"name": base.replace("_", " ").strip(), "group": group,
+                     "file": names[0], "extra_files": names[1:]})
+        for (group, base), names in photos.items()
+    ]
+
+
+def collect_entries(source: _Source, csv_text: Optional[str] = None) -> List[Dict]:
+    """
+    Список {"name", "group", "file"[, "extra_files"]}: из CSV (переданного
+    или лежащего в источнике) или из папок.
+    """
+    if csv_text is None:
+        csv_files = [f for f in source.files() if f.lower().endswith(".csv")]
+        if csv_files:
+            csv_text = source.read(csv_files[0]).decode("utf-8-sig")
+    if csv_text is not None:
+        return _entries_from_csv(csv_text)
+    return _entries_from_layout(source.files())
+
+
+def import_roster(source: Union[str, Path, bytes], csv_text: Optional[str] = None,
+                  workers: int = IMPORT_WORKERS, precompute: bool = True,
+                  progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Импорт студентов. Возвращает отчёт:
+    {"imported": [...], "skipped": [{"name", "group", "file", "reason"}]}.
+    """
+    src = _Source(source)
+    entries = collect_entries(src, csv_text)
+    skipped = []
+
+    existing = {
+        (s["name"].lower(), s["group"]) for group in GROUPS for s in load_students(group)
+    }
+    todo, seen = [], set()
+    for entry in entries:
+        key = (entry["name"].lower(), entry["group"])
+        if "reason" in entry:
+            reason = entry.pop("reason")
+        elif not entry["name"] or not entry["file"]:
+            reason = "не указано имя или фото"
+        elif entry["group"] not in GROUPS:
+            reason = f"неизвестная группа {entry['group']!r}"
+        elif key in existing or key in seen:
+            reason = "студент уже есть в группе"
+        else:
+            seen.add(key)
+            todo.append(entry)
+            continue
+        skipped.append({**entry, "reason": reason})
+
+    def load(name):
+        try:
+            data = src.read(name)
+        except ValueError as e:
+            return None, str(e)
+        except (KeyError, OSError) as e:
+            return None, f"файл не найден: {e}"
+        return preprocess_photo(data)
+
+    def process(entry):
+        photo, reason = load(entry["file"])
+        # дополнительные фото без лица просто не попадают в эталоны
+        extras = [] if photo is None else [load(name)[0] for name in entry.get("extra_files", [])]
+        return entry, photo, reason, [p for p in extras if p is not None]
+
+    imported, saved = [], []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for done, (entry, photo, reason, extras) in enumerate(executor.map(process, todo), 1):
+            if photo is None:
+                skipped.append({**entry, "reason": reason})
+            else:
+                path = PhotoManager.save_student_photo(entry["group"], entry["name"], photo)
+                imported.append({"name": entry["name"], "group": entry["group"], "photo": path})
+                saved.append(path)
+                for extra in extras:
+                    saved.append(PhotoManager.save_student_photo(entry["group"], entry["name"], extra, extra=True))
+            if progress is not None:
+                progress(done, len(todo))
+
+    if imported:
+        add_students(imported)
+        if precompute:
+            # эталонные эмбеддинги — сразу в кэш
+            from core.face_matcher.embeddings import get_store
+            store = get_store()
+            vectors = store.get_many(saved)
+            store.save()
+            missing = sum(v is None for v in vectors)
+            if missing:
+                print(f"[Import] Не удалось посчитать эмбеддинги: {missing}")
+
+    print(f"[Import] Импортировано: {len(imported)}, пропущено: {len(skipped)}")
+    return {"imported": imported, "skipped": skipped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Массовый импорт студентов")
+    parser.add_argument("source", help="zip-архив или папка с фото")
+    parser.add_argument("--csv", help="CSV с колонками name, group, photo")
+    parser.add_argument("--workers", type=int, default=IMPORT_WORKERS)
+    parser.add_argument("--no-embeddings", action="store_true", help="не считать эмбеддинги сразу")
+    args = parser.parse_args()
+
+    csv_text = Path(args.csv).read_text(encoding="utf-8-sig") if args.csv else None
+    report = import_roster(args.source, csv_text, workers=args.workers,
+                           precompute=not args.no_embeddings)
+    for item in report["skipped"]:
+        print(f"  пропущен: {item['name'] or item['file']} ({item['group']}) — {item['reason']}")
+
+
+if __name__ == "__main__":
+    main()
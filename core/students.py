@@ -0,0 +1,158 @@
+# core/students.py
+"""
+Список студентов в SQLite (таблица students в database/student.db).
+
+Страницы читают только нужную группу/страницу по индексам, а добавление
+и удаление меняют одну строку — без перезаписи всего списка, поэтому
+параллельные сессии не затирают изменения друг друга.
+
+При первом обращении таблица создаётся и в неё один раз переносится
+старый data/students.json (PRAGMA user_version отмечает миграцию).
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.settings import LEGACY_STUDENTS_JSON
+from core.db import get_connection, transaction
+
+SCHEMA_VERSION = 1
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _create_schema(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            group_name TEXT NOT NULL,
+            photo TEXT NOT NULL,
+            added_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_students_group_name ON students (group_name, name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_students_name ON students (name)")
+
+
+def _migrate_json(conn) -> int:
+    """Перенести студентов из data/students.json (файл остаётся на месте)."""
+    if not LEGACY_STUDENTS_JSON.exists():
+        return 0
+    try:
+        with open(LEGACY_STUDENTS_JSON, "r", encoding="utf-8") as f:
+            students = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[Students] Не удалось прочитать {LEGACY_STUDENTS_JSON}: {e}")
+        return 0
+
+    rows = [
+        (s["name"], s["group"], s.get("photo", ""), s.get("added_at") or datetime.now().isoformat())
+        for s in students if s.get("name") and s.get("group")
+    ]
+    conn.executemany(
+        "INSERT INTO students (name, group_name, photo, added_at) VALUES (?, ?, ?, ?)", rows
+    )
+    print(f"[Students] Перенесено из {LEGACY_STUDENTS_JSON}: {len(rows)}")
+    return len(rows)
+
+
+def init_db():
+    """Создать таблицу и выполнить миграцию — один раз на процесс."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        with transaction() as conn:
+            # версия проверяется внутри транзакции: миграцию выполнит только один процесс
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                _create_schema(conn)
+                _migrate_json(conn)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        _initialized = True
+
+
+def _to_dict(row) -> Dict:
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "group": row["group_name"],
+        "photo": row["photo"],
+        "added_at": row["added_at"],
+    }
+
+
+def load_students(group: Optional[str] = None, limit: Optional[int] = None,
+                  offset: int = 0) -> List[Dict]:
+    """Студенты (все или одной группы), по имени; limit/offset — постранично."""
+    init_db()
+    query = "SELECT id, name, group_name, photo, added_at FROM students"
+    params: list = []
+    if group is not None:
+        query += " WHERE group_name = ?"
+        params.append(group)
+    query += " ORDER BY name, id"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    return [_to_dict(row) for row in get_connection().execute(query, params)]
+
+
+def count_students(group: Optional[str] = None) -> int:
+    init_db()
+    if group is None:
+        return get_connection().execute("SELECT COUNT(*) FROM students").fetchone()[0]
+    return get_connection().execute(
+        "SELECT COUNT(*) FROM students WHERE group_name = ?", (group,)
+    ).fetchone()[0]
+
+
+def add_student(name: str, group: str, photo_path: str) -> bool:
+    init_db()
+    try:
+        with transaction() as conn:
+            conn.execute(
+                "INSERT INTO students (name, group_name, photo, added_at) VALUES (?, ?, ?, ?)",
+                (name.strip(), group, str(photo_path), datetime.now().isoformat()),
+            )
+    except Exception as e:
+        print(f"[Students] Ошибка добавления {name}: {e}")
+        return False
+    return True
+
+
+def add_students(students: List[Dict]) -> int:
+    """Массовое добавление [{"name", "group", "photo"}] одной транзакцией."""
+    init_db()
+    now = datetime.now().isoformat()
+    rows = [(s["name"].strip(), s["group"], str(s["photo"]), now) for s in students]
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO students (name, group_name, photo, added_at) VALUES (?, ?, ?, ?)", rows
+        )
+    return len(rows)
+
+
+def delete_student(student: Dict, remove_photo: bool = True) -> bool:
+    """Удалить студента (по id) и, если нужно, его фото."""
+    init_db()
+    try:
+        with transaction() as conn:
+            deleted = conn.execute("DELETE FROM students WHERE id = ?", (student["id"],)).rowcount
+    except Exception as e:
+        print(f"[Students] Ошибка удаления {student.get('name')}: {e}")
+        return False
+
+    if remove_photo and student.get("photo"):
+        from core.photo_manager import PhotoManager
+        # вместе с основным — дополнительные фото (<Имя>_N.jpg, папка <Имя>/)
+        for path in PhotoManager.student_photos(student["photo"]):
+            os.remove(path)
+    return deleted > 0
@@ -0,0 +1,83 @@
+# core/thumbnails.py
+"""
+Превью фото для списков и галерей.
+
+Вместо полноразмерного фото в браузер уходит уменьшенная JPEG-копия.
+Превью фото с диска хранятся в data/thumbnails/ и строятся один раз:
+в имени файла — хэш пути и хэш (mtime, размер) исходника, так что
+изменённое фото получает новое превью, а старое удаляется.
+Превью кропов из FaceBuffer кэшируются в самой записи буфера.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from config.settings import THUMBNAILS_DIR, THUMBNAIL_SIZE
+
+JPEG_QUALITY = 85
+
+
+def resize_to_fit(image: np.ndarray, size: int = THUMBNAIL_SIZE) -> np.ndarray:
+    """Уменьшить так, чтобы большая сторона была не больше size (не увеличивает)."""
+    h, w = image.shape[:2]
+    factor = size / max(h, w)
+    if factor >= 1:
+        return image
+    return cv2.resize(image, (max(1, int(w * factor)), max(1, int(h * factor))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def encode_thumbnail(image: np.ndarray, size: int = THUMBNAIL_SIZE) -> bytes:
+    """BGR-изображение -> JPEG-превью (байты)."""
+    ok, buffer = cv2.imencode(".jpg", resize_to_fit(image, size),
+                              [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if not ok:
+        raise ValueError("Не удалось закодировать превью")
+    return buffer.tobytes()
+
+
+def _thumbnail_path(path: Path, stat: os.stat_result, size: int) -> Path:
+    path_key = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    version = hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}:{size}".encode()).hexdigest()[:8]
+    return THUMBNAILS_DIR / f"{path_key}_{version}.jpg"
+
+
+def get_thumbnail(path, size: int = THUMBNAIL_SIZE) -> Optional[str]:
+    """Путь к превью фото (строится при первом запросе). None — фото нет или не читается."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    thumb = _thumbnail_path(path, stat, size)
+    if thumb.exists():
+        return str(thumb)
+
+    image = cv2.imread(str(path))
+    if image is None:
+        print(f"Не удалось прочитать фото для превью: {path}")
+        return None
+
+    # устаревшие превью того же фото
+    for old in THUMBNAILS_DIR.glob(f"{thumb.name.split('_')[0]}_*.jpg"):
+        old.unlink(missing_ok=True)
+
+    tmp = thumb.with_name(f"{thumb.stem}.{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp.write_bytes(encode_thumbnail(image, size))
+    os.replace(tmp, thumb)
+    return str(thumb)
+
+
+def crop_thumbnail(face: dict, size: int = THUMBNAIL_SIZE) -> bytes:
+    """Превью записи FaceBuffer ({"image", ...}); кодируется один раз."""
+    thumbnail = face.get("thumbnail")
+    if thumbnail is None:
+        thumbnail = face["thumbnail"] = encode_thumbnail(face["image"], size)
+    return thumbnail
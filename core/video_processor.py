@@ -0,0 +1,121 @@
+# core/video_processor.py
+"""
+Обработка записи занятия (mp4/avi) тем же конвейером детекция → трекинг → кропы.
+
+Кадры не декодируются подряд: берётся каждый every_n-й кадр либо
+sample_fps кадров в секунду. Большие промежутки пропускаются перемоткой
+(CAP_PROP_POS_FRAMES), маленькие — grab() без преобразования кадра.
+Запись делится на отрезки по chunk_seconds, отрезки обрабатываются
+параллельно в пуле процессов (у каждого свой VideoCapture, детектор и
+трекер). Результат — лучшие кропы треков, готовые для match().
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.settings import (
+    FACE_BUFFER_SIZE, VIDEO_SAMPLE_FPS, VIDEO_CHUNK_SECONDS, VIDEO_WORKERS, VIDEO_SEEK_MIN_GAP,
+)
+from core.face_buffer import FaceBuffer
+from core.face_detector import FaceDetector
+from core.face_tracker import FaceTracker
+
+
+def video_info(path: str) -> Tuple[float, int]:
+    """(частота кадров, число кадров) видеофайла."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Не удалось открыть видео: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return fps, frames
+
+
+def frame_step(fps: float, sample_fps: Optional[float] = VIDEO_SAMPLE_FPS,
+               every_n: Optional[int] = None) -> int:
+    """Шаг между обрабатываемыми кадрами."""
+    if every_n:
+        return max(1, every_n)
+    if sample_fps:
+        return max(1, round(fps / sample_fps))
+    return 1
+
+
+def sample_frames(cap: cv2.VideoCapture, start: int, end: int, step: int,
+                  seek_min_gap: int = VIDEO_SEEK_MIN_GAP) -> Iterator[Tuple[int, np.ndarray]]:
+    """Кадры start, start+step, ... < end: (номер кадра, кадр)."""
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    position = start
+    for index in range(start, end, step):
+        if index - position >= seek_min_gap:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        else:
+            # короткий пропуск дешевле перемотки: grab() не конвертирует кадр
+            while position < index:
+                if not cap.grab():
+                    return
+                position += 1
+        ret, frame = cap.read()
+        if not ret:
+            return
+        position = index + 1
+        yield index, frame
+
+
+def process_range(path: str, start: int, end: int, step: int) -> List[np.ndarray]:
+    """Лучшие кропы треков на отрезке кадров [start, end)."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Не удалось открыть видео: {path}")
+    # кадры прореженные, поэтому детекция на каждом, без переиспользования рамок
+    detector = FaceDetector(skip_frames=0, full_scan_every=1)
+    tracker = FaceTracker()
+    crops: List[np.ndarray] = []
+    try:
+        for _, frame in sample_frames(cap, start, end, step):
+            crops.extend(tracker.update(frame, detector.detect(frame)))
+    finally:
+        cap.release()
+    crops.extend(tracker.flush())
+    return crops
+
+
+def _ranges(frames: int, fps: float, step: int, chunk_seconds: float) -> List[Tuple[int, int]]:
+    # границы отрезков кратны шагу — выборка кадров не зависит от нарезки
+    chunk = max(step, int(chunk_seconds * fps) // step * step)
+    return [(start, min(start + chunk, frames)) for start in range(0, frames, chunk)]
+
+
+def process_video(path: str, face_buffer: Optional[FaceBuffer] = None,
+                  sample_fps: Optional[float] = VIDEO_SAMPLE_FPS, every_n: Optional[int] = None,
+                  workers: int = VIDEO_WORKERS, chunk_seconds: float = VIDEO_CHUNK_SECONDS) -> FaceBuffer:
+    """Кропы лиц из записи в FaceBuffer (источник — имя файла и отрезок)."""
+    fps, frames = video_info(path)
+    step = frame_step(fps, sample_fps, every_n)
+    ranges = _ranges(frames, fps, step, chunk_seconds) if frames > 0 else [(0, 2 ** 31 - 1)]
+    print(f"[Video] {path}: {frames} кадров, {fps:.1f} fps, шаг {step}, "
+          f"отрезков {len(ranges)}, процессов {min(workers, len(ranges))}")
+
+    jobs = [(path, start, end, step) for start, end in ranges]
+    if workers > 1 and len(ranges) > 1:
+        # spawn: в родительском процессе может быть загружен TensorFlow
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(process_range, *zip(*jobs)))
+    else:
+        results = [process_range(*job) for job in jobs]
+
+    total = sum(map(len, results))
+    # по умолчанию буфер вмещает все кропы записи
+    buffer = face_buffer if face_buffer is not None else FaceBuffer(maxlen=max(FACE_BUFFER_SIZE, total))
+    for (_, start, end, _), crops in zip(jobs, results):
+        source = f"{path}@{start / fps:.0f}s"
+        for crop in crops:
+            buffer.put(crop, source=source)
+    print(f"[Video] Кропов лиц: {total}")
+    return buffer
@@ -1,9 +1,8 @@
 # pages/add_student_page.py
 import streamlit as st
-import os
 from core.students import add_student
 from core.photo_manager import PhotoManager
-from config.settings import GROUPS
+from config.settings import GROUPS, IMPORT_INTAKE_DIR
 
 
 def add_student_form():
@@ -13,23 +12,91 @@ def add_student_form():
     with st.form("add_student"):
         name = st.text_input("Имя студента *", placeholder="Иван Иванов")
         group = st.selectbox("Группа *", GROUPS)
-        photo = st.file_uploader("Фото студента *", type=["jpg", "jpeg", "png"])
+        photos = st.file_uploader(
+            "Фото студента * (можно несколько — точнее распознавание)",
+            type=["jpg", "jpeg", "png"], accept_multiple_files=True,
+        )
 
         submitted = st.form_submit_button("Сохранить")
 
         if submitted:
-            if not name or not photo:
+            if not name or not photos:
                 st.error("Заполните все поля и загрузите фото.")
             else:
                 try:
                     # Сохраняем фото через PhotoManager
-                    photo_path = PhotoManager.save_student_photo(group, name, photo.getvalue())
+                    photo_path = PhotoManager.save_student_photo(group, name, photos[0].getvalue())
+                    # остальные — дополнительные эталоны <Имя>_2.jpg, <Имя>_3.jpg, ...
+                    for extra in photos[1:]:
+                        PhotoManager.save_student_photo(group, name, extra.getvalue(), extra=True)
 
                     # Добавляем студента в базу
                     if add_student(name, group, photo_path):
                         st.success(f"Студент **{name}** добавлен в группу **{group}**!")
-                        st.image(photo.getvalue(), width=200, caption="Загруженное фото")
+                        st.image([p.getvalue() for p in photos], width=200,
+                                 caption=["Загруженное фото"] * len(photos))
                     else:
                         st.error("Ошибка при добавлении студента")
                 except Exception as e:
-                    st.error(f"Ошибка: {e}")
\ No newline at end of file
+                    st.error(f"Ошибка: {e}")
+
+    bulk_import_form()
+
+
+def bulk_import_form():
+    """Массовый импорт: zip-архив (с CSV или папками групп) либо папка из IMPORT_INTAKE_DIR + CSV."""
+    st.markdown("---")
+    st.subheader("📦 Массовый импорт")
+    st.caption(
+        "Архив или папка: либо CSV с колонками name, group, photo, "
+        "либо папки групп с фото вида Имя_Фамилия.jpg. Лицо на каждом фото "
+        "вырезается автоматически, эмбеддинги считаются сразу."
+    )
+
+    from core.roster_import import import_roster, intake_folder, intake_folders
+
+    with st.form("bulk_import"):
+        archive = st.file_uploader("Zip-архив", type=["zip"])
+        # только папки, которые администратор положил в IMPORT_INTAKE_DIR
+        folder = st.selectbox(
+            "…или папка на сервере", [""] + intake_folders(),
+            format_func=lambda name: name or "—",
+            help=f"Папки для импорта кладутся в {IMPORT_INTAKE_DIR}",
+        )
+        csv_file = st.file_uploader("CSV (необязательно)", type=["csv"])
+        submitted = st.form_submit_button("Импортировать")
+
+    if not submitted:
+        return
+    if not archive and not folder:
+        st.error("Загрузите архив или укажите папку.")
+        return
+    if not archive:
+        try:
+            folder = intake_folder(folder)
+        except ValueError as e:
+            st.error(str(e))
+            return
+
+    progress_bar = st.progress(0.0, text="Обработка фото...")
+
+    def progress(done, total):
+        progress_bar.progress(done / total, text=f"Обработано фото: {done} из {total}")
+
+    try:
+        csv_text = csv_file.getvalue().decode("utf-8-sig") if csv_file else None
+        with st.spinner("Импорт и расчёт эмбеддингов..."):
+            report = import_roster(archive.getvalue() if archive else folder, csv_text,
+                                   progress=progress)
+    except Exception as e:
+        st.error(f"Ошибка импорта: {e}")
+        return
+
+    progress_bar.empty()
+    st.success(f"Импортировано студентов: {len(report['imported'])}")
+    if report["skipped"]:
+        st.warning(f"Пропущено: {len(report['skipped'])}")
+        st.table([
+            {"Имя": item["name"], "Группа": item["group"], "Файл": item["file"], "Причина": item["reason"]}
+            for item in report["skipped"]
+        ])
\ No newline at end of file
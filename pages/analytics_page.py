@@ -0,0 +1,122 @@
+# pages/analytics_page.py
+import streamlit as st
+from datetime import date, timedelta
+from config.settings import GROUPS, EXPORT_DOWNLOAD_MAX_MB
+
+EXPORT_POLL_INTERVAL = 1.0  # как часто обновлять прогресс выгрузки (сек)
+
+
+def show_analytics():
+    show_statistics()
+    export_section()
+
+
+def show_statistics():
+    """Статистика посещаемости: по группам, по дням и по студентам за период."""
+    from core.analytics import attendance_by_day, group_rates, refresh_daily, student_rates
+
+    st.header("📊 Статистика посещаемости")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_group = st.selectbox("Группа", ["Все"] + GROUPS, key="analytics_group")
+    with col2:
+        period = st.date_input(
+            "Период", value=(date.today() - timedelta(days=30), date.today()), key="analytics_period"
+        )
+    if len(period) != 2:
+        st.info("Выберите начало и конец периода.")
+        return
+    since, until = period
+    group = None if selected_group == "Все" else selected_group
+
+    # всё считается по дневным агрегатам, а не по журналу событий;
+    # догоняем их один раз за отрисовку, а не в каждом запросе
+    refresh_daily()
+    by_group = group_rates(since, until)
+    if group is not None:
+        by_group = by_group[by_group["group"] == group]
+    if by_group.empty or not by_group["sessions"].any():
+        st.info("За выбранный период перекличек не было.")
+        return
+
+    st.subheader("По группам")
+    st.dataframe(
+        by_group.assign(rate=(by_group["rate"] * 100).round(1)).rename(columns={
+            "group": "Группа", "students": "Студентов", "sessions": "Перекличек", "rate": "Посещаемость, %",
+        }),
+        hide_index=True, use_container_width=True,
+    )
+
+    st.subheader("По дням")
+    by_day = attendance_by_day(group, since, until)
+    st.line_chart(by_day.pivot(index="day", columns="group", values="present"))
+
+    st.subheader("По студентам")
+    rates = student_rates(group, since, until)
+    st.dataframe(
+        rates.assign(rate=(rates["rate"] * 100).round(1)).rename(columns={
+            "name": "Студент", "group": "Группа", "sessions_present": "Отмечен", "sessions": "Перекличек",
+            "rate": "Посещаемость, %", "last_seen": "Последняя отметка",
+        }),
+        hide_index=True, use_container_width=True,
+    )
+
+
+def export_section():
+    """Выгрузка журнала за период в CSV/Parquet — в фоне, с прогрессом."""
+    from core.export import ExportJob, parquet_available
+
+    st.markdown("---")
+    st.subheader("📤 Выгрузка журнала")
+    formats = ["csv", "parquet"] if parquet_available() else ["csv"]
+
+    with st.form("export_form"):
+        groups = st.multiselect("Группы (пусто — все)", GROUPS)
+        period = st.date_input(
+            "Период", value=(date.today() - timedelta(days=365), date.today()), key="export_period"
+        )
+        fmt = st.radio("Формат", formats, horizontal=True)
+        if len(formats) == 1:
+            st.caption("Для Parquet установите pyarrow.")
+        submitted = st.form_submit_button("Выгрузить")
+
+    if submitted:
+        if len(period) != 2:
+            st.error("Выберите начало и конец периода.")
+        else:
+            previous = st.session_state.get("export_job")
+            # большие выгрузки забирают с сервера — их не удаляем
+            if (previous is not None and previous.done and previous.path.exists()
+                    and previous.path.stat().st_size <= EXPORT_DOWNLOAD_MAX_MB * 2 ** 20):
+                previous.path.unlink()
+            st.session_state.export_job = ExportJob(fmt, groups, *period).start()
+
+    job = st.session_state.get("export_job")
+    if job is None:
+        return
+    if not job.done:
+        export_progress()
+    elif job.error:
+        st.error(f"Ошибка выгрузки: {job.error}")
+    else:
+        size_mb = job.path.stat().st_size / 2 ** 20
+        st.success(f"Готово: {job.rows} строк, {size_mb:.1f} МБ")
+        # download_button целиком держит файл в памяти сервера — большие отдаём путём
+        if size_mb > EXPORT_DOWNLOAD_MAX_MB:
+            st.info(f"Файл больше {EXPORT_DOWNLOAD_MAX_MB} МБ — заберите его с сервера:")
+            st.code(str(job.path.resolve()), language=None)
+            return
+        st.download_button(
+            f"⬇️ Скачать {job.filename}", data=job.path.read_bytes(), file_name=job.filename,
+            mime="text/csv" if job.fmt == "csv" else "application/octet-stream",
+        )
+
+
+@st.fragment(run_every=EXPORT_POLL_INTERVAL)
+def export_progress():
+    """Прогресс выгрузки без перерисовки всей страницы; по окончании — полный перезапуск."""
+    job = st.session_state.export_job
+    if job.done:
+        st.rerun()
+    st.info(f"Выгрузка… строк: {job.rows}")
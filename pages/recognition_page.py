@@ -1,19 +1,126 @@
 # pages/recognition_page.py
 import streamlit as st
 import datetime
+import importlib.util
+import sys
 import time
 from pathlib import Path
 import logging
 import cv2
 import numpy as np
+from config.settings import LIVE_REFRESH_INTERVAL
+from core.metrics import metrics
 
 # Настройка логирования
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
+def save_attendance(group, results):
+    """
+    Записать результаты захвата в журнал посещаемости (одна транзакция).
+    Один захват — одна перекличка: id захвата сбрасывается после записи,
+    так что повторное "Распознать" на том же буфере журнал не дублирует.
+    """
+    session_id = st.session_state.get("capture_session_id")
+    if session_id is None:
+        logger.info("Захват уже записан в журнал")
+        return
+    try:
+        from core.attendance import record_events
+        record_events(group, results, session_id=session_id)
+        st.session_state.capture_session_id = None
+    except Exception as e:
+        logger.error(f"Ошибка записи посещаемости: {e}")
+        st.error(f"Не удалось сохранить посещаемость: {e}")
+
+
+def feed_stream_matcher(new_faces):
+    """Потоковый режим: сопоставить новые кропы и остановить съёмку, когда все найдены."""
+    matcher = st.session_state.stream_matcher
+    if matcher is None:
+        return
+
+    found = matcher.feed(new_faces)
+    if found:
+        st.session_state.recognition_results[matcher.group] = matcher.results()
+        st.session_state.recognition_time = datetime.datetime.now()
+        logger.info(f"Потоково распознаны: {[r['name'] for r in found]}")
+
+    if matcher.done:
+        st.session_state.capturing_faces = False
+        st.session_state.camera_active = False
+        if st.session_state.camera_worker is not None:
+            st.session_state.camera_worker.set_capturing(False)
+            # лучшие кропы незакрытых треков, сброшенные при остановке
+            matcher.finish(st.session_state.camera_worker.take_new_faces())
+            st.session_state.recognition_results[matcher.group] = matcher.results()
+        st.session_state.stream_matcher = None
+        if matcher.matched:
+            save_attendance(matcher.group, matcher.results())
+        if matcher.all_found:
+            st.session_state.stream_status = (
+                f"Все студенты найдены за {matcher.elapsed:.0f} сек — съёмка остановлена"
+            )
+        else:
+            st.session_state.stream_status = (
+                f"Время вышло ({matcher.time_budget} сек): найдено "
+                f"{len(matcher.present)} из {len(set(matcher.names))}"
+            )
+        logger.info(st.session_state.stream_status)
+
+
+@st.fragment(run_every=LIVE_REFRESH_INTERVAL)
+def live_video():
+    """
+    Видео с камер. Кадры читают и размечают фоновые CaptureWorker (по
+    одному на камеру); фрагмент лишь периодически забирает последние
+    кадры и новые лица.
+    """
+    worker = st.session_state.get("camera_worker")
+    if worker is None or not st.session_state.camera_active:
+        return
+
+    if not worker.running:
+        logger.error(worker.error or "Поток камеры остановлен")
+        st.session_state.camera_active = False
+        st.rerun()
+
+    # потоковый режим: новые лица распознаются сразу
+    matcher = st.session_state.stream_matcher
+    new_faces = worker.take_new_faces()
+    if matcher is not None and (new_faces or matcher.timed_out):
+        found_before = len(matcher.present)
+        feed_stream_matcher(new_faces)
+        if len(matcher.present) != found_before or not st.session_state.camera_active:
+            # обновляем списки присутствующих на всей странице
+            st.rerun()
+
+    stats = worker.stats()
+    st.session_state.frame_count = stats["frames"]
+    st.session_state.saved_faces_count = stats["saved"]
+
+    # по колонке на камеру
+    frames = worker.latest_frames()
+    if frames:
+        with metrics.timer("frame_render"):
+            cols = st.columns(min(len(frames), 2))
+            for idx, (source, frame) in enumerate(frames.items()):
+                with cols[idx % len(cols)]:
+                    # Конвертируем BGR в RGB для правильного отображения в Streamlit
+                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    st.image(frame_rgb, channels="RGB", width="stretch", caption=f"Камера {source}")
+    camera_fps = " / ".join(f"{c['camera']}: {c['fps']}" for c in stats["cameras"])
+    st.caption(f"FPS: {camera_fps} | Кадров: {stats['frames']} | Сохранено лиц: {stats['saved']}")
+
+
 def recognition_page():
     """Страница для запуска распознавания лиц"""
+    with metrics.timer("page_render"):
+        _render_page()
+
+
+def _render_page():
     st.header("🎥 Распознавание студентов")
 
     logger.info("=== СТРАНИЦА РАСПОЗНАВАНИЯ ЗАПУЩЕНА ===")
@@ -21,21 +128,25 @@ def recognition_page():
     # Инициализация состояния камеры
     if 'camera_active' not in st.session_state:
         st.session_state.camera_active = False
-    if 'camera_capture' not in st.session_state:
-        st.session_state.camera_capture = None
-    if 'selected_camera_index' not in st.session_state:
-        st.session_state.selected_camera_index = 0
-    if 'face_cascade' not in st.session_state:
-        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        st.session_state.face_cascade = cv2.CascadeClassifier(cascade_path)
+    if 'camera_worker' not in st.session_state:
+        # фоновые потоки камер (core.camera_group.CameraGroup)
+        st.session_state.camera_worker = None
     if 'frame_count' not in st.session_state:
         st.session_state.frame_count = 0
     if 'capturing_faces' not in st.session_state:
         st.session_state.capturing_faces = False
     if 'saved_faces_count' not in st.session_state:
         st.session_state.saved_faces_count = 0
-    if 'last_save_time' not in st.session_state:
-        st.session_state.last_save_time = 0
+    if 'capture_session_id' not in st.session_state:
+        # id текущего захвата лиц — под ним он пишется в журнал (один раз)
+        st.session_state.capture_session_id = None
+    if 'stream_matcher' not in st.session_state:
+        st.session_state.stream_matcher = None
+        st.session_state.stream_status = None
+    if 'face_buffer' not in st.session_state:
+        # кропы лиц хранятся в памяти и передаются в match() напрямую
+        from core.face_buffer import FaceBuffer
+        st.session_state.face_buffer = FaceBuffer()
 
     # Инициализация детектора в session state
     if 'camera_detector' not in st.session_state:
@@ -75,13 +186,23 @@ def recognition_page():
         "Внешняя USB камера": 3
     }
 
-    selected_camera = st.selectbox(
-        "Выберите камеру:",
+    from config.settings import CAMERA_SOURCES
+    default_cameras = [name for name, index in camera_options.items() if index in CAMERA_SOURCES]
+    selected_cameras = st.multiselect(
+        "Выберите камеры (несколько — снимают одновременно):",
         options=list(camera_options.keys()),
-        index=st.session_state.selected_camera_index
+        default=default_cameras,
+        key="selected_cameras"
+    )
+    camera_indexes = [camera_options[name] for name in selected_cameras]
+    cameras_label = ", ".join(str(i) for i in camera_indexes)
+
+    streaming_mode = st.checkbox(
+        "⚡ Потоковое распознавание",
+        key="streaming_mode",
+        help="Каждое новое лицо распознаётся сразу; съёмка останавливается, "
+             "когда найдены все студенты группы или истекло время."
     )
-
-    st.session_state.selected_camera_index = camera_options[selected_camera]
 
     # Кнопки управления камерой
     col1, col2, col3, col4 = st.columns(4)
@@ -90,23 +211,32 @@ def recognition_page():
         if st.button("📷 Запустить камеру", type="primary"):
             logger.info("Нажата кнопка 'Запустить камеру'")
             try:
-                # Освобождаем старую камеру если есть
-                if st.session_state.camera_capture is not None:
-                    st.session_state.camera_capture.release()
-
-                # Запускаем выбранную камеру
-                st.session_state.camera_capture = cv2.VideoCapture(st.session_state.selected_camera_index)
-                st.session_state.camera_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                st.session_state.camera_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-
-                if st.session_state.camera_capture.isOpened():
-                    st.session_state.camera_active = True
-                    st.session_state.frame_count = 0
-                    st.success(f"Камера {st.session_state.selected_camera_index} запущена!")
-                    logger.info(f"Камера {st.session_state.selected_camera_index} успешно запущена")
+                from core.camera_group import CameraGroup
+
+                # Освобождаем старые камеры если есть
+                if st.session_state.camera_worker is not None:
+                    st.session_state.camera_worker.stop()
+                    st.session_state.camera_worker = None
+
+                if not camera_indexes:
+                    st.warning("Выберите хотя бы одну камеру")
                 else:
-                    st.error(f"Не удалось открыть камеру {st.session_state.selected_camera_index}")
-                    logger.error("Камера не доступна")
+                    # Каждая камера — в своём фоновом потоке, лица в общий буфер
+                    worker = CameraGroup(camera_indexes, face_buffer=st.session_state.face_buffer)
+                    st.session_state.camera_worker = worker
+
+                    if worker.start():
+                        st.session_state.camera_active = True
+                        st.session_state.frame_count = 0
+                        st.success(f"Камеры запущены: {cameras_label}")
+                        if worker.error:
+                            # часть камер не открылась — остальные работают
+                            st.warning(worker.error)
+                        logger.info(f"Камеры {cameras_label} успешно запущены")
+                    else:
+                        st.error(worker.error or f"Не удалось открыть камеры {cameras_label}")
+                        st.session_state.camera_worker = None
+                        logger.error("Камера не доступна")
             except Exception as e:
                 logger.error(f"Ошибка запуска камеры: {e}")
                 st.error(f"Ошибка запуска камеры: {e}")
@@ -115,10 +245,11 @@ def recognition_page():
         if st.button("⏹️ Остановить камеру"):
             logger.info("Нажата кнопка 'Остановить камеру'")
             try:
-                if st.session_state.camera_capture is not None:
-                    st.session_state.camera_capture.release()
-                    st.session_state.camera_capture = None
+                if st.session_state.camera_worker is not None:
+                    st.session_state.camera_worker.stop()
+                    st.session_state.camera_worker = None
                 st.session_state.camera_active = False
+                st.session_state.capturing_faces = False
                 st.info("Камера остановлена")
                 logger.info("Камера остановлена")
             except Exception as e:
@@ -130,10 +261,22 @@ def recognition_page():
             if st.session_state.camera_active:
                 st.session_state.capturing_faces = True
                 st.session_state.saved_faces_count = 0
-                st.session_state.last_save_time = 0
-                # Очищаем папку
-                from core.photo_manager import PhotoManager
-                PhotoManager.clear_temp_folder()
+                # Очищаем буфер (и папку, если включено сохранение на диск)
+                st.session_state.face_buffer.clear()
+                if st.session_state.face_buffer.save_debug:
+                    from core.photo_manager import PhotoManager
+                    PhotoManager.clear_temp_folder()
+                st.session_state.stream_matcher = None
+                st.session_state.stream_status = None
+                from core.attendance import new_session_id
+                st.session_state.capture_session_id = new_session_id()
+                if streaming_mode:
+                    from core.face_matcher.stream import StreamingMatcher
+                    with st.spinner("Загрузка эталонных фото группы..."):
+                        st.session_state.stream_matcher = StreamingMatcher(selected_group)
+                    st.session_state.recognition_results[selected_group] = []
+                    st.session_state.recognition_time = datetime.datetime.now()
+                st.session_state.camera_worker.set_capturing(True)
                 st.success("Захват лиц запущен!")
                 logger.info("Захват лиц запущен")
             else:
@@ -145,6 +288,9 @@ def recognition_page():
             try:
                 # Останавливаем захват
                 st.session_state.capturing_faces = False
+                st.session_state.stream_matcher = None
+                if st.session_state.camera_worker is not None:
+                    st.session_state.camera_worker.set_capturing(False)
 
                 # Останавливаем видео для показа результатов
                 was_active = st.session_state.camera_active
@@ -152,10 +298,16 @@ def recognition_page():
 
                 with st.spinner("Идет распознавание..."):
                     try:
-                        from core.face_matcher import match
+                        from core.face_matcher import try_match
                         logger.info("Импорт face_matcher выполнен успешно")
 
-                        results = match(selected_group)
+                        results = try_match(selected_group, faces=st.session_state.face_buffer.snapshot())
+                        if results is None:
+                            # нет кадров, студентов или эмбеддингов — это не перекличка
+                            st.warning("Нечего сопоставлять — перекличка не записана")
+                            results = []
+                        else:
+                            save_attendance(selected_group, results)
                         logger.info(f"Результаты распознавания: {len(results)} студентов")
 
                         st.session_state.recognition_results[selected_group] = results
@@ -182,89 +334,13 @@ def recognition_page():
                 st.error(f"Ошибка при распознавании: {e}")
 
     # Отображение видео с камеры в реальном времени с рамками вокруг лиц
-    if st.session_state.camera_active and st.session_state.camera_capture is not None:
-        st.subheader(f"📹 Видео с камеры (Камера {st.session_state.selected_camera_index})")
+    if st.session_state.camera_active and st.session_state.camera_worker is not None:
+        st.subheader(f"📹 Видео с камер ({', '.join(map(str, st.session_state.camera_worker.sources))})")
+        live_video()
 
-        # Создаем placeholder для видео
-        video_placeholder = st.empty()
-
-        # Показываем несколько кадров
-        for _ in range(15):  # 15 кадров (~0.5 секунды)
-            if not st.session_state.camera_active:
-                break
-
-            try:
-                # Читаем один кадр
-                ret, frame = st.session_state.camera_capture.read()
-
-                if ret:
-                    # Определяем лица на кадре
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    faces = st.session_state.face_cascade.detectMultiScale(
-                        gray,
-                        scaleFactor=1.1,
-                        minNeighbors=5,
-                        minSize=(50, 50)
-                    )
-
-                    # Если включен режим захвата лиц - сохраняем их
-                    current_time = time.time()
-                    if st.session_state.capturing_faces and len(faces) > 0:
-                        # Сохраняем каждые 2 секунды
-                        if current_time - st.session_state.last_save_time >= 2.0:
-                            for (x, y, w, h) in faces:
-                                face_roi = frame[y:y + h, x:x + w]
-                                # Увеличиваем контраст
-                                face_roi = cv2.convertScaleAbs(face_roi, alpha=1.2, beta=10)
-
-                                file_path = TEMP_FACES_DIR / f"face_{st.session_state.saved_faces_count}.jpg"
-                                success = cv2.imwrite(str(file_path), face_roi)
-
-                                if success:
-                                    st.session_state.saved_faces_count += 1
-                                    logger.info(f"Сохранено лицо: {file_path}")
-
-                            st.session_state.last_save_time = current_time
-
-                    # Рисуем прямоугольники вокруг лиц
-                    for (x, y, w, h) in faces:
-                        # Красная рамка если захват активен, зеленая если нет
-                        color = (0, 0, 255) if st.session_state.capturing_faces else (0, 255, 0)
-                        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 3)
-                        label = "CAPTURING" if st.session_state.capturing_faces else "DETECTED"
-                        cv2.putText(frame, label, (x, y - 10),
-                                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-
-                    # Добавляем информацию о количестве лиц
-                    info_text = f"Faces: {len(faces)} | Saved: {st.session_state.saved_faces_count}"
-                    cv2.putText(frame, info_text, (10, 30),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-
-                    # Конвертируем BGR в RGB для правильного отображения в Streamlit
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    video_placeholder.image(frame_rgb, channels="RGB", width="stretch")
-
-                    # Увеличиваем счетчик кадров
-                    st.session_state.frame_count += 1
-
-                    # Небольшая задержка между кадрами
-                    time.sleep(0.033)  # ~30 FPS
-                else:
-                    st.error("Не удалось прочитать кадр с камеры")
-                    st.session_state.camera_active = False
-                    break
-
-            except Exception as e:
-                logger.error(f"Ошибка при отображении видео: {e}")
-                st.error(f"Ошибка отображения видео: {e}")
-                st.session_state.camera_active = False
-                break
-
-        # После показа кадров - обновляем страницу
-        if st.session_state.camera_active:
-            st.rerun()
-
-    elif st.session_state.camera_capture is not None and not st.session_state.camera_active:
+    elif st.session_state.camera_worker is not None and not st.session_state.camera_active:
+        if st.session_state.camera_worker.error:
+            st.error(st.session_state.camera_worker.error)
         st.info("📹 Камера в режиме ожидания. Нажмите 'Запустить камеру' для продолжения. Не забудьте включить 'Начать захват лиц '")
 
     # Кнопки очистки
@@ -280,8 +356,10 @@ def recognition_page():
 
     with col6:
         if st.button("🗑️ Очистить сохраненные лица"):
-            from core.photo_manager import PhotoManager
-            PhotoManager.clear_temp_folder()
+            st.session_state.face_buffer.clear()
+            if st.session_state.face_buffer.save_debug:
+                from core.photo_manager import PhotoManager
+                PhotoManager.clear_temp_folder()
             st.session_state.saved_faces_count = 0
             st.success("Сохраненные лица очищены!")
             st.rerun()
@@ -289,11 +367,14 @@ def recognition_page():
     # Отображение статуса
     st.subheader("📊 Статус системы")
 
+    if st.session_state.stream_status:
+        st.success(st.session_state.stream_status)
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
         if st.session_state.camera_active:
-            st.success(f"✅ Камера активна (Камера {st.session_state.selected_camera_index})")
+            st.success(f"✅ Камеры активны ({', '.join(map(str, st.session_state.camera_worker.sources))})")
         else:
             st.error("❌ Камера остановлена")
 
@@ -303,6 +384,13 @@ def recognition_page():
         else:
             st.info("⚪ Захват лиц выключен")
 
+        matcher = st.session_state.stream_matcher
+        if matcher is not None:
+            st.caption(
+                f"⚡ Найдено {len(matcher.present)} из {len(set(matcher.names))} · "
+                f"{matcher.elapsed:.0f}/{matcher.time_budget} сек"
+            )
+
     with col3:
         st.metric("Сохранено лиц", st.session_state.saved_faces_count)
 
@@ -312,20 +400,20 @@ def recognition_page():
         st.subheader("📋 Результаты распознавания")
 
         try:
-            from core.photo_manager import PhotoManager
-            all_students = PhotoManager.get_students(selected_group)
+            from core.attendance import roll_call
             recognized_students = st.session_state.recognition_results[selected_group]
-
-            def normalize_name(name):
-                return name.lower().strip().replace(' ', '_').replace('-', '_')
+            # присутствующие и отсутствующие — по списку группы из базы (или по фото в папке)
+            attendance = roll_call(selected_group, recognized_students)
+            present_students = attendance["present"]
+            absent_students = attendance["absent"]
 
             st.write(f"**Группа:** {selected_group}")
             if st.session_state.recognition_time:
                 st.write(f"**Время проверки:** {st.session_state.recognition_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
-            total_students = len(all_students)
-            present_count = len(recognized_students)
-            absent_count = total_students - present_count
+            present_count = len(present_students)
+            absent_count = len(absent_students)
+            total_students = present_count + absent_count
 
             # Метрики
             metric_col1, metric_col2, metric_col3 = st.columns(3)
@@ -339,38 +427,12 @@ def recognition_page():
 
             st.markdown("---")
 
-            # Разделяем студентов на присутствующих и отсутствующих
-            present_students = []
-            absent_students = []
-
-            for student in all_students:
-                student_normalized = normalize_name(student["name"])
-                is_present = False
-                confidence = ""
-
-                for recognized in recognized_students:
-                    if normalize_name(recognized["name"]) == student_normalized:
-                        is_present = True
-                        confidence = recognized['confidence']
-                        break
-
-                if is_present:
-                    present_students.append({
-                        'name': student['name'],
-                        'confidence': confidence
-                    })
-                else:
-                    absent_students.append({
-                        'name': student['name']
-                    })
-
             # ПРИСУТСТВУЮЩИЕ И ОТСУТСТВУЮЩИЕ в двух колонках
             col1, col2 = st.columns(2)
 
             with col1:
                 st.subheader(f"✅ Присутствуют ({len(present_students)})")
                 if present_students:
-                    present_students.sort(key=lambda x: x['name'])
                     for idx, student in enumerate(present_students, 1):
                         st.success(f"**{idx}. {student['name']}**  \n🎯 Уверенность: {student['confidence']}%")
                 else:
@@ -379,7 +441,6 @@ def recognition_page():
             with col2:
                 st.subheader(f"❌ Отсутствуют ({len(absent_students)})")
                 if absent_students:
-                    absent_students.sort(key=lambda x: x['name'])
                     for idx, student in enumerate(absent_students, 1):
                         st.error(f"**{idx}. {student['name']}**")
                 else:
@@ -417,13 +478,14 @@ def recognition_page():
 
     # Показываем последние сохраненные лица
     with st.expander("📷 Последние сохраненные лица"):
-        temp_faces = list(TEMP_FACES_DIR.glob("face_*.jpg"))
-        if temp_faces:
-            recent_faces = sorted(temp_faces)[-6:]
+        recent_faces = st.session_state.face_buffer.recent(6)
+        if recent_faces:
+            from core.thumbnails import crop_thumbnail
             cols = st.columns(3)
-            for idx, face_path in enumerate(recent_faces):
+            for idx, face in enumerate(recent_faces):
                 with cols[idx % 3]:
-                    st.image(str(face_path), caption=f"Лицо {idx + 1}", width=150)
+                    # JPEG-превью кодируется один раз на кроп
+                    st.image(crop_thumbnail(face), caption=f"Лицо {face['index'] + 1}", width=150)
         else:
             st.info("Нет сохраненных лиц")
 
@@ -435,32 +497,95 @@ def recognition_page():
             "CameraDetector": "core.camera_detector",
             "Face Matcher": "core.face_matcher",
             "PhotoManager": "core.photo_manager",
-            "Settings": "config.settings"
+            "Settings": "config.settings",
+            "DeepFace": "deepface",
+            "TensorFlow": "tensorflow",
         }
 
+        # модули не импортируются: find_spec только ищет их, иначе проверка
+        # сама загрузила бы DeepFace/TensorFlow на каждом перезапуске
         for name, module in components.items():
             try:
-                if module == "core.camera_detector":
-                    from core.camera_detector import CameraDetector
-                elif module == "core.face_matcher":
-                    from core.face_matcher import match
-                elif module == "core.photo_manager":
-                    from core.photo_manager import PhotoManager
-                elif module == "config.settings":
-                    from config.settings import GROUPS, TEMP_FACES_DIR
-
-                st.success(f"✅ {name} - OK")
-            except Exception as e:
+                found = importlib.util.find_spec(module) is not None
+            except (ImportError, ValueError) as e:
                 st.error(f"❌ {name} - Ошибка: {e}")
+                continue
+            if not found:
+                st.error(f"❌ {name} - не найден")
+            elif module in sys.modules:
+                st.success(f"✅ {name} - OK (загружен)")
+            else:
+                st.success(f"✅ {name} - OK (загрузится при первом использовании)")
+
+        # модель распознавания: загружается один раз на процесс
+        try:
+            from core.face_matcher.model import model_stats
+            stats = model_stats()
+            st.write(f"**Модель:** {stats['model']} — {stats['status']}")
+            if stats["load_time"] is not None:
+                st.write(f"**Загрузка модели:** {stats['load_time']} сек")
+            if stats["warmup_time"] is not None:
+                st.write(f"**Прогрев модели:** {stats['warmup_time']} сек")
+            if stats["error"]:
+                st.error(f"Ошибка модели: {stats['error']}")
+        except Exception as e:
+            st.error(f"❌ Статус модели недоступен: {e}")
 
         st.write(f"**Кадров отображено:** {st.session_state.frame_count}")
         st.write(f"**Сохранено лиц:** {st.session_state.saved_faces_count}")
         st.write(f"**Захват активен:** {st.session_state.capturing_faces}")
 
-        # Проверяем файлы в папке
-        temp_files = list(TEMP_FACES_DIR.glob("face_*.jpg"))
-        st.write(f"**Файлов в TEMP_FACES_DIR:** {len(temp_files)}")
-        if temp_files:
-            st.write("Последние файлы:")
-            for f in sorted(temp_files)[-3:]:
-                st.write(f" - {f.name}")
\ No newline at end of file
+        face_buffer = st.session_state.face_buffer
+        st.write(f"**Лиц в буфере:** {len(face_buffer)} (вытеснено: {face_buffer.dropped})")
+
+        # Проверяем файлы в папке (только в отладочном режиме)
+        if face_buffer.save_debug:
+            temp_files = list(TEMP_FACES_DIR.glob("face_*.jpg"))
+            st.write(f"**Файлов в TEMP_FACES_DIR:** {len(temp_files)}")
+            if temp_files:
+                st.write("Последние файлы:")
+                for f in sorted(temp_files)[-3:]:
+                    st.write(f" - {f.name}")
+
+        # задержки по этапам конвейера (core.metrics)
+        st.subheader("Задержки по этапам")
+        snapshot = metrics.snapshot()
+        if snapshot["latency"]:
+            st.table([
+                {
+                    "Этап": name,
+                    "Вызовов": summary["count"],
+                    "Среднее, мс": summary["mean_ms"],
+                    "p50, мс": summary["p50_ms"],
+                    "p95, мс": summary["p95_ms"],
+                    "Макс, мс": summary["max_ms"],
+                }
+                for name, summary in sorted(snapshot["latency"].items())
+            ])
+        else:
+            st.info("Замеров пока нет")
+        for name, value in sorted(snapshot["counters"].items()):
+            st.write(f"**{name}:** {value:g}")
+
+        col_json, col_prom, col_reset = st.columns(3)
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        with col_json:
+            st.download_button(
+                label="💾 Метрики (JSON)",
+                data=metrics.to_json(),
+                file_name=f"metrics_{stamp}.json",
+                mime="application/json",
+                use_container_width=True
+            )
+        with col_prom:
+            st.download_button(
+                label="💾 Метрики (Prometheus)",
+                data=metrics.to_prometheus(),
+                file_name=f"metrics_{stamp}.prom",
+                mime="text/plain",
+                use_container_width=True
+            )
+        with col_reset:
+            if st.button("🔄 Сбросить метрики", use_container_width=True):
+                metrics.reset()
+                st.rerun()
\ No newline at end of file
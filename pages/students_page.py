@@ -1,27 +1,33 @@
 # pages/students_page.py
 import streamlit as st
-import os
-from core.students import load_students, delete_student
-from config.settings import GROUPS
+from core.students import load_students, count_students, delete_student
+from core.thumbnails import get_thumbnail
+from config.settings import GROUPS, STUDENTS_PAGE_SIZE
 
 def show_students():
     """Отобразить список студентов с возможностью фильтрации и удаления."""
     st.header("👥 Список студентов")
-    students = load_students()
-
-    if not students:
+    if not count_students():
         st.info("Пока нет зарегистрированных студентов.")
         return
 
-    # Фильтр по группам
+    # Фильтр по группам (выборка по индексу в базе)
     selected_group = st.selectbox("Фильтр по группе", ["Все"] + GROUPS)
-
-    filtered_students = [
-        s for s in students
-        if selected_group == "Все" or s.get("group") == selected_group
-    ]
-
-    st.write(f"**Найдено студентов: {len(filtered_students)}**")
+    group = None if selected_group == "Все" else selected_group
+
+    # постраничный вывод: из базы читается только текущая страница
+    total = count_students(group)
+    pages = max(1, -(-total // STUDENTS_PAGE_SIZE))
+    page_key = f"students_page_{selected_group}"
+    if st.session_state.get(page_key, 1) > pages:
+        # после удаления страниц могло стать меньше
+        st.session_state[page_key] = pages
+    page = st.number_input(f"Страница (из {pages})", min_value=1, max_value=pages, key=page_key)
+    filtered_students = load_students(
+        group, limit=STUDENTS_PAGE_SIZE, offset=(page - 1) * STUDENTS_PAGE_SIZE
+    )
+
+    st.write(f"**Найдено студентов: {total}**")
 
     # Отображение студентов
     for idx, student in enumerate(filtered_students):
@@ -32,14 +38,15 @@ def show_students():
             st.caption(f"Группа: {student['group']}")
 
         with col2:
-            if os.path.exists(student['photo']):
-                st.image(student['photo'], width=80)
+            thumbnail = get_thumbnail(student['photo'])
+            if thumbnail:
+                st.image(thumbnail, width=80)
             else:
                 st.write("Фото отсутствует")
 
         with col3:
             # Кнопка удаления
-            if st.button("Удалить", key=f"delete_{idx}"):
+            if st.button("Удалить", key=f"delete_{student['id']}"):
                 if delete_student(student):
                     st.success(f"Студент {student['name']} удалён!")
                     st.rerun()
\ No newline at end of file
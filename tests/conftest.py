@@ -0,0 +1,29 @@
+# tests/conftest.py
+"""Общие фикстуры: временная база и папка фото вместо рабочих."""
+
+import pytest
+
+import core.analytics as analytics
+import core.attendance as attendance
+import core.db as db
+import core.photo_manager as photo_manager
+import core.students as students
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "STUDENTS_DB", tmp_path / "student.db")
+    monkeypatch.setattr(db._local, "conn", None, raising=False)
+    monkeypatch.setattr(attendance, "_initialized", False)
+    monkeypatch.setattr(analytics, "_initialized", False)
+    monkeypatch.setattr(students, "_initialized", False)
+    monkeypatch.setattr(students, "LEGACY_STUDENTS_JSON", tmp_path / "students.json")
+    yield
+    db.get_connection().close()
+
+
+@pytest.fixture
+def photos_dir(tmp_path, monkeypatch):
+    photos = tmp_path / "photos"
+    monkeypatch.setattr(photo_manager, "PHOTOS_DIR", photos)
+    return photos
@@ -0,0 +1,52 @@
+# tests/test_analytics.py
+"""Дневные агрегаты: обновление без лишних блокировок на запись, посещаемость по перекличкам."""
+
+from datetime import date, datetime
+
+import core.analytics as analytics
+import core.attendance as attendance
+import core.db as db
+import core.students as students
+
+
+def _statements():
+    executed = []
+    db.get_connection().set_trace_callback(executed.append)
+    return executed
+
+
+def test_refresh_without_new_events_takes_no_write_lock(database):
+    attendance.record_events("ГР-1", [{"name": "Иван Иванов", "confidence": 80.0}],
+                             timestamp=datetime(2026, 9, 1, 9, 0))
+    executed = _statements()
+
+    assert analytics.refresh_daily() == 0
+    assert not any("BEGIN" in sql for sql in executed)
+
+
+def test_refresh_picks_up_new_events(database):
+    attendance.record_events("ГР-1", [{"name": "Иван Иванов", "confidence": 80.0}],
+                             timestamp=datetime(2026, 9, 1, 9, 0))
+    with db.transaction() as conn:
+        conn.execute(
+            "INSERT INTO attendance_events (student, group_name, ts, confidence, session_id) "
+            "VALUES ('Пётр Петров', 'ГР-1', '2026-09-01T09:00:00', 75.0, 's')"
+        )
+
+    assert analytics.refresh_daily() == 1
+    assert set(analytics.daily_frame("ГР-1")["student"]) == {"Иван Иванов", "Пётр Петров"}
+
+
+def test_roll_call_without_recognitions_counts_as_session(database):
+    students.add_students([{"name": "Иван Иванов", "group": "ГР-1", "photo": "ivan.jpg"}])
+    attendance.record_events("ГР-1", [{"name": "Иван Иванов", "confidence": 80.0}],
+                             timestamp=datetime(2026, 9, 1, 9, 0))
+    assert attendance.record_events("ГР-1", [], timestamp=datetime(2026, 9, 2, 9, 0)) == 0
+
+    analytics.refresh_daily()
+    rates = analytics.student_rates("ГР-1", date(2026, 9, 1), date(2026, 9, 30))
+    assert rates[["sessions_present", "sessions"]].values.tolist() == [[1, 2]]
+    assert rates["rate"].tolist() == [0.5]
+    by_day = analytics.attendance_by_day("ГР-1")
+    assert by_day[["day", "present"]].values.tolist() == [["2026-09-01", 1], ["2026-09-02", 0]]
+
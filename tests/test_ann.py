@@ -0,0 +1,61 @@
+# tests/test_ann.py
+"""IVF-индекс: совпадение с полным перебором, порядок и граничные случаи."""
+
+import numpy as np
+import pytest
+
+from core.face_matcher.ann import IVFIndex, brute_force_search, kmeans
+
+
+def _clusters(n_per_cluster=50, centers=8, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    means = rng.normal(size=(centers, dim)) * 5
+    return np.concatenate([m + rng.normal(size=(n_per_cluster, dim)) for m in means]).astype(np.float32)
+
+
+def test_kmeans_separates_clusters():
+    x = _clusters(n_per_cluster=20, centers=3)
+
+    _, labels = kmeans(x, 3)
+
+    assert len(set(labels)) == 3
+    assert all(len(set(labels[i * 20:(i + 1) * 20])) == 1 for i in range(3))
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+def test_search_with_all_lists_probed_is_exact(metric):
+    vectors = _clusters()
+    ids = [f"s{i}" for i in range(len(vectors))]
+    queries = vectors[::37] + 0.01
+    index = IVFIndex(n_lists=8, n_probe=8, metric=metric).build(vectors, ids)
+
+    found = index.search(queries, k=5)
+    exact = brute_force_search(vectors, ids, queries, k=5, metric=metric)
+
+    assert [[i for i, _ in row] for row in found] == [[i for i, _ in row] for row in exact]
+    for row in found:
+        distances = [d for _, d in row]
+        assert distances == sorted(distances)
+
+
+def test_search_recall_with_few_probes():
+    vectors = _clusters()
+    ids = list(range(len(vectors)))
+    queries = vectors[::11] + 0.01
+    index = IVFIndex(n_lists=8, n_probe=2, metric="euclidean").build(vectors, ids)
+
+    found = index.search(queries, k=1)
+    exact = brute_force_search(vectors, ids, queries, k=1, metric="euclidean")
+
+    hits = sum(f[0][0] == e[0][0] for f, e in zip(found, exact))
+    assert hits / len(queries) >= 0.9
+
+
+def test_empty_and_small_index():
+    assert IVFIndex().build(np.empty((0, 4)), []).search(np.ones((2, 4))) == [[], []]
+
+    index = IVFIndex(metric="euclidean").build(np.eye(3, dtype=np.float32), ["a", "b", "c"])
+    assert [i for i, _ in index.search(np.eye(3)[:1], k=5)[0]] == ["a", "b", "c"]
+
+    with pytest.raises(ValueError):
+        IVFIndex().build(np.ones((2, 4)), ["a"])
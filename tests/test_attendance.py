@@ -0,0 +1,56 @@
+# tests/test_attendance.py
+"""Журнал: перекличка пишется один раз и только если кадры были сопоставлены."""
+
+import argparse
+from datetime import datetime
+
+import cli
+import core.attendance as attendance
+import core.db as db
+import core.face_matcher.core as face_core
+import core.video_processor
+from core.face_buffer import FaceBuffer
+
+
+def _sessions():
+    return db.get_connection().execute("SELECT COUNT(*) FROM attendance_sessions").fetchone()[0]
+
+
+def _events():
+    return db.get_connection().execute("SELECT COUNT(*) FROM attendance_events").fetchone()[0]
+
+
+def test_same_capture_is_recorded_once(database):
+    results = [{"name": "Иван Иванов", "confidence": 80.0}]
+    session_id = attendance.new_session_id()
+
+    assert attendance.record_events("ГР-1", results, session_id=session_id) == 1
+    assert attendance.record_events("ГР-1", results, session_id=session_id) == 0
+
+    assert (_sessions(), _events()) == (1, 1)
+
+
+def test_try_match_without_faces_is_not_a_roll_call(monkeypatch):
+    monkeypatch.setattr(face_core.PhotoManager, "get_students",
+                        staticmethod(lambda group: [{"name": "Иван Иванов", "path": "x.jpg"}]))
+
+    assert face_core.try_match("ГР-1", faces=[]) is None
+    assert face_core.match("ГР-1", faces=[]) == []
+
+
+def test_cli_does_not_record_empty_capture(database, monkeypatch):
+    monkeypatch.setattr(core.video_processor, "process_video", lambda *args, **kwargs: FaceBuffer())
+    args = argparse.Namespace(group="ГР-1", video="lesson.mp4", camera=None, sample_fps=1.0, every_n=None,
+                              stream=False, warm=False, duration=None, no_db=False)
+    attendance.init_db()
+
+    report = cli.run(args)
+
+    assert report["recorded"] is False
+    assert _sessions() == 0
+
+
+def test_zero_recognition_roll_call_is_recorded(database):
+    attendance.record_events("ГР-1", [], timestamp=datetime(2026, 9, 2, 9, 0))
+
+    assert (_sessions(), _events()) == (1, 0)
@@ -0,0 +1,179 @@
+# tests/test_capture_stop.py
+"""Кропы незакрытых треков, сброшенные при остановке захвата, доходят до распознавания."""
+
+import time
+
+import numpy as np
+
+import cli
+import core.camera_group
+import core.capture_worker as capture_worker
+import core.face_matcher.stream as stream
+from core.capture_worker import CaptureWorker
+
+
+def _frame(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 255, size=(240, 320, 3), dtype=np.uint8)
+
+
+def _track_face(worker: CaptureWorker, frames: int = 5):
+    # трек подтверждён (>= TRACK_MIN_HITS), но ещё не отправлен (< TRACK_EMIT_AFTER)
+    for i in range(frames):
+        assert worker.tracker.update(_frame(i), [(100, 60, 80, 100)]) == []
+
+
+def test_stop_keeps_flushed_crops_for_take_new_faces():
+    worker = CaptureWorker(use_tracker=True)
+    worker.set_capturing(True)
+    _track_face(worker)
+
+    worker.set_capturing(False)
+
+    assert len(worker.take_new_faces()) == 1
+    assert worker.face_buffer.total == 1
+
+
+def test_restart_drops_unread_crops():
+    worker = CaptureWorker(use_tracker=True)
+    worker.set_capturing(True)
+    _track_face(worker)
+    worker.set_capturing(False)
+
+    worker.set_capturing(True)
+
+    assert worker.take_new_faces() == []
+
+
+class _FakeMatcher:
+    """StreamingMatcher без модели: запоминает, какие кропы ему передали."""
+
+    def __init__(self, group, time_budget):
+        self.fed, self.finished = [], []
+
+    @property
+    def done(self):
+        return False
+
+    def feed(self, faces):
+        self.fed.extend(faces)
+        return []
+
+    def finish(self, faces):
+        self.finished.extend(faces)
+        return []
+
+
+class _FakeCameras:
+    """CameraGroup из одного CaptureWorker без камеры: трек ведётся во время съёмки."""
+
+    def __init__(self, sources, face_buffer):
+        self.worker = CaptureWorker(face_buffer=face_buffer, use_tracker=True)
+        self.running, self.error = True, None
+
+    def start(self):
+        return True
+
+    def set_capturing(self, enabled):
+        self.worker.set_capturing(enabled)
+        if enabled:
+            _track_face(self.worker)
+
+    def take_new_faces(self):
+        return self.worker.take_new_faces()
+
+    def stop(self):
+        self.running = False
+
+
+def test_cli_stream_feeds_crops_flushed_on_stop(monkeypatch):
+    monkeypatch.setattr(core.camera_group, "CameraGroup", _FakeCameras)
+    monkeypatch.setattr("core.face_matcher.StreamingMatcher", _FakeMatcher, raising=False)
+
+    matcher = cli.capture_cameras([0], cli.FaceBuffer(), duration=0.3, group="ГР-1", stream=True)
+
+    assert len(matcher.finished) == 1
+
+
+def test_finish_matches_after_time_budget(monkeypatch):
+    student = np.ones(4, dtype=np.float32)
+    monkeypatch.setattr(stream, "load_student_vectors", lambda students: (["Иван Иванов"], student[None]))
+    monkeypatch.setattr(stream.PhotoManager, "get_students", staticmethod(lambda group: []))
+    monkeypatch.setattr(stream, "embed_faces", lambda faces: [student for _ in faces])
+    monkeypatch.setattr("core.face_matcher.core.verify_threshold", lambda: 0.68)
+
+    matcher = stream.StreamingMatcher("ГР-1", time_budget=0)
+    assert matcher.timed_out and matcher.feed([_frame(0)]) == []
+
+    found = matcher.finish([_frame(0)])
+
+    assert [r["name"] for r in found] == ["Иван Иванов"]
+    assert matcher.results()[0]["name"] == "Иван Иванов"
+
+
+class _FakeCapture:
+    """cv2.VideoCapture без камеры: один и тот же кадр, чтение занимает delay секунд."""
+    delay = 0.01
+
+    def __init__(self, index):
+        pass
+
+    def set(self, prop, value):
+        return True
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        time.sleep(self.delay)
+        return True, _frame(0)
+
+    def release(self):
+        pass
+
+
+class _FakeDetector:
+    def __init__(self, **kwargs):
+        pass
+
+    def detect(self, frame):
+        return [(100, 60, 80, 100)]
+
+
+def _fake_camera(monkeypatch, delay=0.01):
+    monkeypatch.setattr(capture_worker.cv2, "VideoCapture", type("Capture", (_FakeCapture,), {"delay": delay}))
+    monkeypatch.setattr(capture_worker, "FaceDetector", _FakeDetector)
+
+
+def test_no_tracks_open_after_stop(monkeypatch):
+    _fake_camera(monkeypatch)
+    worker = CaptureWorker(use_tracker=True, fps=200)
+    assert worker.start()
+    try:
+        worker.set_capturing(True)
+        time.sleep(0.1)
+        worker.set_capturing(False)
+        time.sleep(0.1)
+
+        assert worker.take_new_faces()
+        hits = [(t.track_id, t.hits) for t in worker.tracker.tracks]
+        time.sleep(0.1)
+
+        # после остановки кадры трекер не трогают: ни новых треков, ни кропов
+        assert [(t.track_id, t.hits) for t in worker.tracker.tracks] == hits
+        assert worker.take_new_faces() == []
+    finally:
+        worker.stop()
+
+
+def test_stuck_thread_keeps_camera_handle(monkeypatch):
+    _fake_camera(monkeypatch, delay=0.5)
+    worker = CaptureWorker(use_tracker=False)
+    assert worker.start()
+
+    assert worker.stop(timeout=0.01) is False
+    assert worker.start(timeout=0.01) is False
+    assert worker.error
+
+    time.sleep(0.6)
+    assert worker.start()
+    assert worker.stop()
@@ -0,0 +1,17 @@
+# tests/test_cli.py
+"""Разбор аргументов консольной переклички."""
+
+import pytest
+
+import cli
+
+
+def test_stream_with_video_is_rejected(monkeypatch, capsys):
+    monkeypatch.setattr(cli, "run", lambda args: pytest.fail("run() не должен вызываться"))
+    monkeypatch.setattr("sys.argv", ["cli.py", "ГР-1", "--video", "lesson.mp4", "--stream"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    assert exit_info.value.code == 2
+    assert "--stream" in capsys.readouterr().err
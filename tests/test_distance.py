@@ -0,0 +1,48 @@
+# tests/test_distance.py
+"""Матрица расстояний студенты × кадры и выбор лучшего кадра для студента."""
+
+import numpy as np
+import pytest
+
+import core.face_matcher.core as face_core
+from core.face_matcher.distance import distance_matrix
+
+
+def _naive(a, b, metric):
+    out = np.empty((len(a), len(b)))
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            if metric == "cosine":
+                out[i, j] = 1 - x @ y / (np.linalg.norm(x) * np.linalg.norm(y))
+            else:
+                if metric == "euclidean_l2":
+                    x, y = x / np.linalg.norm(x), y / np.linalg.norm(y)
+                out[i, j] = np.linalg.norm(x - y)
+    return out
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean", "euclidean_l2"])
+def test_distance_matrix_matches_pairwise(metric):
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(5, 16)), rng.normal(size=(7, 16))
+
+    np.testing.assert_allclose(distance_matrix(a, b, metric), _naive(a, b, metric), atol=1e-4)
+
+
+def test_distance_matrix_rejects_unknown_metric():
+    with pytest.raises(ValueError):
+        distance_matrix(np.ones((1, 2)), np.ones((1, 2)), "manhattan")
+
+
+def test_assign_takes_nearest_prototype_and_threshold(monkeypatch):
+    monkeypatch.setattr(face_core, "verify_threshold", lambda: 0.3)
+    monkeypatch.setattr(face_core, "FACE_THRESHOLD", 0.3)
+    monkeypatch.setattr(face_core, "distance_matrix", lambda a, b: np.array([
+        [0.50, 0.40],    # Иван, прототип 1
+        [0.35, 0.10],    # Иван, прототип 2 — ближе
+        [0.31, 0.90],    # Пётр — дальше порога
+    ]))
+
+    results = face_core.assign(["Иван", "Иван", "Пётр"], np.zeros((3, 4)), [np.zeros(4), np.zeros(4)])
+
+    assert results == [{"name": "Иван", "confidence": 90.0}]
@@ -0,0 +1,86 @@
+# tests/test_embedding_store.py
+"""Кэш эмбеддингов эталонов: сохранение/загрузка и пересчёт только изменившихся фото."""
+
+import os
+
+import numpy as np
+import pytest
+
+import core.face_matcher.parallel as parallel
+from core.face_matcher.embeddings import EmbeddingStore
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """represent_many без DeepFace: вектор из байтов файла; считает вызовы."""
+    calls = []
+
+    def represent_many(paths, workers=None):
+        calls.append(list(paths))
+        return [np.frombuffer(open(p, "rb").read().ljust(8, b"\0")[:8], dtype=np.uint8).astype(np.float32)
+                for p in paths]
+
+    monkeypatch.setattr(parallel, "represent_many", represent_many)
+    return calls
+
+
+def _photos(folder, *contents):
+    paths = []
+    for i, content in enumerate(contents):
+        path = folder / f"s{i}.jpg"
+        path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
+def test_round_trip_computes_each_photo_once(tmp_path, model):
+    photos = _photos(tmp_path, b"abcdefgh", b"12345678")
+    store = EmbeddingStore(directory=tmp_path / "cache", dtype="float32")
+
+    first = store.get_many(photos)
+    store.save()
+    reloaded = EmbeddingStore(directory=tmp_path / "cache", dtype="float32")
+    second = reloaded.get_many(photos)
+
+    assert len(model) == 1 and len(reloaded) == 2
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
+    paths, matrix = reloaded.matrix()
+    assert matrix.shape == (2, 8) and paths == sorted(str(p.resolve()) for p in photos)
+
+
+def test_changed_photo_is_recomputed_touched_is_not(tmp_path, model):
+    changed, touched = _photos(tmp_path, b"abcdefgh", b"12345678")
+    store = EmbeddingStore(directory=tmp_path / "cache", dtype="float32")
+    store.get_many([changed, touched])
+    store.save()
+
+    changed.write_bytes(b"zzzzzzzz")
+    stat = touched.stat()
+    os.utime(touched, (stat.st_atime, stat.st_mtime + 10))
+    store = EmbeddingStore(directory=tmp_path / "cache", dtype="float32")
+    vectors = store.get_many([changed, touched])
+
+    assert model[-1] == [str(changed)]
+    assert vectors[0][0] == ord("z")
+
+
+def test_deleted_photos_are_dropped_on_save(tmp_path, model):
+    kept, deleted = _photos(tmp_path, b"abcdefgh", b"12345678")
+    store = EmbeddingStore(directory=tmp_path / "cache", dtype="float32")
+    store.get_many([kept, deleted])
+    deleted.unlink()
+    store.save()
+
+    assert EmbeddingStore(directory=tmp_path / "cache", dtype="float32").matrix()[0] == [str(kept.resolve())]
+
+
+def test_cache_of_other_model_is_ignored(tmp_path, model):
+    photos = _photos(tmp_path, b"abcdefgh")
+    store = EmbeddingStore(model_name="Facenet512", directory=tmp_path / "cache", dtype="float32")
+    store.get_many(photos)
+    store.save()
+    os.replace(tmp_path / "cache" / "Facenet512.json", tmp_path / "cache" / "ArcFace.json")
+    os.replace(tmp_path / "cache" / "Facenet512.npy", tmp_path / "cache" / "ArcFace.npy")
+
+    assert len(EmbeddingStore(model_name="ArcFace", directory=tmp_path / "cache", dtype="float32")) == 0
@@ -0,0 +1,63 @@
+# tests/test_export.py
+"""Выгрузка журнала порциями в CSV и Parquet."""
+
+import csv
+from datetime import date, datetime
+
+import pytest
+
+import core.attendance as attendance
+from core.export import COLUMNS, export_events, iter_event_chunks
+
+
+@pytest.fixture
+def journal(database):
+    """Пять событий ГР-1 за 1–5 сентября и одно событие ГР-2."""
+    for day in range(1, 6):
+        attendance.record_events("ГР-1", [{"name": f"Студент {day}", "confidence": 90.0}],
+                                 timestamp=datetime(2025, 9, day, 10))
+    attendance.record_events("ГР-2", [{"name": "Пётр", "confidence": 75.5}],
+                             timestamp=datetime(2025, 9, 3, 12))
+
+
+def test_rows_are_read_in_chunks(journal):
+    chunks = list(iter_event_chunks(["ГР-1"], chunk_rows=2))
+
+    assert [len(rows) for rows in chunks] == [2, 2, 1]
+    assert [rows[0][3] for rows in chunks] == ["Студент 1", "Студент 3", "Студент 5"]
+
+
+def test_csv_period_filter_is_inclusive(journal, tmp_path):
+    path = tmp_path / "out.csv"
+    progress = []
+
+    written = export_events(path, groups=["ГР-1"], since=date(2025, 9, 2), until=date(2025, 9, 4),
+                            chunk_rows=2, progress=progress.append)
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    assert written == 3 and progress == [2, 3]
+    assert rows[0] == COLUMNS
+    assert [row[3] for row in rows[1:]] == ["Студент 2", "Студент 3", "Студент 4"]
+    assert not (tmp_path / "out.csv.tmp").exists()
+
+
+def test_unknown_format_is_rejected(journal, tmp_path):
+    with pytest.raises(ValueError):
+        export_events(tmp_path / "out.xlsx")
+    assert not (tmp_path / "out.xlsx").exists()
+
+
+def test_parquet_row_groups_per_chunk(journal, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+
+    assert export_events(path, chunk_rows=4) == 6
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.num_row_groups == 2
+    table = parquet.read()
+    assert table.column_names == COLUMNS
+    assert table.column("confidence").to_pylist().count(75.5) == 1
+    assert export_events(tmp_path / "empty.parquet", groups=["нет"]) == 0
+    assert pq.read_table(tmp_path / "empty.parquet").num_rows == 0
@@ -0,0 +1,73 @@
+# tests/test_face_detector.py
+"""Адаптивный детектор: пропуск кадров, поиск в окрестности прошлых рамок, масштаб."""
+
+import numpy as np
+
+from core.face_detector import FaceDetector, _dedupe
+
+
+class _StubCascade:
+    """detectMultiScale без Haar: лицо — белый квадрат на чёрном кадре."""
+
+    def __init__(self):
+        self.calls = []
+
+    def empty(self):
+        return False
+
+    def detectMultiScale(self, gray, **kwargs):
+        self.calls.append(gray.shape)
+        ys, xs = np.nonzero(gray > 200)
+        if not len(xs):
+            return []
+        return [(xs.min(), ys.min(), xs.max() - xs.min() + 1, ys.max() - ys.min() + 1)]
+
+
+def _detector(**kwargs):
+    detector = FaceDetector(**kwargs)
+    detector.face_cascade = _StubCascade()
+    return detector
+
+
+def _frame(x=200, y=100, size=80):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+def test_boxes_are_scaled_back_to_frame_coordinates():
+    detector = _detector(scale=0.5, skip_frames=0, full_scan_every=1)
+
+    assert detector.detect(_frame()) == [(200, 100, 80, 80)]
+    assert detector.face_cascade.calls == [(240, 320)]
+
+
+def test_skipped_frames_reuse_last_boxes():
+    detector = _detector(scale=1.0, skip_frames=2, full_scan_every=1)
+
+    boxes = [detector.detect(_frame(x=200 + 4 * i)) for i in range(6)]
+
+    assert detector.detections_run == 2
+    assert boxes[1] == boxes[2] == boxes[0] and boxes[3] == [(212, 100, 80, 80)]
+
+
+def test_between_full_scans_only_rois_are_searched():
+    detector = _detector(scale=1.0, skip_frames=0, roi_margin=0.5, full_scan_every=3)
+
+    boxes = [detector.detect(_frame(x=200 + 10 * i)) for i in range(4)]
+
+    # кадры 0 и 3 — полный проход, 1 и 2 — окрестность прошлой рамки (80 + 2 * 40)
+    assert detector.face_cascade.calls == [(480, 640), (160, 160), (160, 160), (480, 640)]
+    assert boxes[1] == [(210, 100, 80, 80)] and boxes[2] == [(220, 100, 80, 80)]
+
+
+def test_roi_miss_falls_back_to_full_scan():
+    detector = _detector(scale=1.0, skip_frames=0, full_scan_every=10)
+    detector.detect(_frame(x=50))
+
+    assert detector.detect(_frame(x=500)) == [(500, 100, 80, 80)]
+    assert detector.face_cascade.calls[-1] == (480, 640)
+
+
+def test_dedupe_keeps_largest_overlapping_box():
+    assert _dedupe([(0, 0, 10, 10), (1, 1, 10, 10), (50, 50, 5, 5)]) == [(0, 0, 10, 10), (50, 50, 5, 5)]
@@ -0,0 +1,23 @@
+# tests/test_face_matcher.py
+"""Уверенность совпадения не выходит за пределы [0, 100]."""
+
+import numpy as np
+
+import core.face_matcher.core as face_core
+
+
+def test_confidence_is_clamped():
+    assert face_core.confidence(0.25) == 75.0
+    assert face_core.confidence(1.7) == 0.0
+    assert face_core.confidence(-0.01) == 100.0
+
+
+def test_assign_confidence_is_never_negative(monkeypatch):
+    # евклидова метрика: расстояния больше 1 проходят порог
+    monkeypatch.setattr(face_core, "verify_threshold", lambda: 10.0)
+    monkeypatch.setattr(face_core, "FACE_THRESHOLD", 10.0)
+    monkeypatch.setattr(face_core, "distance_matrix", lambda a, b: np.array([[3.0]]))
+
+    results = face_core.assign(["Иван Иванов"], np.zeros((1, 4)), [np.zeros(4)])
+
+    assert results == [{"name": "Иван Иванов", "confidence": 0.0}]
@@ -0,0 +1,76 @@
+# tests/test_face_tracker.py
+"""Трекер лиц: сопоставление детекций между кадрами и отправка лучшего кропа трека."""
+
+import numpy as np
+
+from core.face_tracker import FaceTracker, crop_quality, iou
+
+
+def _frame(seed=0):
+    return np.random.default_rng(seed).integers(0, 255, size=(240, 320, 3), dtype=np.uint8)
+
+
+def _tracker(**kwargs):
+    params = dict(iou_threshold=0.3, max_missed=2, min_hits=3, emit_after=5, reemit_gain=1.5)
+    params.update(kwargs)
+    return FaceTracker(**params)
+
+
+def test_iou():
+    assert iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert iou((0, 0, 10, 10), (20, 20, 10, 10)) == 0.0
+    assert abs(iou((0, 0, 10, 10), (5, 0, 10, 10)) - 1 / 3) < 1e-9
+
+
+def test_moving_face_keeps_its_track():
+    tracker = _tracker()
+    for step in range(4):
+        tracker.update(_frame(step), [(100 + 5 * step, 60, 80, 100), (10, 10, 50, 60)])
+
+    assert [t.track_id for t in tracker.tracks] == [1, 2]
+    assert tracker.track_ids([(115, 60, 80, 100), (10, 10, 50, 60)]) == [1, 2]
+    assert all(t.hits == 4 for t in tracker.tracks)
+
+
+def test_best_crop_is_emitted_once_after_emit_after():
+    tracker = _tracker()
+    emitted = [tracker.update(_frame(step), [(100, 60, 80, 100)]) for step in range(8)]
+
+    assert [len(e) for e in emitted] == [0, 0, 0, 0, 1, 0, 0, 0]
+    track = tracker.tracks[0]
+    assert crop_quality(emitted[4][0]) == track.emitted_quality
+
+
+def test_lost_track_emits_if_confirmed_and_short_tracks_are_dropped():
+    tracker = _tracker()
+    for step in range(3):
+        tracker.update(_frame(step), [(100, 60, 80, 100)])
+    # ложное срабатывание — один кадр; для трека лица это первый пропуск
+    assert tracker.update(_frame(9), [(5, 5, 40, 40)]) == []
+
+    emitted = [tracker.update(_frame(10), []) for _ in range(3)]
+
+    assert [len(e) for e in emitted] == [0, 1, 0]
+    assert tracker.tracks == []
+
+
+def test_reemit_when_quality_grows():
+    tracker = _tracker(emit_after=3)
+    rng = np.random.default_rng(0)
+    low = (128 + rng.integers(-3, 4, size=(240, 320, 3))).astype(np.uint8)
+    emitted = [tracker.update(low, [(100, 60, 80, 100)]) for _ in range(3)]
+    assert [len(e) for e in emitted] == [0, 0, 1]
+
+    assert len(tracker.update(_frame(1), [(100, 60, 80, 100)])) == 1
+    assert tracker.update(_frame(1), [(100, 60, 80, 100)]) == []
+
+
+def test_flush_emits_unsent_confirmed_tracks_once():
+    tracker = _tracker()
+    for step in range(3):
+        tracker.update(_frame(step), [(100, 60, 80, 100)])
+
+    assert len(tracker.flush()) == 1
+    assert tracker.flush() == []
+    tracker.reset()
+    assert tracker.tracks == []
@@ -0,0 +1,51 @@
+# tests/test_metrics.py
+"""Реестр метрик: квантили по корзинам и выгрузка в Prometheus/JSON."""
+
+import json
+
+from core.metrics import Histogram, Metrics
+
+
+def test_quantiles_use_bucket_bounds():
+    histogram = Histogram(buckets=(1, 10, 100, float("inf")))
+    for value in (0.5, 5, 5, 50):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 10
+    assert histogram.quantile(1.0) == 50          # не больше реального максимума
+    assert Histogram().quantile(0.5) is None
+
+
+def test_prometheus_buckets_are_cumulative():
+    registry = Metrics()
+    registry.inc("frames_total")
+    registry.inc("frames_total", 2)
+    registry.observe("detection", 3)
+    registry.observe("detection", 30)
+
+    lines = registry.to_prometheus().splitlines()
+
+    assert "# TYPE attendance_frames_total counter" in lines
+    assert "attendance_frames_total 3" in lines
+    assert "# TYPE attendance_detection_ms histogram" in lines
+    assert 'attendance_detection_ms_bucket{le="2"} 0' in lines
+    assert 'attendance_detection_ms_bucket{le="5"} 1' in lines
+    assert 'attendance_detection_ms_bucket{le="50"} 2' in lines
+    assert 'attendance_detection_ms_bucket{le="+Inf"} 2' in lines
+    assert "attendance_detection_ms_sum 33.0" in lines
+    assert "attendance_detection_ms_count 2" in lines
+
+
+def test_export_and_reset(tmp_path):
+    registry = Metrics()
+    with registry.timer("match"):
+        pass
+    registry.inc("faces_total", 4)
+
+    path = registry.export(tmp_path / "out" / "metrics.json")
+    snapshot = json.loads(path.read_text(encoding="utf-8"))
+    assert snapshot["counters"] == {"faces_total": 4}
+    assert snapshot["latency"]["match"]["count"] == 1
+
+    registry.reset()
+    assert registry.to_prometheus() == "\n"
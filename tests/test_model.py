@@ -0,0 +1,41 @@
+# tests/test_model.py
+"""Пакетные эмбеддинги кропов: предобработка как у DeepFace (ресайз с паддингом, /255)."""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+import core.face_matcher.model as model
+
+
+class _StubNetwork:
+    """Вместо Keras-модели: запоминает батч, эмбеддинг — среднее по каналам."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, batch, batch_size=None, verbose=0):
+        self.batches.append(batch)
+        return batch.mean(axis=(1, 2))
+
+
+def test_preprocess_crop_keeps_aspect_and_pads():
+    crop = np.full((100, 50, 3), 255, dtype=np.uint8)
+
+    x = model.preprocess_crop(crop, (160, 160))
+
+    assert x.shape == (160, 160, 3) and x.dtype == np.float32
+    assert x.max() == 1.0 and x.min() == 0.0
+    # узкий кроп: по бокам паддинг нулями, в центре — кроп
+    assert x[:, :40].max() == 0.0 and x[:, 40:120].min() == 1.0
+
+
+def test_embed_crops_runs_one_batch_in_order(monkeypatch):
+    network = _StubNetwork()
+    monkeypatch.setattr(model, "_model", SimpleNamespace(input_shape=(160, 160), model=network))
+    crops = [np.full((80, 80, 3), value, dtype=np.uint8) for value in (0, 255)]
+
+    vectors = model.embed_crops(crops + [None, np.empty((0, 0, 3), dtype=np.uint8)])
+
+    assert len(network.batches) == 1 and network.batches[0].shape == (2, 160, 160, 3)
+    assert vectors.shape == (2, 3) and vectors[0].max() == 0.0 and vectors[1].min() == 1.0
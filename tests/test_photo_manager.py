@@ -0,0 +1,55 @@
+# tests/test_photo_manager.py
+"""Несколько фото студента: <Имя>_N.jpg и папка <Имя>/."""
+
+from pathlib import Path
+
+from core.photo_manager import PhotoManager, numbered_base
+
+
+def test_numbered_base():
+    assert numbered_base("Иван_Петров_2") == "Иван_Петров"
+    assert numbered_base("Иван_Петров") is None
+    assert numbered_base("Иван_12") == "Иван"
+
+
+def test_extra_photos_get_next_free_number(photos_dir):
+    main = PhotoManager.save_student_photo("ГР-1", "Иван Петров", b"main")
+    second = PhotoManager.save_student_photo("ГР-1", "Иван Петров", b"2", extra=True)
+    third = PhotoManager.save_student_photo("ГР-1", "Иван Петров", b"3", extra=True)
+
+    assert Path(main).name == "Иван_Петров.jpg"
+    assert Path(second).name == "Иван_Петров_2.jpg"
+    assert Path(third).name == "Иван_Петров_3.jpg"
+    # без основного фото дополнительное становится основным
+    assert Path(PhotoManager.save_student_photo("ГР-1", "Пётр", b"p", extra=True)).name == "Пётр.jpg"
+
+
+def test_students_collect_all_photos(photos_dir):
+    folder = photos_dir / "ГР-1"
+    (folder / "Мария_Сидорова").mkdir(parents=True)
+    for name in ("Иван_Петров_2.jpg", "Иван_Петров.jpg", "Мария_Сидорова/a.png", "notes.txt"):
+        (folder / name).write_bytes(b"x")
+
+    students = {s["name"]: s for s in PhotoManager.get_students("ГР-1")}
+
+    assert set(students) == {"Иван Петров", "Мария Сидорова"}
+    ivan = students["Иван Петров"]
+    assert [Path(p).name for p in ivan["paths"]] == ["Иван_Петров.jpg", "Иван_Петров_2.jpg"]
+    assert ivan["path"] == ivan["paths"][0]
+    assert sorted(PhotoManager.student_photos(ivan["path"])) == sorted(ivan["paths"])
+    assert [Path(p).name for p in students["Мария Сидорова"]["paths"]] == ["a.png"]
+
+
+def test_new_main_photo_drops_previous_extras(photos_dir):
+    PhotoManager.save_student_photo("ГР-1", "Иван Петров", b"old")
+    PhotoManager.save_student_photo("ГР-1", "Иван Петров", b"old 2", extra=True)
+    (photos_dir / "ГР-1" / "Иван_Петров").mkdir()
+    (photos_dir / "ГР-1" / "Иван_Петров" / "a.jpg").write_bytes(b"old a")
+    PhotoManager.save_student_photo("ГР-1", "Иван", b"other")
+
+    main = PhotoManager.save_student_photo("ГР-1", "Иван Петров", b"new")
+
+    assert PhotoManager.student_photos(main) == [main]
+    assert Path(main).read_bytes() == b"new"
+    assert not (photos_dir / "ГР-1" / "Иван_Петров").exists()
+    assert (photos_dir / "ГР-1" / "Иван.jpg").exists()
@@ -0,0 +1,52 @@
+# tests/test_quantization.py
+"""Хранение кэша эмбеддингов в float16/int8: точность и отображение файла."""
+
+import numpy as np
+import pytest
+
+import core.face_matcher.parallel as parallel
+from core.face_matcher.distance import distance_matrix
+from core.face_matcher.embeddings import EmbeddingStore, dequantize, quantize
+
+
+def _vectors(n=50, dim=512, seed=0):
+    return (np.random.default_rng(seed).normal(size=(n, dim)) * 3).astype(np.float32)
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 0.0), ("float16", 1e-3), ("int8", 2e-2)])
+def test_quantized_distances_stay_close(dtype, tolerance):
+    vectors = _vectors()
+    data, scales = quantize(vectors, dtype)
+
+    assert data.dtype == np.dtype(dtype) and (scales is not None) == (dtype == "int8")
+    exact = distance_matrix(vectors, vectors, "cosine")
+    approx = distance_matrix(dequantize(data, scales), vectors, "cosine")
+    assert np.abs(approx - exact).max() <= tolerance + 1e-6
+
+
+def test_quantize_rejects_unknown_dtype():
+    with pytest.raises(ValueError):
+        quantize(_vectors(2), "int4")
+
+
+def test_int8_store_is_memory_mapped_and_rewritten_on_dtype_change(tmp_path, monkeypatch):
+    vectors = _vectors(3)
+    photos = []
+    for i in range(3):
+        photos.append(tmp_path / f"s{i}.jpg")
+        photos[-1].write_bytes(bytes([i]))
+    lookup = {str(p): v for p, v in zip(photos, vectors)}
+    monkeypatch.setattr(parallel, "represent_many", lambda paths, workers=None: [lookup[p] for p in paths])
+
+    store = EmbeddingStore(directory=tmp_path / "cache", dtype="int8")
+    store.get_many(photos)
+    store.save()
+    store = EmbeddingStore(directory=tmp_path / "cache", dtype="int8")
+
+    assert isinstance(store._matrix, np.memmap) and store._matrix.dtype == np.int8
+    restored = store.get_many(photos)
+    assert max(np.abs(r - v).max() / np.abs(v).max() for r, v in zip(restored, vectors)) < 1e-2
+
+    store = EmbeddingStore(directory=tmp_path / "cache", dtype="float16")
+    store.save()
+    assert EmbeddingStore(directory=tmp_path / "cache", dtype="float16")._matrix.dtype == np.float16
@@ -0,0 +1,112 @@
+# tests/test_roster_import_paths.py
+"""Импорт читает файлы только внутри источника и папки приёма и пишет фото только в папку группы."""
+
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import core.roster_import as roster_import
+from core.photo_manager import PhotoManager
+from core.roster_import import _Source, _entries_from_csv, intake_folder
+
+
+def test_folder_source_rejects_paths_outside_root(tmp_path):
+    root = tmp_path / "intake"
+    (root / "ГР-1").mkdir(parents=True)
+    (root / "ГР-1" / "Иван_Иванов.jpg").write_bytes(b"photo")
+    (tmp_path / "secret.txt").write_bytes(b"secret")
+    source = _Source(root)
+
+    assert source.read("ГР-1/Иван_Иванов.jpg") == b"photo"
+    for name in ("../secret.txt", str(tmp_path / "secret.txt"), "ГР-1/../../secret.txt"):
+        with pytest.raises(ValueError):
+            source.read(name)
+
+
+def test_folder_source_skips_symlinks_outside_root(tmp_path):
+    root = tmp_path / "intake"
+    root.mkdir()
+    (tmp_path / "secret.txt").write_bytes(b"secret")
+    (root / "link.txt").symlink_to(tmp_path / "secret.txt")
+
+    assert _Source(root).files() == []
+
+
+def test_zip_source_rejects_escaping_member_names():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("ГР-1/ok.jpg", b"photo")
+        archive.writestr("../evil.jpg", b"evil")
+        archive.writestr("/abs.jpg", b"evil")
+    source = _Source(buffer.getvalue())
+
+    assert source.files() == ["ГР-1/ok.jpg"]
+    assert source.read("ГР-1/ok.jpg") == b"photo"
+    for name in ("../evil.jpg", "/abs.jpg", "C:/abs.jpg"):
+        with pytest.raises(ValueError):
+            source.read(name)
+
+
+def test_intake_folder_is_confined_to_intake_dir(tmp_path, monkeypatch):
+    intake = tmp_path / "intake"
+    (intake / "set_2024").mkdir(parents=True)
+    (tmp_path / "other").mkdir()
+    monkeypatch.setattr(roster_import, "IMPORT_INTAKE_DIR", intake)
+
+    assert intake_folder("set_2024") == (intake / "set_2024").resolve()
+    assert roster_import.intake_folders() == ["set_2024"]
+    for name in ("", "../other", str(tmp_path / "other"), "missing"):
+        with pytest.raises(ValueError):
+            intake_folder(name)
+
+
+@pytest.mark.parametrize("name", ["../../x", "ГР-2/Иван", "/tmp/x", "C:x", "..", "a\\b"])
+def test_save_student_photo_rejects_names_with_paths(tmp_path, photos_dir, name):
+    with pytest.raises(ValueError):
+        PhotoManager.save_student_photo("ГР-1", name, b"photo")
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_save_student_photo_writes_into_group_folder(photos_dir):
+    path = PhotoManager.save_student_photo("ГР-1", "Иван Иванов", b"photo")
+
+    assert path == str(photos_dir / "ГР-1" / "Иван_Иванов.jpg")
+
+
+def test_csv_entries_with_path_names_are_rejected():
+    entries = _entries_from_csv("name,group,photo\n../../x,ГР-1,a.jpg\nИван Иванов,ГР-1,b.jpg\n")
+
+    assert "reason" in entries[0]
+    assert "reason" not in entries[1]
+
+
+def test_layout_groups_numbered_and_subfolder_photos_by_student():
+    entries = roster_import._entries_from_layout([
+        "ГР-1/Иван_Иванов_2.jpg", "ГР-1/Иван_Иванов.jpg", "ГР-1/Пётр_Петров/a.jpg",
+        "ГР-1/Пётр_Петров/b.png", "export/ГР-2/Анна_Смирнова.jpg", "ГР-1/notes.txt",
+    ])
+
+    assert sorted(entries, key=lambda e: e["name"]) == [
+        {"name": "Анна Смирнова", "group": "ГР-2", "file": "export/ГР-2/Анна_Смирнова.jpg", "extra_files": []},
+        {"name": "Иван Иванов", "group": "ГР-1", "file": "ГР-1/Иван_Иванов.jpg",
+         "extra_files": ["ГР-1/Иван_Иванов_2.jpg"]},
+        {"name": "Пётр Петров", "group": "ГР-1", "file": "ГР-1/Пётр_Петров/a.jpg",
+         "extra_files": ["ГР-1/Пётр_Петров/b.png"]},
+    ]
+
+
+def test_exported_layout_is_reimported_with_extra_photos(tmp_path, database, photos_dir, monkeypatch):
+    source = tmp_path / "export"
+    (source / "ГР-1").mkdir(parents=True)
+    for name in ("Иван_Иванов.jpg", "Иван_Иванов_2.jpg"):
+        (source / "ГР-1" / name).write_bytes(name.encode())
+    monkeypatch.setattr(roster_import, "preprocess_photo", lambda data: (data, None))
+
+    report = roster_import.import_roster(source, precompute=False)
+
+    assert [s["name"] for s in report["imported"]] == ["Иван Иванов"]
+    assert report["skipped"] == []
+    photos = PhotoManager.student_photos(report["imported"][0]["photo"])
+    assert [Path(p).name for p in photos] == ["Иван_Иванов.jpg", "Иван_Иванов_2.jpg"]
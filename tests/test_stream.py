@@ -0,0 +1,58 @@
+# tests/test_stream.py
+"""Потоковое распознавание: найденные студенты больше не сравниваются, ранняя остановка."""
+
+import numpy as np
+import pytest
+
+import core.face_matcher.stream as stream
+
+IVAN, PETR = np.array([1, 0, 0, 0], dtype=np.float32), np.array([0, 1, 0, 0], dtype=np.float32)
+
+
+@pytest.fixture
+def group(monkeypatch):
+    """Два студента; кроп — это сразу его эмбеддинг (модель не нужна)."""
+    compared = []
+
+    def assign(names, matrix, face_vectors):
+        compared.append(list(names))
+        return stream_assign(names, matrix, face_vectors)
+
+    stream_assign = stream.assign
+    monkeypatch.setattr(stream, "assign", assign)
+    monkeypatch.setattr(stream, "load_student_vectors",
+                        lambda students: (["Иван", "Пётр"], np.stack([IVAN, PETR])))
+    monkeypatch.setattr(stream.PhotoManager, "get_students", staticmethod(lambda group: []))
+    monkeypatch.setattr(stream, "embed_faces", lambda faces: list(faces))
+    monkeypatch.setattr("core.face_matcher.core.verify_threshold", lambda: 0.3)
+    return compared
+
+
+def test_found_students_are_not_compared_again(group):
+    matcher = stream.StreamingMatcher("ГР-1", time_budget=60)
+
+    assert [r["name"] for r in matcher.feed([IVAN])] == ["Иван"]
+    assert matcher.remaining == ["Пётр"] and not matcher.done
+    assert matcher.feed([IVAN]) == []
+    assert [r["name"] for r in matcher.feed([PETR])] == ["Пётр"]
+
+    assert group == [["Иван", "Пётр"], ["Пётр"], ["Пётр"]]
+    assert matcher.all_found and matcher.done
+    assert matcher.feed([IVAN]) == []
+    assert sorted(r["name"] for r in matcher.results()) == ["Иван", "Пётр"]
+    assert matcher.faces_seen == 3 and matcher.matched
+
+
+def test_time_budget_stops_feeding(group):
+    matcher = stream.StreamingMatcher("ГР-1", time_budget=0)
+
+    assert matcher.timed_out and matcher.done
+    assert matcher.feed([IVAN]) == [] and not matcher.matched
+
+
+def test_empty_group_is_done_immediately(group, monkeypatch):
+    monkeypatch.setattr(stream, "load_student_vectors", lambda students: ([], np.empty((0, 0))))
+    matcher = stream.StreamingMatcher("ГР-1", time_budget=60)
+
+    assert matcher.done and not matcher.all_found
+    assert matcher.finish([IVAN]) == []
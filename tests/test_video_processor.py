@@ -0,0 +1,73 @@
+# tests/test_video_processor.py
+"""Прореживание кадров записи: шаг, перемотка против grab() и нарезка на отрезки."""
+
+import cv2
+import numpy as np
+
+from core.video_processor import _ranges, frame_step, sample_frames
+
+
+class _FakeVideo:
+    """VideoCapture из frames кадров; кадр i заполнен значением i."""
+
+    def __init__(self, frames: int):
+        self.frames = frames
+        self.position = 0
+        self.seeks, self.grabs, self.reads = [], 0, 0
+
+    def set(self, prop, value):
+        assert prop == cv2.CAP_PROP_POS_FRAMES
+        self.seeks.append(value)
+        self.position = value
+        return True
+
+    def grab(self):
+        if self.position >= self.frames:
+            return False
+        self.grabs += 1
+        self.position += 1
+        return True
+
+    def read(self):
+        if self.position >= self.frames:
+            return False, None
+        self.reads += 1
+        frame = np.full((2, 2), self.position, dtype=np.uint8)
+        self.position += 1
+        return True, frame
+
+
+def test_frame_step():
+    assert frame_step(25, sample_fps=5) == 5
+    assert frame_step(25, sample_fps=5, every_n=3) == 3
+    assert frame_step(10, sample_fps=30) == 1
+    assert frame_step(25, sample_fps=None) == 1
+
+
+def test_small_gaps_are_grabbed_large_gaps_seek():
+    video = _FakeVideo(100)
+    sampled = list(sample_frames(video, 10, 30, 4, seek_min_gap=5))
+
+    assert [index for index, _ in sampled] == [10, 14, 18, 22, 26]
+    assert all(frame[0, 0] == index for index, frame in sampled)
+    assert video.seeks == [10] and video.grabs == 4 * 3 and video.reads == 5
+
+    video = _FakeVideo(100)
+    sampled = list(sample_frames(video, 0, 100, 25, seek_min_gap=5))
+    assert [index for index, _ in sampled] == [0, 25, 50, 75]
+    assert video.seeks == [0, 25, 50, 75] and video.grabs == 0
+
+
+def test_sampling_stops_at_end_of_file():
+    video = _FakeVideo(12)
+    assert [index for index, _ in sample_frames(video, 0, 2 ** 31 - 1, 5)] == [0, 5, 10]
+
+
+def test_chunk_bounds_are_multiples_of_step():
+    ranges = _ranges(frames=1000, fps=25, step=6, chunk_seconds=10)
+
+    assert ranges[0] == (0, 246) and ranges[-1][1] == 1000
+    assert all(start % 6 == 0 for start, _ in ranges)
+    # выборка по отрезкам совпадает с выборкой по всей записи
+    chunked = [i for start, end in ranges for i in range(start, end, 6)]
+    assert chunked == list(range(0, 1000, 6))
@@ -25,6 +25,10 @@ def show_user_info(username):
     st.sidebar.write(f"👤 **Пользователь:** {username}")
 
     if st.sidebar.button("🚪 Выйти"):
+        # Освобождаем камеру фонового потока
+        worker = st.session_state.get("camera_worker")
+        if worker is not None:
+            worker.stop()
         # Очищаем все данные сессии
         for key in list(st.session_state.keys()):
             del st.session_state[key]